@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import sys
+import json
+import time
+import zlib
+from pathlib import Path
+from datetime import datetime, timedelta, timezone
+
+# 相対インポート対応
+sys.path.append(str(Path(__file__).parent.parent))
+from utils.stub_server import StubRequestHandler, StubTwitterServer
+
+# 生成する投稿日時の基準
+BASE_TIME = datetime(2025, 5, 12, 12, 0, 0, tzinfo=timezone.utc)
+
+
+def bench_username(index):
+    """index番目のベンチマーク用ユーザー名"""
+    return f"bench_user_{index:05d}"
+
+
+def user_result(index):
+    """GraphQLのユーザーオブジェクト（フォロワー数はユーザーごとに 0, 1,000, 2,000 ... と増える）"""
+    username = bench_username(index)
+    return {
+        "__typename": "User",
+        "rest_id": str(100000 + index),
+        "core": {"screen_name": username},
+        "legacy": {
+            "screen_name": username,
+            "followers_count": index * 1000,
+            "description": f"ベンチマーク用のアカウント {index} です。",
+            "protected": False,
+        },
+    }
+
+
+def search_timeline_payload(query, cursor, pages, tweets_per_page, users):
+    """
+    SearchTimelineのレスポンスを生成する（クエリ・カーソルごとに決まった投稿を返す）
+
+    Args:
+        query: 検索クエリ
+        cursor: ページ番号
+        pages: 1クエリあたりのページ数（これ以降のカーソルでは空のタイムラインを返す）
+        tweets_per_page: 1ページあたりの投稿数
+        users: 投稿者のユーザー数
+
+    Returns:
+        Dict: SearchTimelineのJSON
+    """
+    entries = []
+    if cursor < pages:
+        offset = zlib.crc32(query.encode("utf-8")) % 1_000_000
+        for i in range(tweets_per_page):
+            serial = cursor * tweets_per_page + i
+            status_id = str(1_800_000_000_000 + offset * 10_000 + serial)
+            created_at = BASE_TIME - timedelta(minutes=serial)
+            entries.append({
+                "entryId": f"tweet-{status_id}",
+                "content": {"itemContent": {"tweet_results": {"result": {
+                    "__typename": "Tweet",
+                    "rest_id": status_id,
+                    "core": {"user_results": {"result": user_result((offset + serial) % users)}},
+                    "legacy": {
+                        "id_str": status_id,
+                        "full_text": f"{query} の投稿 {serial}",
+                        "created_at": created_at.strftime("%a %b %d %H:%M:%S +0000 %Y"),
+                    },
+                }}}},
+            })
+
+    instructions = [{"type": "TimelineAddEntries", "entries": entries}] if entries else []
+    return {"data": {"search_by_raw_query": {"search_timeline": {"timeline": {"instructions": instructions}}}}}
+
+
+class MockRequestHandler(StubRequestHandler):
+    """
+    フィクスチャの代わりに指定件数の投稿・プロフィールを生成して返すハンドラー
+    """
+
+    # MockTwitterServer が設定する生成条件
+    pages = 5
+    tweets_per_page = 20
+    users = 50
+    latency = 0.0
+
+    def send_graphql(self, operation, variables):
+        """GraphQLの応答を遅延付きで生成する"""
+        if self.latency:
+            time.sleep(self.latency)
+
+        if operation == "SearchTimeline":
+            payload = search_timeline_payload(variables.get("rawQuery", ""), int(variables.get("cursor", "0")),
+                                              self.pages, self.tweets_per_page, self.users)
+        elif operation == "UserByScreenName":
+            username = variables.get("screen_name", "")
+            index = int(username.rsplit("_", 1)[-1]) if username.startswith("bench_user_") else -1
+            payload = {"data": {"user": {"result": user_result(index)}}} if 0 <= index < self.users else {"data": {}}
+        else:
+            return self.send_error(404)
+
+        self.send_body(json.dumps(payload, ensure_ascii=False), "application/json")
+
+
+class MockTwitterServer(StubTwitterServer):
+    """
+    ベンチマーク用のローカルTwitterサーバー（無限スクロールの検索タイムラインとプロフィールページを配信）
+    """
+
+    def __init__(self, pages=5, tweets_per_page=20, users=50, latency_ms=0, host="127.0.0.1", port=0):
+        """
+        初期化処理
+
+        Args:
+            pages: 1クエリあたりの検索タイムラインのページ数
+            tweets_per_page: 1ページあたりの投稿数
+            users: 投稿者のユーザー数
+            latency_ms: GraphQLの応答ごとの遅延（ミリ秒）
+            host: 待ち受けるホスト
+            port: 待ち受けるポート（0の場合は空きポートを自動選択）
+        """
+        super().__init__(host=host, port=port)
+        self.server.RequestHandlerClass = type("Handler", (MockRequestHandler,), {
+            "pages": pages,
+            "tweets_per_page": tweets_per_page,
+            "users": users,
+            "latency": latency_ms / 1000,
+        })
@@ -0,0 +1,268 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import sys
+import json
+import time
+import asyncio
+import argparse
+import platform
+import tempfile
+import tracemalloc
+import pandas as pd
+from pathlib import Path
+from datetime import datetime
+from playwright.sync_api import sync_playwright
+from playwright.async_api import async_playwright
+
+# ピークRSSの取得（Windowsでは利用できない）
+try:
+    import resource
+except ImportError:
+    resource = None
+
+# 相対インポート対応
+sys.path.append(str(Path(__file__).parent.parent))
+from benchmarks.mock_server import MockTwitterServer, search_timeline_payload, user_result
+from scrape.search_tweets import TwitterSearchScraper, RESULT_COLUMNS
+from scrape.fetch_profiles import TwitterProfileScraper
+from dm.generate_dm_template import DMTemplateGenerator
+from utils.session_store import SessionStore
+from utils.context_factory import create_context, create_context_async, get_network_stats
+from utils.response_capture import parse_search_timeline, parse_user_result
+from utils.pacing import Pacer
+from utils.metrics import get_metrics
+from utils.logger_setup import setup_logger
+
+# ロガー設定
+logger = setup_logger(__file__)
+
+# ベンチマークでは最小間隔を設けない（通信と描画の待機のみ）
+NO_INTERVALS = {"scroll": 0.0, "query": 0.0, "profile": 0.0}
+
+
+def peak_rss_mb():
+    """Pythonプロセスのピーク常駐メモリ（MB。取得できない場合はNone）"""
+    if resource is None:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOSはバイト、Linuxはキロバイト単位
+    return round(peak / (1024 * 1024 if platform.system() == "Darwin" else 1024), 1)
+
+
+def measure(name, unit, func):
+    """
+    処理時間・件数・Pythonヒープのピーク使用量を計測する
+
+    Args:
+        name: ステージ名
+        unit: 件数の単位（"tweets" / "profiles" / "dms"）
+        func: 計測する処理（(件数, 戻り値) を返す）
+
+    Returns:
+        Tuple[Dict, Any]: 計測結果と処理の戻り値
+    """
+    tracemalloc.start()
+    started = time.perf_counter()
+    try:
+        count, value = func()
+    finally:
+        elapsed = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    result = {
+        "stage": name,
+        "unit": unit,
+        "items": count,
+        "seconds": round(elapsed, 3),
+        "per_second": round(count / elapsed, 2) if elapsed > 0 else None,
+        "peak_python_mb": round(peak / (1024 * 1024), 2),
+    }
+    logger.info(f"Benchmark | {name}: {count} {unit} in {elapsed:.2f}s ({result['per_second']} {unit}/s)")
+    return result, value
+
+
+def network_usage(stats, before=(0, 0, 0)):
+    """
+    ステージ中の通信量（リクエスト数・遮断数・実際に受信したKB）
+
+    Args:
+        stats: get_network_stats の戻り値
+        before: ステージ開始時点の (リクエスト数, 遮断数, 受信バイト数)
+
+    Returns:
+        Dict: requests, blocked, received_kb
+    """
+    return {
+        "requests": stats.requests - before[0],
+        "blocked": stats.blocked - before[1],
+        "received_kb": round((stats.bytes - before[2]) / 1024, 1),
+    }
+
+
+def write_keywords(path, queries):
+    """ベンチマーク用の検索キーワードCSVを作成"""
+    rows = [{"キーワード1": f"ベンチ{i}", "キーワード2": "検索", "キーワード3": "", "演算子": "AND"} for i in range(queries)]
+    pd.DataFrame(rows).to_csv(path, index=False, encoding="utf-8")
+
+
+def synthetic_results(args):
+    """ブラウザを使わない場合の検索結果（モックサーバーと同じ応答から作成）"""
+    rows = []
+    for i in range(args.queries):
+        query = f"ベンチ{i} 検索"
+        for cursor in range(args.pages):
+            tweets, _ = parse_search_timeline(
+                search_timeline_payload(query, cursor, args.pages, args.tweets_per_page, args.users))
+            for tweet in tweets[:max(0, args.max_tweets - cursor * args.tweets_per_page)]:
+                rows.append({**tweet, "bio": "", "followers": 0, "query": query})
+
+    return pd.DataFrame(rows, columns=RESULT_COLUMNS)
+
+
+def synthetic_accounts(results_df, min_followers):
+    """ブラウザを使わない場合の対象アカウント（モックサーバーと同じプロフィールから作成）"""
+    rows = []
+    for username in results_df["username"].unique():
+        user = parse_user_result(user_result(int(username.rsplit("_", 1)[-1])))
+        if user["followers"] >= min_followers:
+            rows.append({"username": username, "url": f"https://twitter.com/{username}",
+                         "bio": user["bio"], "followers": user["followers"]})
+
+    return pd.DataFrame(rows).sort_values("followers", ascending=False)
+
+
+def run_browser_stages(args, server, work_dir):
+    """モックサーバーに対して検索・プロフィール取得を実行"""
+    stages = []
+    pacer = Pacer(min_intervals=NO_INTERVALS)
+
+    search_scraper = TwitterSearchScraper(
+        save_csv=False, capture_network=args.capture_network, base_url=server.base_url, pacer=pacer,
+        keywords_path=work_dir / "keywords.csv", max_tweets=args.max_tweets, checkpoint_dir=work_dir / "checkpoint",
+    )
+    # 検索結果のフォロワー数で判定を省略するとプロフィールページを開かない分だけ profiles/s が水増しされるため、
+    # 全ユーザーのプロフィールページを取得して計測する
+    profile_scraper = TwitterProfileScraper(
+        min_followers=args.min_followers, save_csv=False, capture_network=args.capture_network,
+        base_url=server.base_url, use_cache=False, pacer=pacer, checkpoint_dir=work_dir / "checkpoint",
+        prefilter_margin=None,
+    )
+
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=True)
+        session = SessionStore(base_url=server.base_url)
+        context = create_context(browser, session, profile=args.network_profile)
+        page = context.new_page()
+
+        try:
+            if not session.is_logged_in(page):
+                raise RuntimeError(f"Mock server did not serve the home page at {server.base_url}")
+
+            def search():
+                df = search_scraper.search_keywords(page)
+                return len(df), df
+
+            stats = get_network_stats(context)
+            result, results_df = measure("search", "tweets", search)
+            result["network"] = network_usage(stats)
+            stages.append(result)
+
+            if args.profile_concurrency <= 1:
+                def profiles():
+                    df = profile_scraper.fetch_profiles(page, results_df=results_df)
+                    return results_df["username"].nunique(), df
+
+                before = (stats.requests, stats.blocked, stats.bytes)
+                result, accounts_df = measure("profiles", "profiles", profiles)
+                result["network"] = network_usage(stats, before)
+                stages.append(result)
+        finally:
+            browser.close()
+
+    if args.profile_concurrency > 1:
+        usage = {}
+
+        async def fetch_async():
+            async with async_playwright() as p:
+                browser = await p.chromium.launch(headless=True)
+                try:
+                    context = await create_context_async(browser, SessionStore(base_url=server.base_url),
+                                                         profile=args.network_profile)
+                    df = await profile_scraper.fetch_profiles_async(
+                        context, results_df, concurrency=args.profile_concurrency, requests_per_minute=100000
+                    )
+                    usage.update(network_usage(get_network_stats(context)))
+                    return df
+                finally:
+                    await browser.close()
+
+        def profiles():
+            df = asyncio.run(fetch_async())
+            return results_df["username"].nunique(), df
+
+        result, accounts_df = measure("profiles", "profiles", profiles)
+        result["network"] = usage
+        stages.append(result)
+
+    return stages, results_df, accounts_df
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ローカルのモックTwitterサーバーに対してスクレイピングの処理速度を計測")
+    parser.add_argument("--queries", type=int, default=3, help="検索クエリ数")
+    parser.add_argument("--pages", type=int, default=5, help="1クエリあたりの検索タイムラインのページ数")
+    parser.add_argument("--tweets-per-page", type=int, default=20, help="1ページあたりの投稿数")
+    parser.add_argument("--users", type=int, default=50, help="投稿者のユーザー数")
+    parser.add_argument("--latency-ms", type=int, default=0, help="GraphQLの応答ごとの遅延（ミリ秒）")
+    parser.add_argument("--max-tweets", type=int, default=100, help="クエリごとの最大収集数")
+    parser.add_argument("--min-followers", type=int, default=10000, help="最小フォロワー数")
+    parser.add_argument("--profile-concurrency", type=int, default=1, help="プロフィール取得で同時に使用するページ数")
+    parser.add_argument("--capture-network", action="store_true", help="APIレスポンスのJSONから収集する")
+    parser.add_argument("--network-profile", default="scrape-minimal", help="ネットワークプロファイル")
+    parser.add_argument("--skip-browser", action="store_true", help="ブラウザを使わずDM生成のみ計測する")
+    parser.add_argument("--output", default=None, help="結果のJSONの保存先（省略時は標準出力のみ）")
+    args = parser.parse_args()
+
+    report = {
+        "started_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "config": vars(args),
+        "stages": [],
+    }
+
+    with tempfile.TemporaryDirectory(prefix="twitter_bench_") as tmp:
+        work_dir = Path(tmp)
+        write_keywords(work_dir / "keywords.csv", args.queries)
+
+        if args.skip_browser:
+            results_df = synthetic_results(args)
+            accounts_df = synthetic_accounts(results_df, args.min_followers)
+        else:
+            server = MockTwitterServer(pages=args.pages, tweets_per_page=args.tweets_per_page, users=args.users,
+                                       latency_ms=args.latency_ms)
+            with server:
+                stages, results_df, accounts_df = run_browser_stages(args, server, work_dir)
+            report["stages"].extend(stages)
+
+        def dm_templates():
+            generator = DMTemplateGenerator(output_dir=work_dir / "dm")
+            return generator.generate_templates(accounts_df=accounts_df, results_df=results_df), None
+
+        result, _ = measure("dm_templates", "dms", dm_templates)
+        report["stages"].append(result)
+
+    report["peak_rss_mb"] = peak_rss_mb()
+    report["operations"] = get_metrics().summary()
+
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    print(output)
+    if args.output:
+        Path(args.output).write_text(output, encoding="utf-8")
+        logger.info(f"Saved benchmark results to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
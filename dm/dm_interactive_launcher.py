@@ -3,6 +3,9 @@
 
 import os
 import sys
+import time
+import argparse
+import threading
 import pandas as pd
 from pathlib import Path
 from datetime import datetime
@@ -11,17 +14,68 @@ from playwright.sync_api import sync_playwright
 # 相対インポート対応
 sys.path.append(str(Path(__file__).parent.parent))
 from utils.logger_setup import setup_logger
+from utils.session_store import SessionStore
+from utils.context_factory import create_context
+from utils.template_engine import read_bundle
+from utils.metrics import get_metrics, percentile
+from utils.profile_cache import ProfileCache, UNAVAILABLE_STATUSES
+from utils.profile_state import open_profile
 
 # ロガー設定
 logger = setup_logger(__file__)
 
+
+def start_prompt(message):
+    """
+    オペレーターの入力待ちをデーモンスレッドで開始する（Ctrl-Cでプロセスを終了できるよう、待機中のスレッドを残さない）
+
+    Args:
+        message: 入力待ちで表示するメッセージ
+
+    Returns:
+        threading.Event: Enterが押されたら（入力が閉じられた場合も）セットされる（押された時刻を answered_at に記録）
+    """
+    answered = threading.Event()
+    answered.answered_at = None
+
+    def wait_for_enter():
+        try:
+            input(message)
+        except EOFError:
+            pass
+        finally:
+            # 先読み中に押された場合も、準備の完了ではなく押された時点をオペレーターの操作終了とする
+            answered.answered_at = time.perf_counter()
+            answered.set()
+
+    threading.Thread(target=wait_for_enter, name="dm-prompt", daemon=True).start()
+    return answered
+
+
+def wait_answer(answered):
+    """
+    入力待ちの終了を待つ（短い間隔で待ち、WindowsでもCtrl-Cで中断できるようにする）
+
+    Returns:
+        float: Enterが押された時刻（time.perf_counter()）
+    """
+    while not answered.wait(0.5):
+        pass
+    return answered.answered_at
+
+
 class DMInteractiveLauncher:
     """
     DMの送信画面に自動遷移し、手動操作を待機するランチャー
     """
 
-    def __init__(self):
-        """初期化処理"""
+    def __init__(self, prefetch=True):
+        """
+        初期化処理
+
+        Args:
+            prefetch: Trueの場合はオペレーターの操作中に次のターゲットを別タブで準備する
+        """
         self.base_dir = Path(__file__).parent.parent
         self.input_dir = self.base_dir / "input"
         self.dm_dir = self.base_dir / "dm"
@@ -32,6 +86,9 @@ class DMInteractiveLauncher:
 
         # 現在日時
         self.current_date = datetime.now().strftime("%Y%m%d")
+        self.prefetch = prefetch
+        self.metrics = get_metrics()
+        self.cache = ProfileCache()  # 存在しない・凍結・非公開と判定したアカウントを記録（プロフィール取得でも再取得しない）
 
         logger.info(f"DMInteractiveLauncher initialized")
 
@@ -51,19 +108,12 @@ class DMInteractiveLauncher:
 
         with sync_playwright() as p:
             browser = p.chromium.launch(headless=False)  # ヘッドありで実行
-            context = browser.new_context(viewport={"width": 1280, "height": 800})
+            session = SessionStore()
+            context = create_context(browser, session, profile="full")  # DM画面は全リソースを読み込む
             page = context.new_page()
 
-            # Twitterのログインページ
-            page.goto("https://twitter.com/login")
-            logger.info("Navigated to Twitter login page")
-
-            # NOTE: ログイン処理は手動で行う想定
-            logger.info("Waiting for manual login (60 seconds)")
-            page.wait_for_timeout(60000)  # 1分間待機してログイン
-
-            # ログイン確認
-            if "twitter.com/home" in page.url:
+            # 保存済みセッションでログイン確認（無効な場合のみ手動ログイン）
+            if session.ensure_login(page):
                 logger.info("Login successful")
                 self.process_dm_targets(page, accounts_df)
             else:
@@ -74,62 +124,176 @@ class DMInteractiveLauncher:
             browser.close()
 
     def process_dm_targets(self, page, accounts_df):
-        """DMターゲットごとの処理"""
-        for i, account in accounts_df.iterrows():
+        """
+        DMターゲットごとの処理
+
+        オペレーターが現在のターゲットを操作している間に、次のターゲットのプロフィールとDM画面を別タブで準備する
+        新しいタブは前面に開かれるため、準備の各段階のあとで現在のターゲットのタブを前面に戻す
+        （オペレーターが貼り付け・送信する画面は常に表示中のターゲットのDM画面になる）
+        テンプレートまたはDMボタンがないターゲットはオペレーターに見せる前に飛ばす
+        """
+        targets = self.iter_targets(accounts_df)
+        waits = []
+
+        try:
+            # 最初のターゲットの準備はオペレーターの待ち時間になる
+            wait_started = time.perf_counter()
+            upcoming = self.prepare_next(page.context, targets)
+
+            while upcoming:
+                username, dm_content, target_page = upcoming
+                target_page.bring_to_front()
+
+                waited = time.perf_counter() - wait_started
+                waits.append(waited)
+                self.metrics.record("operator_wait", waited, username)
+                logger.info(f"Processing DM for @{username} (operator waited {waited:.1f}s)")
+
+                # DMテンプレートの内容を表示
+                print("\n" + "="*50)
+                print(f"DM Template for @{username}:")
+                print("-"*50)
+                print(dm_content)
+                print("="*50 + "\n")
+
+                # 手動操作を待機（先読みする場合は待機中に次のターゲットを準備。入力待ちはブラウザを操作しないスレッドで行う）
+                shown_at = time.perf_counter()
+                answered = start_prompt(f"Ready to send DM to @{username}. Copy the content, paste it to the message box, and send.\nPress Enter when done or to skip...")
+                # Enterが押された時点から次のターゲットを表示するまでをオペレーターの待ち時間とする
+                if self.prefetch:
+                    upcoming = self.prepare_next(page.context, targets, current=target_page)
+                    wait_started = wait_answer(answered)
+                else:
+                    wait_started = wait_answer(answered)
+                    upcoming = self.prepare_next(page.context, targets)
+                self.metrics.record("operator", wait_started - shown_at, username)
+
+                # 送信済みのタブを閉じる（DM画面も一緒に閉じる）
+                target_page.close()
+        finally:
+            self.report_waits(waits)
+
+    def iter_targets(self, accounts_df):
+        """
+        DMテンプレートがあるターゲットを順に返す（ないターゲットと、有効期間内に存在しない・凍結・非公開と
+        判定済みのターゲットはブラウザを使わずに飛ばす）
+
+        Yields:
+            Tuple[str, str, str]: ユーザー名、プロフィールURL、DM本文
+        """
+        # generate_dm_template.py --bundle で生成したバンドル（個別ファイルがない場合に使用）
+        bundle = read_bundle(self.dm_gen_dir / f"dm_bundle_{self.current_date}.json")
+
+        for account in accounts_df.to_dict("records"):
             username = account["username"]
-            profile_url = account["url"]
+
+            # 有効期間内に判定済みの存在しない・凍結・非公開アカウントはタブを開かない
+            cached = self.cache.get(username)
+            if cached and cached["status"] in UNAVAILABLE_STATUSES:
+                logger.info(f"Cached as {cached['status']} for @{username}; skipped")
+                self.metrics.count(f"dm_skipped_{cached['status']}")
+                continue
 
             # DMテンプレートファイルの確認
             dm_file = self.dm_gen_dir / f"{username}_{self.current_date}.txt"
             if dm_file.exists():
                 with open(dm_file, "r", encoding="utf-8") as f:
                     dm_content = f.read()
-
-                logger.info(f"Processing DM for @{username}")
-
-                try:
-                    # プロフィールページに遷移
-                    page.goto(profile_url)
-                    logger.info(f"Navigated to profile: {profile_url}")
-
-                    # DMボタンを探す
-                    page.wait_for_selector('div[data-testid="primaryColumn"]', timeout=30000)
-
-                    # DMボタンをクリック
-                    dm_button = page.query_selector('a[href$="/message"] span span')
-                    if dm_button:
-                        dm_button.click()
-                        logger.info(f"Clicked DM button for @{username}")
-
-                        # DM画面の読み込みを待機
-                        page.wait_for_selector('div[data-testid="DMDrawer"]', timeout=30000)
-
-                        # DMテンプレートの内容を表示
-                        print("\n" + "="*50)
-                        print(f"DM Template for @{username}:")
-                        print("-"*50)
-                        print(dm_content)
-                        print("="*50 + "\n")
-
-                        # 手動操作を待機
-                        input(f"Ready to send DM to @{username}. Copy the content, paste it to the message box, and send.\nPress Enter when done or to skip...")
-
-                        # DMを閉じる
-                        close_button = page.query_selector('div[data-testid="DMDrawer"] div[role="button"]')
-                        if close_button:
-                            close_button.click()
-                            page.wait_for_timeout(2000)
-                    else:
-                        logger.warning(f"DM button not found for @{username}")
-
-                except Exception as e:
-                    logger.warning(f"Error processing DM for @{username}: {str(e)}")
+            elif username in bundle:
+                dm_content = bundle[username]
             else:
                 logger.warning(f"DM template not found for @{username}: {dm_file}")
+                self.metrics.count("dm_skipped_no_template")
+                continue
+
+            yield username, account["url"], dm_content
+
+    def prepare_next(self, context, targets, current=None):
+        """
+        次のターゲットのプロフィールを新しいタブで開き、DM画面まで準備する
+
+        Args:
+            context: ブラウザコンテキスト
+            targets: iter_targets の戻り値
+            current: オペレーターが操作中のタブ（先読み時。準備の各段階のあとで前面に戻す）
+
+        Returns:
+            Tuple[str, str, Page]: ユーザー名、DM本文、準備したタブ（残りのターゲットがない場合はNone）
+        """
+        try:
+            return self.open_next(context, targets, current)
+        finally:
+            self.keep_in_front(current)
+
+    def keep_in_front(self, current):
+        """操作中のタブを前面に戻す（新しいタブやクリックで前面が切り替わっても入力先を変えない）"""
+        if current is None:
+            return
+        try:
+            current.bring_to_front()
+        except Exception as e:
+            logger.debug(f"Could not bring the current tab to front: {str(e)}")
+
+    def open_next(self, context, targets, current=None):
+        """prepare_next の本体（戻り値も同じ）"""
+        for username, profile_url, dm_content in targets:
+            target_page = context.new_page()
+            self.keep_in_front(current)  # 新しいタブは前面に開かれる
+            try:
+                # プロフィールページに遷移（存在しない・凍結・非公開は描画直後に判定して飛ばす）
+                status = open_profile(target_page, profile_url, username)
+                self.keep_in_front(current)
+                logger.debug(f"Prefetching profile: {profile_url}")
+                if status in UNAVAILABLE_STATUSES:
+                    logger.warning(f"Profile is {status} for @{username}; skipped")
+                    self.metrics.count(f"dm_skipped_{status}")
+                    self.cache.put(username, status=status)
+                    target_page.close()
+                    continue
+
+                # DMボタンを探す
+                dm_button = target_page.query_selector('a[href$="/message"] span span')
+                if not dm_button:
+                    logger.warning(f"DM button not found for @{username}")
+                    self.metrics.count("dm_skipped_no_button")
+                    target_page.close()
+                    continue
+
+                # DMボタンをクリックしてDM画面の読み込みを待機
+                dm_button.click()
+                self.keep_in_front(current)
+                with self.metrics.timer("wait_selector", username):
+                    target_page.wait_for_selector('div[data-testid="DMDrawer"]', timeout=30000)
+                self.keep_in_front(current)
+                logger.debug(f"Prepared DM drawer for @{username}")
+
+                self.metrics.count("dm_targets_shown")
+                return username, dm_content, target_page
+
+            except Exception as e:
+                logger.warning(f"Error processing DM for @{username}: {str(e)}")
+                target_page.close()
+
+        return None
+
+    def report_waits(self, waits):
+        """オペレーターがブラウザの準備を待った時間を出力する"""
+        if not waits:
+            return
+
+        ordered = sorted(waits)
+        logger.info(f"Operator waited {sum(ordered):.1f}s in total for {len(ordered)} targets "
+                    f"(p50 {percentile(ordered, 0.50):.1f}s, p95 {percentile(ordered, 0.95):.1f}s, "
+                    f"max {ordered[-1]:.1f}s)")
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="DMの送信画面に自動遷移し、手動操作を待機")
+    parser.add_argument("--no-prefetch", action="store_true", help="次のターゲットを先読みせず、Enterを押してから準備する")
+    args = parser.parse_args()
+
     logger.info("Starting DM Interactive Launcher")
-    launcher = DMInteractiveLauncher()
+    launcher = DMInteractiveLauncher(prefetch=not args.no_prefetch)
     launcher.launch()
+    launcher.metrics.report("DM launcher metrics")
     logger.info("DM Interactive Launcher finished")
\ No newline at end of file
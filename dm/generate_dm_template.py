@@ -3,6 +3,7 @@
 
 import os
 import sys
+import argparse
 import pandas as pd
 from pathlib import Path
 from typing import List, Dict, Any
@@ -11,6 +12,9 @@ from datetime import datetime
 # 相対インポート対応
 sys.path.append(str(Path(__file__).parent.parent))
 from utils.logger_setup import setup_logger
+from utils.keyword_index import KeywordIndex, build_keyword_index
+from utils.template_engine import compile_template, write_bundle
+from utils.metrics import get_metrics
 
 # ロガー設定
 logger = setup_logger(__file__)
@@ -20,19 +24,31 @@ class DMTemplateGenerator:
     DMテンプレートを生成して置換する処理
     """
 
-    def __init__(self):
-        """初期化処理"""
+    def __init__(self, result_format="csv", since=None, bundle=False, output_dir=None):
+        """
+        初期化処理
+
+        Args:
+            result_format: 検索結果の読み込み元の形式（"csv" / "parquet"）
+            since: Parquet形式の場合、この日付（YYYYMMDD）以降の検索結果のみ使用する
+            bundle: Trueの場合はユーザーごとのファイルの代わりに1つのバンドルファイル（dm_bundle_[日付].json）に保存
+            output_dir: 生成したDMの保存先（デフォルトは dm/generated/）
+        """
         self.base_dir = Path(__file__).parent.parent
         self.dm_dir = self.base_dir / "dm"
         self.input_dir = self.base_dir / "input"
         self.result_dir = self.base_dir / "result"
+        self.result_format = result_format
+        self.since = since
+        self.bundle = bundle
+        self.metrics = get_metrics()
 
         # テンプレートファイルとアカウントリスト
         self.template_file = self.dm_dir / "dm_template.txt"
         self.accounts_file = self.input_dir / "filtered_accounts.csv"
 
         # 生成したDMの保存先
-        self.output_dir = self.dm_dir / "generated"
+        self.output_dir = Path(output_dir) if output_dir else self.dm_dir / "generated"
         self.output_dir.mkdir(exist_ok=True)
 
         # キャンペーンURL（実際のプロジェクトでは設定ファイルから読み込むなど）
@@ -43,119 +59,121 @@ class DMTemplateGenerator:
 
         logger.info(f"DMTemplateGenerator initialized")
 
-    def generate_templates(self):
-        """テンプレートを生成して置換処理を行う"""
+    def generate_templates(self, accounts_df=None, results_df=None):
+        """
+        テンプレートを生成して置換処理を行う
+
+        Args:
+            accounts_df: 対象アカウント（Noneの場合はinput/filtered_accounts.csvを読み込む）
+            results_df: 検索結果（Noneの場合はresult/のCSVからキーワードを取得）
+
+        Returns:
+            int: 生成したDMの件数
+        """
         # テンプレート読み込み
         if not self.template_file.exists():
             logger.error(f"Template file not found: {self.template_file}")
-            return
+            return 0
 
         with open(self.template_file, "r", encoding="utf-8") as f:
-            template_text = f.read()
+            template = compile_template(f.read())
 
         logger.info(f"Loaded template from {self.template_file}")
 
         # アカウントリスト読み込み
-        if not self.accounts_file.exists():
-            logger.error(f"Accounts file not found: {self.accounts_file}. Run fetch_profiles.py first.")
-            return
+        if accounts_df is None:
+            if not self.accounts_file.exists():
+                logger.error(f"Accounts file not found: {self.accounts_file}. Run fetch_profiles.py first.")
+                return 0
 
-        try:
-            accounts_df = pd.read_csv(self.accounts_file)
-            logger.info(f"Loaded {len(accounts_df)} accounts from {self.accounts_file}")
-        except Exception as e:
-            logger.exception(f"Error loading accounts file: {str(e)}")
-            return
+            try:
+                accounts_df = pd.read_csv(self.accounts_file)
+                logger.info(f"Loaded {len(accounts_df)} accounts from {self.accounts_file}")
+            except Exception as e:
+                logger.exception(f"Error loading accounts file: {str(e)}")
+                return 0
+
+        # 結果ファイル（またはメモリ上の検索結果）からキーワード情報を取得
+        if results_df is not None and "query" in results_df.columns:
+            keywords_by_username = self.get_keywords_from_results(results_df)
+        else:
+            keywords_by_username = self.get_keywords_by_username()
 
-        # 結果ファイルからキーワード情報を取得
-        keywords_by_username = self.get_keywords_by_username()
+        # アカウントの列にない項目は置換されずに残る
+        available = set(accounts_df.columns) | {"username", "keyword", "campaign_url"}
+        for field in template.field_names:
+            if field not in available:
+                logger.warning(f"Template placeholder <<{field}>> has no matching account column")
 
-        # 各アカウントに対してテンプレート生成
-        generated_count = 0
+        # 各アカウントにつき1回だけ描画し、個別ファイルと一括ファイルで共有
+        messages = {}
 
-        for _, account in accounts_df.iterrows():
+        for account in accounts_df.fillna("").to_dict("records"):
             username = account["username"]
 
             # キーワード取得（なければデフォルト値）
             keywords = keywords_by_username.get(username, ["一般的な情報"])
-            keyword = ", ".join(keywords[:3])  # 最大3つまで
 
-            # テンプレート置換
-            dm_text = template_text.replace("<<username>>", username)
-            dm_text = dm_text.replace("<<keyword>>", keyword)
-            dm_text = dm_text.replace("<<campaign_url>>", f"{self.campaign_url}?ref={username}")
+            values = dict(account)
+            values["keyword"] = ", ".join(keywords[:3])  # 最大3つまで
+            values["campaign_url"] = f"{self.campaign_url}?ref={username}"
 
-            # 保存
-            output_file = self.output_dir / f"{username}_{self.current_date}.txt"
-            with open(output_file, "w", encoding="utf-8") as f:
-                f.write(dm_text)
+            with self.metrics.timer("extract", username):
+                messages[username] = template.render(values)
 
-            generated_count += 1
-            if generated_count % 10 == 0:
-                logger.info(f"Generated {generated_count} DM templates")
+            if len(messages) % 10 == 0:
+                logger.info(f"Generated {len(messages)} DM templates")
 
-        # 一括ファイルも生成
-        all_dms_file = self.output_dir / f"all_dms_{self.current_date}.txt"
-        with open(all_dms_file, "w", encoding="utf-8") as f:
-            f.write(f"--- 生成日時: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} ---\n\n")
-            f.write(f"--- 対象アカウント数: {generated_count} ---\n\n")
+        generated_count = len(messages)
 
-            for _, account in accounts_df.iterrows():
-                username = account["username"]
-                keywords = keywords_by_username.get(username, ["一般的な情報"])
-                keyword = ", ".join(keywords[:3])
+        # 保存
+        if self.bundle:
+            bundle_file = self.output_dir / f"dm_bundle_{self.current_date}.json"
+            with self.metrics.timer("io", bundle_file.name):
+                write_bundle(bundle_file, messages)
+            logger.info(f"Generated DM bundle with {generated_count} templates: {bundle_file}")
+        else:
+            for username, dm_text in messages.items():
+                output_file = self.output_dir / f"{username}_{self.current_date}.txt"
+                with self.metrics.timer("io", output_file.name):
+                    output_file.write_text(dm_text, encoding="utf-8")
+            logger.info(f"Generated {generated_count} individual DM templates")
 
-                dm_text = template_text.replace("<<username>>", username)
-                dm_text = dm_text.replace("<<keyword>>", keyword)
-                dm_text = dm_text.replace("<<campaign_url>>", f"{self.campaign_url}?ref={username}")
+        # 一括ファイルも生成（まとめて1回で書き込む）
+        all_dms_file = self.output_dir / f"all_dms_{self.current_date}.txt"
+        chunks = [
+            f"--- 生成日時: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} ---\n\n",
+            f"--- 対象アカウント数: {generated_count} ---\n\n",
+        ]
+        for username, dm_text in messages.items():
+            chunks.append(f"=== @{username} ===\n\n{dm_text}\n\n-----------------------------------\n\n")
 
-                f.write(f"=== @{username} ===\n\n")
-                f.write(dm_text)
-                f.write("\n\n-----------------------------------\n\n")
+        with self.metrics.timer("io", all_dms_file.name):
+            with open(all_dms_file, "w", encoding="utf-8") as f:
+                f.write("".join(chunks))
 
-        logger.info(f"Generated {generated_count} individual DM templates")
         logger.info(f"Generated combined DM file: {all_dms_file}")
 
-    def get_keywords_by_username(self):
-        """結果ファイルからユーザー名ごとのキーワードリストを取得"""
-        result_files = list(self.result_dir.glob("*.csv"))
-        keywords_by_username = {}
+        return generated_count
 
-        for file_path in result_files:
-            try:
-                # ファイル名からキーワードを抽出
-                filename = file_path.stem  # 拡張子を除去
-                parts = filename.split("_")
-                if len(parts) >= 2:
-                    keywords = []
-                    for part in parts[:-1]:  # 日付部分を除く
-                        if "or" in part:
-                            # 'or'で区切られた場合、個別にキーワードとして抽出
-                            keywords.extend([k.strip() for k in part.split("or")])
-                        elif "+" in part:
-                            # '+'で区切られた場合は、ANDの条件なのでそのまま1つのキーワードとして
-                            keywords.append(part.replace("+", " AND "))
-                        else:
-                            keywords.append(part)
-
-                # ファイルから投稿者を抽出
-                df = pd.read_csv(file_path)
-                if "username" in df.columns:
-                    for username in df["username"].unique():
-                        if username not in keywords_by_username:
-                            keywords_by_username[username] = []
-                        for kw in keywords:
-                            if kw not in keywords_by_username[username]:
-                                keywords_by_username[username].append(kw)
+    def get_keywords_from_results(self, results_df):
+        """メモリ上の検索結果（query列）からユーザー名ごとのキーワードリストを取得（一致した投稿数の多い順）"""
+        return build_keyword_index(results_df)
 
-            except Exception as e:
-                logger.warning(f"Error processing file {file_path.name}: {str(e)}")
-
-        return keywords_by_username
+    def get_keywords_by_username(self):
+        """結果ファイルからユーザー名ごとのキーワードリストを取得（索引は結果ファイルが変わるまでキャッシュ）"""
+        return KeywordIndex(result_format=self.result_format, since=self.since).load()
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="対象アカウントごとのDMテンプレートを生成")
+    parser.add_argument("--result-format", choices=["csv", "parquet"], default="csv", help="検索結果の読み込み元の形式")
+    parser.add_argument("--since", default=None, help="Parquet形式の場合、この日付（YYYYMMDD）以降の検索結果のみ使用する")
+    parser.add_argument("--bundle", action="store_true", help="ユーザーごとのファイルの代わりに1つのバンドルファイルに保存")
+    args = parser.parse_args()
+
     logger.info("Starting DM Template Generator")
-    generator = DMTemplateGenerator()
+    generator = DMTemplateGenerator(result_format=args.result_format, since=args.since, bundle=args.bundle)
     generator.generate_templates()
+    generator.metrics.report("DM generation metrics")
     logger.info("DM Template Generator finished")
\ No newline at end of file
@@ -0,0 +1,6 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from pipeline.runner import PipelineRunner
+
+__all__ = ["PipelineRunner"]
@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from typing import Optional
+
+import typer
+
+from pipeline.runner import PipelineRunner
+from utils.logger_setup import setup_logger
+
+app = typer.Typer(help="Twitter Scraper パイプライン")
+
+
+@app.callback()
+def main():
+    """検索 → プロフィール取得 → DM生成を1プロセスで実行する"""
+
+
+@app.command()
+def run(
+    min_followers: int = typer.Option(10000, help="最小フォロワー数"),
+    save_csv: bool = typer.Option(True, "--save-csv/--no-save-csv", help="各ステージの結果をCSVにも保存する"),
+    capture_network: bool = typer.Option(False, help="APIレスポンスのJSONから収集する（DOMは予備）"),
+    profile_concurrency: int = typer.Option(1, help="プロフィール取得で同時に使用するページ数（2以上で非同期モード）"),
+    requests_per_minute: int = typer.Option(20, help="非同期モードでの全ページ合計の1分あたりの最大アクセス数"),
+    cache: bool = typer.Option(True, help="取得済みプロフィールのキャッシュを使用する"),
+    cache_ttl_days: int = typer.Option(7, help="プロフィールキャッシュの有効期間（日）"),
+    network_profile: str = typer.Option("scrape-minimal", help="ネットワークプロファイル（scrape-minimal / full）"),
+    resume: bool = typer.Option(False, help="中断した当日の実行を再開し、完了済みの作業を飛ばす"),
+    result_format: str = typer.Option("csv", help="検索結果の保存形式（csv / parquet。parquetはpyarrowが必要）"),
+    merge_queries: bool = typer.Option(True, help="重複する行・ORでまとめられるキーワード行を1回の検索に統合する"),
+    incremental: bool = typer.Option(False, help="検索で前回の実行以降の新しい投稿のみ収集して追記する"),
+    search_workers: int = typer.Option(1, help="検索のワーカープロセス数（2以上で各ワーカーが自分のブラウザで分散して検索）"),
+    search_requests_per_minute: int = typer.Option(60, help="分散検索での全ワーカー合計の1分あたりの最大アクセス数"),
+    target_count: Optional[int] = typer.Option(None, help="条件を満たすアカウントがこの件数に達したらプロフィール取得を終了する"),
+    log_queue: bool = typer.Option(False, help="ログをキュー経由で書き込み、スクレイピング処理を止めない"),
+    log_json: bool = typer.Option(False, help="JSON形式のログファイル（log/[日付]/[日付].jsonl）も出力する"),
+):
+    """全ステージを1つのブラウザで実行し、ステージごとの実行時間を表示する"""
+    if log_queue or log_json:
+        setup_logger(__file__, enqueue=log_queue, json_file=log_json)
+
+    runner = PipelineRunner(
+        min_followers=min_followers,
+        save_csv=save_csv,
+        capture_network=capture_network,
+        profile_concurrency=profile_concurrency,
+        requests_per_minute=requests_per_minute,
+        use_cache=cache,
+        cache_ttl_days=cache_ttl_days,
+        network_profile=network_profile,
+        resume=resume,
+        result_format=result_format,
+        merge_queries=merge_queries,
+        incremental=incremental,
+        search_workers=search_workers,
+        search_requests_per_minute=search_requests_per_minute,
+        target_count=target_count,
+    )
+    try:
+        runner.run()
+    finally:
+        runner.report()
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,180 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import sys
+import time
+from pathlib import Path
+from contextlib import contextmanager
+from playwright.sync_api import sync_playwright
+from rich.console import Console
+from rich.table import Table
+
+# 相対インポート対応
+sys.path.append(str(Path(__file__).parent.parent))
+from scrape.search_tweets import TwitterSearchScraper
+from scrape.sharded_search import ShardedSearch
+from scrape.fetch_profiles import TwitterProfileScraper
+from dm.generate_dm_template import DMTemplateGenerator
+from utils.session_store import SessionStore
+from utils.context_factory import create_context
+from utils.logger_setup import setup_logger
+from utils.metrics import get_metrics
+
+# ロガー設定
+logger = setup_logger(__file__)
+
+
+class PipelineRunner:
+    """
+    検索 → プロフィール取得 → DM生成を1プロセス・1ブラウザで実行するオーケストレーター
+    """
+
+    def __init__(self, min_followers=10000, save_csv=True, capture_network=False, profile_concurrency=1,
+                 requests_per_minute=20, use_cache=True, cache_ttl_days=7, network_profile="scrape-minimal",
+                 resume=False, result_format="csv", merge_queries=True, incremental=False,
+                 search_workers=1, search_requests_per_minute=60, target_count=None):
+        """
+        初期化処理
+
+        Args:
+            min_followers: プロフィール取得時の最小フォロワー数
+            save_csv: 各ステージの結果をCSVにも書き出すか（従来スクリプトとの互換用）
+            capture_network: 検索・プロフィール取得でAPIレスポンスのJSONを優先して使うか
+            profile_concurrency: プロフィール取得で同時に使用するページ数（2以上で非同期モード）
+            requests_per_minute: 非同期モードでの1分あたりの最大アクセス数
+            use_cache: プロフィールキャッシュを使用するか
+            cache_ttl_days: プロフィールキャッシュの有効期間（日）
+            network_profile: スクレイピング用コンテキストのネットワークプロファイル
+            resume: 中断した当日の実行を再開し、完了済みのクエリ・取得済みのプロフィールを飛ばすか
+            result_format: 検索結果の保存形式（"csv" / "parquet"）
+            merge_queries: 重複する行・ORでまとめられるキーワード行を1回の検索に統合するか
+            incremental: 検索で前回の実行以降の新しい投稿のみ収集するか
+            search_workers: 検索のワーカープロセス数（2以上で各ワーカーが自分のブラウザで分散して検索）
+            search_requests_per_minute: 分散検索での全ワーカー合計の1分あたりの最大アクセス数
+            target_count: プロフィール取得で条件を満たすアカウントがこの件数に達したら終了する（Noneで全件）
+        """
+        self.min_followers = min_followers
+        self.save_csv = save_csv
+        self.capture_network = capture_network
+        self.profile_concurrency = profile_concurrency
+        self.requests_per_minute = requests_per_minute
+        self.use_cache = use_cache
+        self.cache_ttl_days = cache_ttl_days
+        self.network_profile = network_profile
+        self.resume = resume
+        self.result_format = result_format
+        self.merge_queries = merge_queries
+        self.incremental = incremental
+        self.search_workers = search_workers
+        self.search_requests_per_minute = search_requests_per_minute
+        self.target_count = target_count
+        self.timings = []  # (ステージ名, 経過秒数)
+        self.metrics = get_metrics()  # 操作ごとの所要時間（各ステージと共有）
+
+        logger.info(f"PipelineRunner initialized with min_followers={min_followers}, save_csv={save_csv}")
+
+    @contextmanager
+    def stage(self, name):
+        """ステージの実行時間を計測"""
+        logger.info(f"Stage started: {name}")
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            self.timings.append((name, elapsed))
+            logger.info(f"Stage finished: {name} ({elapsed:.1f}s)")
+
+    def run(self):
+        """全ステージを実行し、合計時間を記録"""
+        started = time.perf_counter()
+        try:
+            self.run_stages()
+        finally:
+            self.timings.append(("total", time.perf_counter() - started))
+
+    def run_stages(self):
+        """ブラウザを共有して各ステージを順に実行し、結果はDataFrameで次のステージへ渡す"""
+        with sync_playwright() as p:
+            browser = p.chromium.launch(headless=False)  # ヘッドありで実行（デバッグ用）
+            session = SessionStore()
+            context = create_context(browser, session, profile=self.network_profile)
+            page = context.new_page()
+
+            try:
+                with self.stage("login"):
+                    logged_in = session.ensure_login(page)
+
+                if not logged_in:
+                    logger.error("Login failed or timeout")
+                    return
+
+                with self.stage("search"):
+                    if self.search_workers > 1:
+                        results_df = ShardedSearch(
+                            workers=self.search_workers, requests_per_minute=self.search_requests_per_minute,
+                            save_csv=self.save_csv, capture_network=self.capture_network, resume=self.resume,
+                            result_format=self.result_format, merge_queries=self.merge_queries,
+                            incremental=self.incremental,
+                        ).run()
+                    else:
+                        results_df = TwitterSearchScraper(
+                            save_csv=self.save_csv, capture_network=self.capture_network, resume=self.resume,
+                            result_format=self.result_format, merge_queries=self.merge_queries,
+                            incremental=self.incremental,
+                        ).search_keywords(page)
+                logger.info(f"Search stage collected {len(results_df)} tweets")
+
+                if results_df.empty:
+                    logger.warning("No search results; skipping remaining stages")
+                    return
+
+                if self.profile_concurrency <= 1:
+                    with self.stage("profiles"):
+                        accounts_df = self.profile_scraper().fetch_profiles(page, results_df=results_df)
+            finally:
+                browser.close()
+
+        # 並行取得は非同期APIのブラウザで実行（保存済みセッションを再利用するためログイン待ちは発生しない）
+        if self.profile_concurrency > 1:
+            with self.stage("profiles"):
+                accounts_df = self.profile_scraper().start_async(
+                    results_df, concurrency=self.profile_concurrency, requests_per_minute=self.requests_per_minute
+                )
+
+        logger.info(f"Profile stage kept {len(accounts_df)} accounts")
+
+        if accounts_df.empty:
+            logger.warning("No accounts matched; skipping DM generation")
+            return
+
+        # DM生成はブラウザ不要
+        with self.stage("dm_templates"):
+            DMTemplateGenerator().generate_templates(accounts_df=accounts_df, results_df=results_df)
+
+    def profile_scraper(self):
+        """プロフィール取得ステージのスクレイパーを作成"""
+        return TwitterProfileScraper(
+            min_followers=self.min_followers,
+            save_csv=self.save_csv,
+            capture_network=self.capture_network,
+            use_cache=self.use_cache,
+            cache_ttl_days=self.cache_ttl_days,
+            resume=self.resume,
+            target_count=self.target_count,
+        )
+
+    def report(self):
+        """ステージごとの実行時間と、操作ごとの所要時間の内訳を表示"""
+        table = Table(title="Pipeline stage timings")
+        table.add_column("Stage")
+        table.add_column("Wall time (s)", justify="right")
+
+        for name, elapsed in self.timings:
+            table.add_row(name, f"{elapsed:.1f}")
+            logger.info(f"Timing | {name}: {elapsed:.1f}s")
+
+        Console().print(table)
+
+        # 各ステージの操作ごとの内訳
+        self.metrics.report("Pipeline operation metrics")
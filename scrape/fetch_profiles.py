@@ -4,27 +4,64 @@
 import os
 import sys
 import time
+import asyncio
+import argparse
 import pandas as pd
 from pathlib import Path
+from datetime import datetime
 from playwright.sync_api import sync_playwright
+from playwright.async_api import async_playwright
 from typing import List, Dict, Any, Tuple
 
 # 相対インポート対応
 sys.path.append(str(Path(__file__).parent.parent))
-from utils.logger_setup import setup_logger
+from utils.logger_setup import setup_logger, get_sampler
+from utils.session_store import SessionStore
+from utils.context_factory import create_context, create_context_async, get_network_stats
+from utils.page_extractor import extract_profile, PROFILE_SCRIPT
+from utils.rate_limiter import TokenBucket
+from utils.pacing import Pacer
+from utils.profile_cache import ProfileCache, STATUS_OK, STATUS_BELOW_THRESHOLD, UNAVAILABLE_STATUSES
+from utils.profile_state import open_profile, open_profile_async
+from utils.response_capture import ResponseCapture
+from utils.checkpoint import CheckpointJournal
+from utils.result_store import ParquetResultStore, parse_result_filename
+from utils.follower_count import parse_follower_count, parse_follower_counts
+from utils.candidate_priority import score_candidates
+from utils.metrics import get_metrics
 
 # ロガー設定
 logger = setup_logger(__file__)
+sampler = get_sampler()  # アカウントごとのログを一定件数までに抑える
 
 class TwitterProfileScraper:
     """
     Twitterのプロフィール情報を抽出するスクレイパー
     """
 
-    def __init__(self, min_followers=10000):
+    def __init__(self, min_followers=10000, save_csv=True, capture_network=False, base_url="https://twitter.com",
+                 use_cache=True, cache_ttl_days=7, pacer=None, resume=False, result_format="csv", since=None,
+                 checkpoint_dir=None, prefilter_margin=0.2, prioritize=True, target_count=None):
         """初期化処理"""
         self.min_followers = min_followers
+        self.prioritize = prioritize  # Trueの場合は一致したクエリ数・投稿数・新しさのスコア順に取得
+        self.target_count = target_count  # 条件を満たすアカウントがこの件数に達したら終了（Noneで全件）
+        # 検索時に取得した投稿者のフォロワー数が最小フォロワー数からこの割合以上離れていればページを開かずに判定（Noneで無効）
+        self.prefilter_margin = prefilter_margin
+        self.search_profiles = {}  # 小文字ユーザー名 -> 検索時に取得した (フォロワー数, Bio)
+        self.prefiltered = {"below": 0, "above": 0}
+        self.resume = resume  # Trueの場合は中断した実行のジャーナルを読み込み、取得済みのプロフィールを飛ばす
+        self.result_format = result_format  # "parquet" の場合は result/dataset/ から必要な列のみ読み込む
+        self.since = since  # Parquet読み込み時、この日付（YYYYMMDD）以降の検索結果のみ対象にする
+        self.checkpoint_dir = checkpoint_dir  # 再開用ジャーナルの保存先（デフォルトは checkpoint/）
+        self.metrics = get_metrics()
         self.results = []
+        self.pacer = pacer or Pacer()  # 最小間隔と混雑時のバックオフ
+        self.cache = ProfileCache(ttl_days=cache_ttl_days) if use_cache else None  # 前回までの取得結果
+        self.save_csv = save_csv  # Falseの場合はCSVを書き出さずメモリ上の結果のみ返す
+        self.capture_network = capture_network  # Trueの場合はユーザー取得APIのJSONから取得（DOMは予備）
+        self.base_url = base_url.rstrip("/")
+        self.current_date = datetime.now().strftime("%Y%m%d")
         logger.info(f"TwitterProfileScraper initialized with min_followers={min_followers}")
 
         # 入力・出力ディレクトリの設定
@@ -39,19 +76,12 @@ class TwitterProfileScraper:
         """Playwrightを起動してスクレイピングを開始"""
         with sync_playwright() as p:
             browser = p.chromium.launch(headless=False)  # ヘッドありで実行（デバッグ用）
-            context = browser.new_context(viewport={"width": 1280, "height": 800})
+            session = SessionStore(base_url=self.base_url)
+            context = create_context(browser, session, profile="scrape-minimal")
             page = context.new_page()
 
-            # Twitterのログインページ
-            page.goto("https://twitter.com/login")
-            logger.info("Navigated to Twitter login page")
-
-            # NOTE: ログイン処理は手動で行う想定
-            logger.info("Waiting for manual login (60 seconds)")
-            page.wait_for_timeout(60000)  # 1分間待機してログイン
-
-            # ログイン確認
-            if "twitter.com/home" in page.url:
+            # 保存済みセッションでログイン確認（無効な場合のみ手動ログイン）
+            if session.ensure_login(page):
                 logger.info("Login successful")
                 self.fetch_profiles(page)
             else:
@@ -59,102 +89,492 @@ class TwitterProfileScraper:
 
             browser.close()
 
-    def fetch_profiles(self, page):
-        """結果ファイルから抽出したユーザープロフィールを取得"""
-        # 結果ディレクトリ内のCSVファイルを検索
-        result_files = list(self.result_dir.glob("*.csv"))
+    def start_async(self, results_df=None, concurrency=4, requests_per_minute=20):
+        """非同期APIでブラウザを起動し、複数ページでプロフィールを並行取得"""
+        return asyncio.run(self.run_async(results_df, concurrency, requests_per_minute))
 
-        if not result_files:
-            logger.error("No result files found. Run search_tweets.py first.")
+    async def run_async(self, results_df=None, concurrency=4, requests_per_minute=20):
+        """start_async の本体"""
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=False)  # ヘッドありで実行（デバッグ用）
+            session = SessionStore(base_url=self.base_url)
+            context = await create_context_async(browser, session, profile="scrape-minimal")
+            page = await context.new_page()
+
+            try:
+                # 保存済みセッションでログイン確認（無効な場合のみ手動ログイン）
+                if not await session.ensure_login_async(page):
+                    logger.error("Login failed or timeout")
+                    return pd.DataFrame()
+
+                logger.info("Login successful")
+                await page.close()
+                return await self.fetch_profiles_async(context, results_df, concurrency, requests_per_minute)
+            finally:
+                await browser.close()
+
+    def load_sources(self, results_df=None):
+        """
+        プロフィール取得対象の検索結果を読み込む
+
+        Args:
+            results_df: 検索ステージから渡された結果（Noneの場合はresult/のCSVまたはデータセットを読み込む）
+
+        Returns:
+            List[Tuple[str, DataFrame]]: (ソース名, 検索結果) のリスト
+        """
+        if results_df is not None:
+            return [("in-memory search results", results_df)]
+
+        if self.result_format == "parquet":
+            df = ParquetResultStore().read(columns=["username", "url", "followers", "bio", "query", "tweeted_at"],
+                                           start_date=self.since)
+            return [("parquet dataset", df)] if not df.empty else []
+
+        sources = []
+        for file_path in self.result_dir.glob("*.csv"):
+            try:
+                # 数字のみのユーザー名が数値として読み込まれないよう文字列として読む
+                df = pd.read_csv(file_path, dtype={"username": str})
+                # query 列がない旧形式のCSVはファイル名からクエリを復元（優先度の一致したクエリ数に使用）
+                if "query" not in df.columns:
+                    df["query"] = parse_result_filename(file_path.stem)[1]
+                sources.append((file_path.name, df))
+            except Exception as e:
+                logger.exception(f"Error processing file {file_path.name}: {str(e)}")
+
+        return sources
+
+    def collect_candidates(self, sources):
+        """
+        検索結果から重複を除いたプロフィール取得対象を取り出す（優先度順、無効時は出現順）
+
+        Args:
+            sources: load_sources の戻り値
+
+        Returns:
+            List[Tuple[str, str]]: (ユーザー名, プロフィールURL) のリスト
+        """
+        frames = []
+        for source_name, df in sources:
+            logger.info(f"Processing file: {source_name}")
+
+            # username, url列が存在するか確認
+            if "username" not in df.columns or "url" not in df.columns:
+                logger.warning(f"Required columns missing in {source_name}")
+                continue
+
+            self.collect_search_profiles(df)
+            # query 列がないソースはソースごとに1つのクエリとして数える
+            if "query" not in df.columns:
+                df = df.assign(query=source_name)
+            frames.append(df[[c for c in ("username", "url", "query", "tweeted_at") if c in df.columns]])
+
+        if not frames:
+            return []
+
+        rows = pd.concat(frames, ignore_index=True).dropna(subset=["username"])
+        # 検索ステージから渡された結果でも数字のみのユーザー名を文字列として扱う
+        rows["username"] = rows["username"].astype(str)
+        ranked = score_candidates(rows)
+
+        # 収集済みアカウントの重複
+        duplicates = len(rows) - len(ranked)
+        if duplicates:
+            logger.info("Skipped {} already processed accounts", duplicates)
+
+        if self.prioritize:
+            top = ranked.head(5)
+            logger.info("Prioritized {} candidates by matching queries, tweets and recency (top: {})", len(ranked),
+                        ", ".join(f"@{u} {s:.2f}" for u, s in zip(top["username"], top["score"])))
+            return list(zip(ranked["username"], ranked["url"]))
+
+        deduped = rows.drop_duplicates("username")
+        return list(zip(deduped["username"], deduped["url"]))
+
+    def target_reached(self, remaining=0):
+        """条件を満たすアカウントが目標件数に達したか（達した場合は残りの件数をログに出力）"""
+        if self.target_count is None or len(self.results) < self.target_count:
+            return False
+
+        if remaining:
+            logger.info(f"Reached target of {self.target_count} accounts; skipped the remaining {remaining} candidates")
+            self.metrics.count("profiles_skipped_by_target", remaining)
+        return True
+
+    def collect_search_profiles(self, df):
+        """検索時に取得できた投稿者のフォロワー数・Bioを記録する（0は未取得として扱う）"""
+        if "followers" not in df.columns:
             return
 
-        # 収集済みアカウントの重複を避けるための集合
-        processed_accounts = set()
+        followers = pd.to_numeric(df["followers"], errors="coerce").fillna(0)
+        bios = df["bio"].fillna("").astype(str) if "bio" in df.columns else pd.Series("", index=df.index)
+        known = followers > 0
+        for username, count, bio in zip(df["username"][known], followers[known], bios[known]):
+            self.search_profiles.setdefault(str(username).lower(), (int(count), bio))
+
+    def search_time_profile(self, username):
+        """
+        検索時のフォロワー数で最小フォロワー数の判定が明らかな場合、その (フォロワー数, Bio) を返す
+
+        Returns:
+            Tuple[int, str]: 判定に使うプロフィール（未取得・境界付近の場合はNone）
+        """
+        known = self.search_profiles.get(username.lower())
+        if not known or self.prefilter_margin is None:
+            return None
+
+        followers = known[0]
+        if followers < self.min_followers * (1 - self.prefilter_margin):
+            return known
+        if followers >= self.min_followers * (1 + self.prefilter_margin):
+            return known
+        return None
+
+    def apply_search_time(self, username, profile_url, profile):
+        """検索時のプロフィールで判定（ページは開かない）"""
+        self.metrics.count("profiles_from_search")
+        qualified = self.add_if_qualified(username, profile_url, *profile)
+        self.prefiltered["above" if qualified else "below"] += 1
+
+    def read_profile(self, page, username, capture=None):
+        """
+        表示中のプロフィールページからフォロワー数とBioを取得する
+
+        Args:
+            page: Playwrightのページ
+            username: ユーザー名
+            capture: ResponseCapture（捕捉済みのJSONがあれば正確な値を使用）
+
+        Returns:
+            Tuple[int, str]: (フォロワー数, Bio)
+        """
+        captured = capture.user(username) if capture else None
+        if captured:
+            return captured["followers"], captured["bio"]
+
+        # フォロワー数とBioを1回のpage.evaluateで取得
+        started = time.perf_counter()
+        profile = extract_profile(page)
+        logger.debug("Extracted profile fields for {} in {:.1f} ms", username, (time.perf_counter() - started) * 1000)
+
+        # フォロワー数を数値に変換 (1.5K -> 1500, 1M -> 1000000, 1.2万 -> 12000)
+        return self.parse_follower_count(profile["followers_text"]), profile["bio"]
+
+    def add_if_qualified(self, username, profile_url, followers, bio):
+        """最小フォロワー数を満たすアカウントを結果に追加（追加した場合True）"""
+        if followers >= self.min_followers:
+            sampler.log("profile added", "INFO", "@{} | Followers: {} → Added", username, followers)
+            self.results.append({
+                "username": username,
+                "url": profile_url,
+                "bio": bio,
+                "followers": followers
+            })
+            return True
+
+        sampler.log("profile below minimum", "INFO", "@{} | Followers: {} → Skipped (below minimum)", username, followers)
+        return False
+
+    def record_profile(self, username, profile_url, followers, bio):
+        """取得したプロフィールを判定し、結果をキャッシュに保存"""
+        qualified = self.add_if_qualified(username, profile_url, followers, bio)
+        if self.cache:
+            with self.metrics.timer("io", "cache"):
+                self.cache.put(username, followers, bio, STATUS_OK if qualified else STATUS_BELOW_THRESHOLD)
+
+    def record_unavailable(self, username, status, journal=None):
+        """存在しない・凍結・非公開と判定したアカウントを記録する（有効期間内はページを開かない）"""
+        sampler.log("profile unavailable", "INFO", "@{} | Profile is {} → Skipped", username, status)
+        self.metrics.count(f"profiles_{status}")
+        if journal:
+            with self.metrics.timer("io", "checkpoint"):
+                journal.append({"username": username, "followers": 0, "bio": "", "status": status})
+        if self.cache:
+            with self.metrics.timer("io", "cache"):
+                self.cache.put(username, status=status)
+
+    def lookup_cache(self, username):
+        """有効期間内のキャッシュを取得（キャッシュ無効時・ミス時はNone）"""
+        return self.cache.get(username) if self.cache else None
+
+    def apply_cached(self, username, profile_url, cached):
+        """キャッシュの内容で判定（最小フォロワー数は現在の設定で再判定）"""
+        self.metrics.count("profiles_from_cache")
+        if cached["status"] in UNAVAILABLE_STATUSES:
+            sampler.log("cached skip", "INFO", "@{} | Cached as {} → Skipped", username, cached["status"])
+            return
 
-        for file_path in result_files:
-            logger.info(f"Processing file: {file_path.name}")
+        self.add_if_qualified(username, profile_url, cached["followers"], cached["bio"])
 
-            try:
-                df = pd.read_csv(file_path)
+    def open_journal(self):
+        """
+        取得したプロフィールを1件ずつ追記するジャーナルを開く
 
-                # username, url列が存在するか確認
-                if "username" not in df.columns or "url" not in df.columns:
-                    logger.warning(f"Required columns missing in {file_path.name}")
-                    continue
+        Returns:
+            Tuple[CheckpointJournal, Dict[str, Dict]]: ジャーナルと、小文字ユーザー名をキーとする取得済みのプロフィール
+        """
+        journal = CheckpointJournal("profiles", self.current_date, resume=self.resume, journal_dir=self.checkpoint_dir)
+        done = {r["username"].lower(): r for r in journal.records if r.get("username")}
+        return journal, done
 
-                # 各ユーザーのプロフィールを取得
-                for _, row in df.iterrows():
-                    username = row["username"]
-                    profile_url = row["url"]
+    def apply_journaled(self, username, profile_url, record):
+        """中断前に取得済みのプロフィールで判定（ページは開かない）"""
+        logger.debug("@{} | Restored from checkpoint", username)
+        self.metrics.count("profiles_from_checkpoint")
+        if record.get("status") in UNAVAILABLE_STATUSES:
+            return
+        self.add_if_qualified(username, profile_url, self.parse_follower_count(record["followers"]), record["bio"])
+
+    def report_cache(self):
+        """キャッシュのヒット・ミス件数、検索時のデータで省いたページ読み込み数（と抑えたログの件数）を出力"""
+        sampler.flush()
+        avoided = self.prefiltered["below"] + self.prefiltered["above"]
+        if avoided:
+            logger.info(f"Avoided {avoided} profile page loads using follower counts captured at search time "
+                        f"({self.prefiltered['below']} below, {self.prefiltered['above']} above the threshold)")
+        if self.cache:
+            logger.info(f"Profile cache: {self.cache.hits} hits, {self.cache.misses} misses")
+
+    def fetch_profiles(self, page, results_df=None):
+        """
+        検索結果から抽出したユーザープロフィールを取得し、条件を満たしたアカウントをDataFrameで返す
+
+        Args:
+            page: Playwrightのページ
+            results_df: 検索ステージの結果（Noneの場合はresult/のCSVを使用）
+        """
+        sources = self.load_sources(results_df)
+
+        if not sources:
+            logger.error("No result files found. Run search_tweets.py first.")
+            return pd.DataFrame()
 
-                    # 重複チェック
-                    if username in processed_accounts:
-                        logger.info(f"Skipping already processed account: {username}")
-                        continue
+        candidates = self.collect_candidates(sources)
 
-                    processed_accounts.add(username)
+        capture = ResponseCapture(self.base_url) if self.capture_network else None
+        if capture:
+            capture.attach(page)
 
-                    try:
-                        # プロフィールページにアクセス
-                        page.goto(profile_url)
-                        logger.info(f"Visiting profile: {profile_url}")
-                        page.wait_for_selector('div[data-testid="primaryColumn"]', timeout=30000)
+        self.pacer.attach(page)
+        journal, done = self.open_journal()
 
-                        # フォロワー数取得
-                        followers_el = page.query_selector('a[href$="/followers"] span span')
-                        followers_text = followers_el.inner_text() if followers_el else "0"
+        # 各ユーザーのプロフィールを取得
+        for position, (username, profile_url) in enumerate(candidates):
+            # 目標件数に達したら残りの候補は開かない
+            if self.target_reached(len(candidates) - position):
+                break
 
-                        # フォロワー数を数値に変換 (1.5K -> 1500, 1M -> 1000000)
-                        followers = self.parse_follower_count(followers_text)
+            # 中断前に取得済みのアカウントはページを開かない
+            record = done.get(username.lower())
+            if record:
+                self.apply_journaled(username, profile_url, record)
+                continue
 
-                        # Bio取得
-                        bio_el = page.query_selector('div[data-testid="UserDescription"]')
-                        bio = bio_el.inner_text() if bio_el else ""
+            # 有効期間内に取得済みのアカウントはページを開かない
+            cached = self.lookup_cache(username)
+            if cached:
+                self.apply_cached(username, profile_url, cached)
+                continue
 
-                        # 最小フォロワー数チェック
-                        if followers >= self.min_followers:
-                            logger.info(f"@{username} | Followers: {followers} → Added")
-                            self.results.append({
-                                "username": username,
-                                "url": profile_url,
-                                "bio": bio,
-                                "followers": followers
-                            })
-                        else:
-                            logger.info(f"@{username} | Followers: {followers} → Skipped (below minimum)")
+            # 検索時のフォロワー数が最小フォロワー数から十分に離れていればページを開かない
+            search_profile = self.search_time_profile(username)
+            if search_profile:
+                self.apply_search_time(username, profile_url, search_profile)
+                continue
 
-                        # API制限対策の待機
-                        page.wait_for_timeout(3000)
+            try:
+                # API制限対策（前回のアクセス開始から最小間隔が経過するまで、または混雑時はバックオフして待機）
+                self.pacer.wait(page, "profile")
+
+                # プロフィールページにアクセス（存在しない・凍結・非公開は描画を待たずに判定して飛ばす）
+                status = open_profile(page, f"{self.base_url}/{username}", username, capture)
+                logger.info("Visiting profile: {}", profile_url)
+                if status in UNAVAILABLE_STATUSES:
+                    self.record_unavailable(username, status, journal)
+                    continue
+
+                with self.metrics.timer("extract", username):
+                    followers, bio = self.read_profile(page, username, capture)
+                with self.metrics.timer("io", "checkpoint"):
+                    journal.append({"username": username, "followers": followers, "bio": bio})
+                self.metrics.count("profiles_fetched")
+                self.record_profile(username, profile_url, followers, bio)
 
-                    except Exception as e:
-                        logger.warning(f"Error fetching profile for {username}: {str(e)}")
+                stats = get_network_stats(page.context)
+                if stats:
+                    stats.report(f"profile @{username}", level="DEBUG")
 
             except Exception as e:
-                logger.exception(f"Error processing file {file_path.name}: {str(e)}")
+                logger.warning(f"Error fetching profile for {username}: {str(e)}")
+
+        if capture:
+            capture.detach(page)
+
+        self.pacer.detach(page)
+        journal.close()
+
+        stats = get_network_stats(page.context)
+        if stats:
+            stats.report_total("profile stage")
+
+        self.report_cache()
 
         # 結果を保存
-        self.save_results()
+        return self.save_results()
+
+    async def read_profile_async(self, page, username, capture=None):
+        """read_profile の非同期版（フォロワー数は表記のまま返し、取得後にまとめて数値に変換する）"""
+        captured = await capture.user_async(username) if capture else None
+        if captured:
+            return captured["followers"], captured["bio"]
+
+        profile = await page.evaluate(PROFILE_SCRIPT)
+        return profile["followers_text"], profile["bio"]
+
+    async def fetch_profiles_async(self, context, results_df=None, concurrency=4, requests_per_minute=20):
+        """
+        同一コンテキスト内の複数ページでプロフィールを並行取得する（結果・順序・判定は逐次処理と同じ）
+
+        Args:
+            context: 非同期APIのブラウザコンテキスト
+            results_df: 検索ステージの結果（Noneの場合はresult/のCSVを使用）
+            concurrency: 同時に使用するページ数
+            requests_per_minute: 全ページ合計の1分あたりの最大アクセス数
+        """
+        sources = self.load_sources(results_df)
+
+        if not sources:
+            logger.error("No result files found. Run search_tweets.py first.")
+            return pd.DataFrame()
+
+        candidates = self.collect_candidates(sources)
+        outcomes = [None] * len(candidates)
+        unavailable = {}  # 添字 -> 存在しない・凍結・非公開の状態
+        cached_entries = {}
+        search_entries = {}  # 添字 -> 検索時のプロフィール
+        qualified = [None] * len(candidates)  # 添字 -> 条件を満たすか（未判定はNone。目標件数の判定に使用）
+        journal, done = self.open_journal()
+
+        # 全ページで共有するレートリミッターと作業キュー（中断前に取得済み・有効なキャッシュがあるアカウントは除外）
+        limiter = TokenBucket(requests_per_minute)
+        queue = asyncio.Queue()
+        for index, (username, profile_url) in enumerate(candidates):
+            record = done.get(username.lower())
+            if record:
+                qualified[index] = (record.get("status") not in UNAVAILABLE_STATUSES
+                                    and self.parse_follower_count(record["followers"]) >= self.min_followers)
+                continue
+
+            cached = self.lookup_cache(username)
+            search_profile = self.search_time_profile(username) if not cached else None
+            if cached:
+                cached_entries[index] = cached
+                qualified[index] = (cached["status"] not in UNAVAILABLE_STATUSES
+                                    and cached["followers"] >= self.min_followers)
+            elif search_profile:
+                search_entries[index] = search_profile
+                qualified[index] = search_profile[0] >= self.min_followers
+            else:
+                queue.put_nowait((index, (username, profile_url)))
+
+        def target_met():
+            # 優先度順で判定済みの先頭部分だけで目標件数に達したか（逐次処理と同じアカウントで止まる）
+            if self.target_count is None:
+                return False
+            count = 0
+            for decided in qualified:
+                if decided is None:
+                    return False
+                count += decided
+                if count >= self.target_count:
+                    return True
+            return False
+
+        capture = ResponseCapture(self.base_url) if self.capture_network else None
+        pages = [await context.new_page() for _ in range(max(1, min(concurrency, queue.qsize())))]
+        for page in pages:
+            self.pacer.attach(page)
+            if capture:
+                capture.attach(page)
+
+        logger.info(f"Fetching {queue.qsize()} profiles with {len(pages)} pages at {requests_per_minute} requests/min")
+
+        async def worker(page):
+            while not queue.empty() and not target_met():
+                index, (username, profile_url) = queue.get_nowait()
+                qualified[index] = False  # 取得できなかった場合・存在しない場合は条件を満たさない
+                await limiter.acquire_async()
+                await self.pacer.wait_async("backoff")  # 429・サーバーエラー検知時のみ待機
+
+                try:
+                    status = await open_profile_async(page, f"{self.base_url}/{username}", username, capture)
+                    logger.info("Visiting profile: {}", profile_url)
+                    if status in UNAVAILABLE_STATUSES:
+                        unavailable[index] = status
+                        with self.metrics.timer("io", "checkpoint"):
+                            journal.append({"username": username, "followers": 0, "bio": "", "status": status})
+                        continue
+
+                    with self.metrics.timer("extract", username):
+                        outcomes[index] = await self.read_profile_async(page, username, capture)
+                    if self.target_count is not None:
+                        qualified[index] = self.parse_follower_count(outcomes[index][0]) >= self.min_followers
+                    with self.metrics.timer("io", "checkpoint"):
+                        journal.append({"username": username, "followers": outcomes[index][0], "bio": outcomes[index][1]})
+                    self.metrics.count("profiles_fetched")
+
+                except Exception as e:
+                    logger.warning(f"Error fetching profile for {username}: {str(e)}")
+
+        await asyncio.gather(*(worker(page) for page in pages))
+
+        for page in pages:
+            await page.close()
+
+        journal.close()
+
+        stats = get_network_stats(context)
+        if stats:
+            stats.report(f"{len(pages)} profile pages")
+
+        # 取得したフォロワー数の表記をまとめて数値に変換
+        fetched = [index for index, outcome in enumerate(outcomes) if outcome]
+        if fetched:
+            counts = parse_follower_counts(pd.Series([outcomes[index][0] for index in fetched], dtype=object))
+            for index, followers in zip(fetched, counts):
+                outcomes[index] = (int(followers), outcomes[index][1])
+
+        # 逐次処理と同じ順序で最小フォロワー数を判定
+        for index, ((username, profile_url), outcome) in enumerate(zip(candidates, outcomes)):
+            if self.target_reached(len(candidates) - index):
+                break
+
+            if username.lower() in done:
+                self.apply_journaled(username, profile_url, done[username.lower()])
+            elif index in cached_entries:
+                self.apply_cached(username, profile_url, cached_entries[index])
+            elif index in search_entries:
+                self.apply_search_time(username, profile_url, search_entries[index])
+            elif index in unavailable:
+                self.record_unavailable(username, unavailable[index])
+            elif outcome:
+                self.record_profile(username, profile_url, *outcome)
+
+        self.report_cache()
+
+        # 結果を保存
+        return self.save_results()
 
     def parse_follower_count(self, count_text):
-        """フォロワー数のテキスト表記を数値に変換"""
-        count_text = count_text.replace(",", "")
-
-        try:
-            if "K" in count_text:
-                return int(float(count_text.replace("K", "")) * 1000)
-            elif "M" in count_text:
-                return int(float(count_text.replace("M", "")) * 1000000)
-            else:
-                return int(count_text)
-        except ValueError:
-            logger.warning(f"Could not parse follower count: {count_text}")
-            return 0
+        """フォロワー数のテキスト表記を数値に変換（K/M/B・千/万/億・全角数字に対応）"""
+        return parse_follower_count(count_text)
 
     def save_results(self):
-        """収集結果をCSVファイルに保存"""
+        """収集結果をフォロワー数順のDataFrameにしてCSVファイルに保存"""
         if not self.results:
             logger.warning("No profiles matching criteria were found")
-            return
+            return pd.DataFrame()
 
         # 結果をDataFrameに変換
         df = pd.DataFrame(self.results)
@@ -163,12 +583,47 @@ class TwitterProfileScraper:
         df = df.sort_values("followers", ascending=False)
 
         # CSVに保存
-        df.to_csv(self.output_file, index=False, encoding="utf-8")
-        logger.info(f"Saved {len(self.results)} filtered accounts to {self.output_file}")
+        if self.save_csv:
+            with self.metrics.timer("io", self.output_file.name):
+                df.to_csv(self.output_file, index=False, encoding="utf-8")
+            logger.info(f"Saved {len(self.results)} filtered accounts to {self.output_file}")
+
+        return df
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="検索結果のアカウントのプロフィールを取得")
+    parser.add_argument("--concurrency", type=int, default=1, help="同時に使用するページ数（2以上で非同期モード）")
+    parser.add_argument("--requests-per-minute", type=int, default=20, help="非同期モードでの1分あたりの最大アクセス数")
+    parser.add_argument("--no-cache", action="store_true", help="プロフィールキャッシュを使用しない")
+    parser.add_argument("--cache-ttl-days", type=int, default=7, help="プロフィールキャッシュの有効期間（日）")
+    parser.add_argument("--resume", action="store_true", help="中断した当日の実行を再開し、取得済みのプロフィールを飛ばす")
+    parser.add_argument("--result-format", choices=["csv", "parquet"], default="csv", help="検索結果の読み込み元の形式")
+    parser.add_argument("--since", default=None, help="Parquet形式の場合、この日付（YYYYMMDD）以降の検索結果のみ対象にする")
+    parser.add_argument("--prefilter-margin", type=float, default=0.2,
+                        help="検索時のフォロワー数が最小フォロワー数からこの割合以上離れていればページを開かない")
+    parser.add_argument("--no-prefilter", action="store_true", help="検索時のフォロワー数を使わず全員のページを開く")
+    parser.add_argument("--target-count", type=int, default=None, help="条件を満たすアカウントがこの件数に達したら終了する")
+    parser.add_argument("--no-prioritize", action="store_true", help="優先度順ではなく検索結果の出現順に取得する")
+    parser.add_argument("--capture-network", action="store_true", help="APIレスポンスのJSONから取得する")
+    args = parser.parse_args()
+
     logger.info("Starting Twitter Profile Scraper")
-    scraper = TwitterProfileScraper(min_followers=10000)  # 最小フォロワー数10,000
-    scraper.start()
-    logger.info("Twitter Profile Scraper finished")
\ No newline at end of file
+    scraper = TwitterProfileScraper(
+        min_followers=10000,  # 最小フォロワー数10,000
+        use_cache=not args.no_cache,
+        cache_ttl_days=args.cache_ttl_days,
+        resume=args.resume,
+        result_format=args.result_format,
+        since=args.since,
+        prefilter_margin=None if args.no_prefilter else args.prefilter_margin,
+        prioritize=not args.no_prioritize,
+        target_count=args.target_count,
+        capture_network=args.capture_network,
+    )
+    if args.concurrency > 1:
+        scraper.start_async(concurrency=args.concurrency, requests_per_minute=args.requests_per_minute)
+    else:
+        scraper.start()
+    scraper.metrics.report("Profile metrics")
+    logger.info("Twitter Profile Scraper finished")
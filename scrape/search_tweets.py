@@ -4,6 +4,7 @@
 import os
 import sys
 import time
+import argparse
 import pandas as pd
 from pathlib import Path
 from datetime import datetime
@@ -12,21 +13,69 @@ from typing import List, Dict, Any, Tuple
 
 # 相対インポート対応
 sys.path.append(str(Path(__file__).parent.parent))
-from utils.keyword_parser import parse_keywords
-from utils.logger_setup import setup_logger
+from utils.keyword_parser import parse_keywords, plan_queries, match_members, log_query_plan, result_filename
+from utils.logger_setup import setup_logger, get_sampler
 from utils.filename_generator import generate_filename
+from utils.session_store import SessionStore
+from utils.context_factory import create_context, get_network_stats
+from utils.timeline_harvester import TimelineHarvester
+from utils.response_capture import ResponseCapture
+from utils.pacing import Pacer
+from utils.checkpoint import CheckpointJournal
+from utils.result_writer import StreamingCsvWriter
+from utils.result_store import ParquetResultStore
+from utils.search_state import SearchWatermarks
+from utils.metrics import get_metrics
 
 # ロガー設定
 logger = setup_logger(__file__)
+sampler = get_sampler()  # スクロールごとのログを一定件数までに抑える
+
+# 検索結果CSVの列
+RESULT_COLUMNS = ["username", "url", "bio", "followers", "tweet_url", "tweet_content", "tweeted_at", "query"]
+
+# 後続のステージ（プロフィール取得・DM生成）がメモリ上の結果から使う列（本文を持ち続けない）
+# 検索結果の投稿、または結果がない場合の空状態のいずれかが描画されたら判定できる
+SEARCH_READY_SELECTOR = 'article, div[data-testid="emptyState"]'
+
+HANDOFF_COLUMNS = ["username", "url", "bio", "followers", "tweeted_at", "query"]
+
+# 完了したクエリの結果をメモリ上にどこまで残すか
+#   all: すべての列 / handoff: HANDOFF_COLUMNS のみ / none: 残さない（結果はファイルのみ）
+COLLECT_MODES = ("all", "handoff", "none")
 
 class TwitterSearchScraper:
    """
    Twitterの検索結果から投稿者情報を抽出するスクレイパー
    """
 
-   def __init__(self):
+   def __init__(self, save_csv=True, capture_network=False, base_url="https://twitter.com", pacer=None, resume=False,
+                result_format="csv", keywords_path=None, max_tweets=100, checkpoint_dir=None, merge_queries=True,
+                max_query_length=500, incremental=False, shard=None, collect=None):
        """初期化処理"""
-       self.results = []
+       if collect is not None and collect not in COLLECT_MODES:
+           raise ValueError(f"Unknown collect mode: {collect} (choose from {', '.join(COLLECT_MODES)})")
+
+       self.results = []  # 処理中のクエリの結果のみ（クエリ完了ごとにDataFrameへまとめて破棄）
+       self.frames = []  # 完了したクエリごとの結果（collect の列のみ）
+       self.row_count = 0  # 完了したクエリの結果の行数（メモリ上に残さない場合も数える）
+       # メモリ上に残す結果（デフォルトはファイルに保存する場合は受け渡し用の列のみ、保存しない場合はすべて）
+       self.collect = collect or ("handoff" if save_csv else "all")
+       self.resume = resume  # Trueの場合は中断した実行のジャーナルを読み込み、完了済みのクエリを飛ばす
+       self.pacer = pacer or Pacer()  # 通信完了・描画を待ちつつ最小間隔とバックオフを守る
+       self.save_csv = save_csv  # Falseの場合はCSVを書き出さずメモリ上の結果のみ返す
+       self.store = ParquetResultStore() if result_format == "parquet" else None  # 指定時はCSVの代わりにParquetで保存
+       self.keywords_path = Path(keywords_path) if keywords_path else Path(__file__).parent.parent / "config" / "keywords.csv"
+       self.max_tweets = max_tweets  # クエリごとの最大収集数
+       self.merge_queries = merge_queries  # Trueの場合は重複する行・ORでまとめられる行を1回の検索に統合
+       self.max_query_length = max_query_length  # 統合後の検索クエリの最大文字数
+       self.incremental = incremental  # Trueの場合は前回までに収集した最新の投稿より新しい投稿のみ収集して追記
+       self.watermarks = SearchWatermarks() if incremental else None
+       self.shard = shard  # 分散検索のワーカー番号（ジャーナルをワーカーごとに分け、最新IDの記録は親プロセスが保存）
+       self.checkpoint_dir = checkpoint_dir  # 再開用ジャーナルの保存先（デフォルトは checkpoint/）
+       self.metrics = get_metrics()
+       self.capture_network = capture_network  # Trueの場合は検索タイムラインのJSONから収集（DOMは予備）
+       self.base_url = base_url.rstrip("/")
        self.current_date = datetime.now().strftime("%Y%m%d")
        logger.info(f"TwitterSearchScraper initialized at {self.current_date}")
 
@@ -38,19 +87,12 @@ class TwitterSearchScraper:
        """Playwrightを起動してスクレイピングを開始"""
        with sync_playwright() as p:
            browser = p.chromium.launch(headless=False)  # ヘッドありで実行（デバッグ用）
-           context = browser.new_context(viewport={"width": 1280, "height": 800})
+           session = SessionStore(base_url=self.base_url)
+           context = create_context(browser, session, profile="scrape-minimal")
            page = context.new_page()
 
-           # Twitterのログインページ
-           page.goto("https://twitter.com/login")
-           logger.info("Navigated to Twitter login page")
-
-           # NOTE: ログイン処理は手動で行う想定
-           logger.info("Waiting for manual login (60 seconds)")
-           page.wait_for_timeout(60000)  # 1分間待機してログイン
-
-           # ログイン確認
-           if "twitter.com/home" in page.url:
+           # 保存済みセッションでログイン確認（無効な場合のみ手動ログイン）
+           if session.ensure_login(page):
                logger.info("Login successful")
                self.search_keywords(page)
            else:
@@ -58,128 +100,314 @@ class TwitterSearchScraper:
 
            browser.close()
 
-   def search_keywords(self, page):
-       """キーワードリストで検索実行"""
-       keywords_path = Path(__file__).parent.parent / "config" / "keywords.csv"
-       logger.info(f"Loading keywords from {keywords_path}")
+   def search_keywords(self, page, plans=None):
+       """
+       キーワードリストで検索実行し、収集結果をDataFrameで返す
 
-       try:
-           # キーワード解析
-           keywords_df = pd.read_csv(keywords_path)
-           search_queries = parse_keywords(keywords_df)
-
-           for query_info in search_queries:
-               query = query_info["query"]
-               operator = query_info["operator"]
-               keywords = query_info["keywords"]
-
-               logger.info(f"Searching for: {query} (operator: {operator})")
+       Args:
+           page: Playwrightのページ
+           plans: 実行する検索（plan_queries の形式の反復可能オブジェクト。Noneの場合はキーワードリストから作成）
+       """
+       capture = ResponseCapture(self.base_url) if self.capture_network else None
+       if capture:
+           capture.attach(page)
 
-               # 検索URL生成
-               encoded_query = query.replace(' ', '%20').replace('#', '%23')
-               search_url = f"https://twitter.com/search?q={encoded_query}&src=typed_query&f=live"
+       self.pacer.attach(page)
 
-               page.goto(search_url)
-               logger.info(f"Navigated to search URL: {search_url}")
-               page.wait_for_selector("article", timeout=30000)
+       # 完了したクエリごとに結果を追記するジャーナル（中断しても完了済みのクエリは失われない）
+       run_id = self.current_date if self.shard is None else f"{self.current_date}_w{self.shard}"
+       journal = CheckpointJournal("search", run_id, resume=self.resume, journal_dir=self.checkpoint_dir)
+       completed = {r["query"]: r for r in journal.records if r.get("type") == "query"}
 
-               # スクロールして投稿を収集
-               self.scroll_and_collect_tweets(page, query, operator, keywords)
-
-               # 結果を保存
-               filename = generate_filename(keywords, operator, self.current_date)
-               self.save_results(filename, query)
+       try:
+           if plans is None:
+               plans = self.load_plans(completed)
 
-               # APIリミット対策の待機
-               logger.info(f"Waiting 10 seconds before next search...")
-               page.wait_for_timeout(10000)
+           for plan in plans:
+               # 1つの検索の失敗で残りの検索を止めない（失敗した検索はジャーナルに記録されず、--resume で再実行される）
+               try:
+                   self.search_plan(page, plan, capture, journal)
+               except Exception as e:
+                   logger.exception(f"Error during search for {plan['query']}: {str(e)}")
+                   self.metrics.count("queries_failed")
+                   self.results = []
 
        except Exception as e:
            logger.exception(f"Error during keyword search: {str(e)}")
 
-   def scroll_and_collect_tweets(self, page, query, operator, keywords):
-       """ページをスクロールして投稿を収集"""
-       tweet_count = 0
-       previous_height = 0
-       max_tweets = 100  # 最大収集数
-
-       while tweet_count < max_tweets:
-           # 新しい投稿を取得
-           tweets = page.query_selector_all("article")
+       finally:
+           if capture:
+               capture.detach(page)
+
+           self.pacer.detach(page)
+           journal.close()
+
+           stats = get_network_stats(page.context)
+           if stats:
+               stats.report_total("search stage")
+
+       columns = HANDOFF_COLUMNS if self.collect == "handoff" else RESULT_COLUMNS
+       if not self.frames:
+           return pd.DataFrame(columns=columns)
+       return pd.concat(self.frames, ignore_index=True)
+
+   def search_plan(self, page, plan, capture, journal):
+       """
+       1つの検索を実行し、元の行ごとの結果をジャーナル・結果ファイルへ記録する
+
+       Args:
+           page: Playwrightのページ
+           plan: plan_queries の検索
+           capture: ResponseCapture（JSONから収集しない場合はNone）
+           journal: CheckpointJournal
+       """
+       query = plan["query"]
+       operator = plan["operator"]
+       members = plan["members"]
+
+       logger.info(f"Searching for: {query} (operator: {operator})")
+
+       # 差分収集: すべての行に前回の最新IDがあれば、最も古いものより新しい投稿のみ検索する
+       search_query = query
+       floor_id = self.floor_status_id(members)
+       if floor_id is not None:
+           search_query = f"{query} since_id:{floor_id}"
+           logger.info(f"Incremental search: only tweets newer than status {floor_id}")
+
+       # 検索URL生成
+       encoded_query = search_query.replace(' ', '%20').replace('#', '%23')
+       search_url = f"{self.base_url}/search?q={encoded_query}&src=typed_query&f=live"
+
+       if capture:
+           capture.reset()
+
+       # APIリミット対策（前回の検索開始から最小間隔が経過するまで、または混雑時はバックオフして待機）
+       self.pacer.wait(page, "query")
+
+       with self.metrics.timer("navigate", query):
+           page.goto(search_url)
+       logger.info(f"Navigated to search URL: {search_url}")
+       with self.metrics.timer("wait_selector", query):
+           page.wait_for_selector(SEARCH_READY_SELECTOR, timeout=30000)
+
+       # 結果がない検索（差分収集で新しい投稿がない場合など）も完了として記録する
+       has_results = page.query_selector("article") is not None
+       if not has_results:
+           logger.info(f"No tweets found for query: {query}")
+
+       # スクロールして投稿を収集（CSVへは元の行ごとのファイルに収集と同時に追記）
+       writers = {}  # 元の行のクエリ -> 書き込み先のライター（同じファイルのライターは共有）
+       files = {}  # ファイル名 -> ライター
+       if has_results and self.save_csv and not self.store:
+           for member in members:
+               filename = generate_filename(member["keywords"], member["operator"], self.current_date)
+               if filename not in files:
+                   # 差分収集で中断した行を再検索しても、ファイルに追記済みの投稿は重複させない
+                   files[filename] = StreamingCsvWriter(self.result_dir / filename, RESULT_COLUMNS,
+                                                        append=self.incremental, unique_key="tweet_url")
+               if files[filename] not in writers.setdefault(member["query"], []):
+                   writers[member["query"]].append(files[filename])
+       try:
+           if has_results:
+               self.scroll_and_collect_tweets(page, plan, capture, writers)
+       finally:
+           for filename, writer in files.items():
+               with self.metrics.timer("io", filename):
+                   writer.close()
+
+       for member in members:
+           rows = [row for row in self.results if row["query"] == member["query"]]
+           with self.metrics.timer("io", "checkpoint"):
+               journal.append({"type": "query", "query": member["query"], "rows": rows})
+           self.finish_query(member, rows)
+           if self.watermarks:
+               self.watermarks.update(member["query"], rows)
+       self.results = []
 
-           for tweet in tweets[tweet_count:]:
-               try:
-                   # ユーザー名取得
-                   username_el = tweet.query_selector('div[data-testid="User-Name"] a')
-                   if not username_el:
+       if self.watermarks and self.shard is None:
+           with self.metrics.timer("io", "watermarks"):
+               self.watermarks.save()
+
+       stats = get_network_stats(page.context)
+       if stats:
+           stats.report(f"query '{query}'")
+
+   def keep_frame(self, df):
+       """完了したクエリの結果を collect の設定に従ってメモリ上に残す"""
+       self.row_count += len(df)
+       if self.collect == "all":
+           self.frames.append(df)
+       elif self.collect == "handoff":
+           self.frames.append(df[HANDOFF_COLUMNS])
+
+   def load_plans(self, completed):
+       """
+       キーワードリストを読み込み、完了済みの行を除いて検索計画を立てる
+
+       Args:
+           completed: ジャーナルに記録済みのクエリ -> レコード（結果はそのまま使用する）
+
+       Returns:
+           List[Dict]: 実行する検索
+       """
+       logger.info(f"Loading keywords from {self.keywords_path}")
+
+       # キーワード解析
+       keywords_df = pd.read_csv(self.keywords_path)
+       search_queries = parse_keywords(keywords_df)
+
+       # 完了済みの行はジャーナルの結果を使い、残りの行のみ検索計画を立てる
+       # （同じクエリの行が複数あっても結果は1回分のみ使う）
+       pending = []
+       loaded = set()
+       for query_info in search_queries:
+           query = query_info["query"]
+           if query in completed:
+               if query not in loaded:
+                   loaded.add(query)
+                   rows = completed[query]["rows"]
+                   logger.info(f"Skipping completed query: {query} ({len(rows)} tweets from checkpoint)")
+                   self.keep_frame(pd.DataFrame(rows, columns=RESULT_COLUMNS))
+           else:
+               pending.append(query_info)
+
+       if not self.merge_queries:
+           # 統合しない場合も、同じ結果ファイルに書き込む行は1回だけ検索する
+           plans = {}
+           for query_info in pending:
+               plans.setdefault(result_filename(query_info), {**query_info, "members": [query_info]})
+           return list(plans.values())
+
+       plans = plan_queries(pending, self.max_query_length)
+       log_query_plan(plans, pending)
+       return plans
+
+   def floor_status_id(self, members):
+       """統合した行すべてに前回の最新IDがあれば、その最小値を返す（差分収集しない場合・未記録の行がある場合はNone）"""
+       if not self.watermarks:
+           return None
+
+       status_ids = [self.watermarks.status_id(member["query"]) for member in members]
+       if any(status_id is None for status_id in status_ids):
+           return None
+       return min(status_ids)
+
+   def scroll_and_collect_tweets(self, page, plan, capture=None, writers=None):
+       """
+       ページをスクロールして投稿を収集（ステータスIDで重複排除し、元の行ごとに振り分けてwritersのCSVへ追記）
+
+       Args:
+           page: 検索結果のページ
+           plan: plan_queries の検索（query と元の行のリスト members）
+           capture: ResponseCapture（JSONから収集する場合）
+           writers: 元の行のクエリ -> 書き込み先の StreamingCsvWriter のリスト
+       """
+       query = plan["query"]
+       members = plan["members"]
+       writers = writers or {}
+       max_tweets = self.max_tweets * len(members)  # 最大収集数（統合した行の数だけ増やす）
+
+       # 差分収集: 行ごとの前回の最新ID（これ以下の投稿は収集済み）
+       # 検索クエリの since_id: で最も古い最新IDより新しい投稿のみが返るため、タイムラインは新しい投稿を読み切った
+       # 時点で末尾になる（統合した行ごとの最新IDとの差だけここで除く）
+       seen_until = {}
+       if self.watermarks:
+           seen_until = {member["query"]: self.watermarks.status_id(member["query"]) for member in members}
+       max_idle_steps = 3  # 新しい投稿が見つからないスクロールがこの回数続いたら終了（タイムライン末尾）
+
+       harvester = TimelineHarvester(page, max_tweets=max_tweets, max_idle_steps=max_idle_steps,
+                                     capture=capture, base_url=self.base_url)
+       harvester.install()
+       timeline_ended = False  # 前回のスクロールで次ページの通信が発生しなかった（タイムラインの末尾）
+
+       while True:
+           # 前回のステップ以降に表示された投稿のみを取得
+           started = time.perf_counter()
+           new_tweets = harvester.step()
+           elapsed = time.perf_counter() - started
+           self.metrics.record("extract", elapsed, query)
+           self.metrics.count("tweets_collected", len(new_tweets))
+           logger.debug("Harvested {} new tweets in {:.1f} ms", len(new_tweets), elapsed * 1000)
+
+           for tweet in new_tweets:
+               status_id = int(tweet["status_id"])
+
+               # JSONから収集した場合は投稿者のフォロワー数・Bioも記録（プロフィール取得で明らかな対象外を省く）
+               author = capture.users.get(tweet["username"].lower()) if capture else None
+
+               # 統合した検索の場合は本文・ユーザー名がキーワード条件に一致する元の行へ振り分ける
+               matched = match_members(f"{tweet['tweet_content']} {tweet['username']}", members)
+               if not matched:
+                   self.metrics.count("tweets_unmatched")
+                   sampler.log("unmatched tweet", "DEBUG", "No keyword row matches tweet {}", tweet["tweet_url"])
+
+               # 同じクエリの行（演算子の表記違いなど）は1行だけ作り、それぞれのファイルに書き込む
+               for member in {member["query"]: member for member in matched}.values():
+                   if seen_until.get(member["query"]) is not None and status_id <= seen_until[member["query"]]:
+                       self.metrics.count("tweets_already_seen")
                        continue
 
-                   username = username_el.get_attribute("href").split("/")[-1]
-                   profile_url = f"https://twitter.com/{username}"
-
-                   # ツイートURL取得
-                   tweet_url_el = tweet.query_selector('a[href*="/status/"]')
-                   tweet_url = f"https://twitter.com{tweet_url_el.get_attribute('href')}" if tweet_url_el else ""
-
-                   # ツイート内容取得
-                   tweet_text_el = tweet.query_selector('div[data-testid="tweetText"]')
-                   tweet_text = tweet_text_el.inner_text() if tweet_text_el else ""
-
-                   # タイムスタンプ取得
-                   time_el = tweet.query_selector("time")
-                   timestamp = time_el.get_attribute("datetime") if time_el else ""
+                   row = {
+                       "username": tweet["username"],
+                       "url": tweet["url"],
+                       "bio": author["bio"] if author else "",  # 未取得の場合はfetch_profiles.pyで取得
+                       "followers": author["followers"] if author else 0,  # 0は未取得（fetch_profiles.pyで取得）
+                       "tweet_url": tweet["tweet_url"],
+                       "tweet_content": tweet["tweet_content"],
+                       "tweeted_at": tweet["tweeted_at"],
+                       "query": member["query"]
+                   }
 
                    # 結果に追加
-                   self.results.append({
-                       "username": username,
-                       "url": profile_url,
-                       "bio": "",  # fetch_profiles.pyで後から取得
-                       "followers": 0,  # fetch_profiles.pyで後から取得
-                       "tweet_url": tweet_url,
-                       "tweet_content": tweet_text,
-                       "tweeted_at": timestamp,
-                       "query": query
-                   })
-
-                   tweet_count += 1
-                   if tweet_count % 10 == 0:
-                       logger.info(f"Collected {tweet_count} tweets")
-
-                   if tweet_count >= max_tweets:
-                       break
+                   self.results.append(row)
+                   for writer in writers.get(member["query"], []):
+                       writer.write(row)
 
-               except Exception as e:
-                   logger.warning(f"Error parsing tweet: {str(e)}")
+           if new_tweets:
+               sampler.log("collected tweets", "INFO", "Collected {} tweets", harvester.collected)
+
+           if harvester.done:
+               break
 
-           # スクロール
-           current_height = page.evaluate("document.body.scrollHeight")
-           if current_height == previous_height:
-               break  # スクロールが止まったら終了
+           if timeline_ended and not new_tweets:
+               logger.info(f"Reached the end of the search timeline for query: {query}")
+               break
 
-           page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-           page.wait_for_timeout(3000)  # スクロール後の読み込み待機
-           previous_height = current_height
+           # スクロールして次ページの通信完了と描画を待つ（通信がなければ描画済みの投稿を読んで終了）
+           timeline_ended = not self.pacer.scroll_and_wait(page)
 
-   def save_results(self, filename, query):
-       """収集結果をCSVファイルに保存"""
-       # このクエリに関連する結果をフィルタリング
-       query_results = [r for r in self.results if r["query"] == query]
+       sampler.flush()
+       logger.info(f"Finished collecting {harvester.collected} unique tweets for query: {query}")
 
-       if not query_results:
-           logger.warning(f"No results found for query: {query}")
+   def finish_query(self, query_info, rows):
+       """元の行の結果をDataFrameにまとめる（Parquet指定時はデータセットへ保存）"""
+       if not rows:
+           logger.warning(f"No results found for query: {query_info['query']}")
            return
 
-       # 結果をDataFrameに変換
-       df = pd.DataFrame(query_results)
+       df = pd.DataFrame(rows, columns=RESULT_COLUMNS)
+       self.keep_frame(df)
 
-       # CSVに保存
-       output_path = self.result_dir / filename
-       df.to_csv(output_path, index=False, encoding="utf-8")
-       logger.info(f"Saved {len(query_results)} results to {output_path}")
+       if self.save_csv and self.store:
+           with self.metrics.timer("io", "parquet"):
+               self.store.write_query(df, self.current_date, query_info["query"], query_info["operator"],
+                                      query_info["keywords"], append=self.incremental)
 
 
 if __name__ == "__main__":
+   parser = argparse.ArgumentParser(description="Twitterの検索結果から投稿を収集")
+   parser.add_argument("--resume", action="store_true", help="中断した当日の実行を再開し、完了済みのクエリを飛ばす")
+   parser.add_argument("--result-format", choices=["csv", "parquet"], default="csv", help="検索結果の保存形式")
+   parser.add_argument("--no-merge-queries", action="store_true", help="キーワード行を統合せず1行ずつ検索する")
+   parser.add_argument("--max-query-length", type=int, default=500, help="統合後の検索クエリの最大文字数")
+   parser.add_argument("--incremental", action="store_true", help="前回の実行以降の新しい投稿のみ収集して追記する")
+   parser.add_argument("--capture-network", action="store_true", help="APIレスポンスのJSONから収集する")
+   args = parser.parse_args()
+
    logger.info("Starting Twitter Search Scraper")
-   scraper = TwitterSearchScraper()
+   scraper = TwitterSearchScraper(resume=args.resume, result_format=args.result_format,
+                                  merge_queries=not args.no_merge_queries, max_query_length=args.max_query_length,
+                                  incremental=args.incremental, capture_network=args.capture_network, collect="none")
    scraper.start()
+   scraper.metrics.report("Search metrics")
    logger.info("Twitter Search Scraper finished")
\ No newline at end of file
@@ -0,0 +1,358 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import sys
+import time
+import queue
+import argparse
+import multiprocessing
+import pandas as pd
+from pathlib import Path
+from datetime import datetime
+from playwright.sync_api import sync_playwright
+from rich.console import Console
+from rich.table import Table
+
+# 相対インポート対応
+sys.path.append(str(Path(__file__).parent.parent))
+from scrape.search_tweets import TwitterSearchScraper, RESULT_COLUMNS
+from utils.keyword_parser import parse_keywords, plan_queries, log_query_plan
+from utils.logger_setup import setup_logger
+from utils.filename_generator import generate_filename
+from utils.session_store import SessionStore
+from utils.context_factory import create_context
+from utils.timeline_harvester import parse_status_id
+from utils.rate_limiter import SharedTokenBucket
+from utils.pacing import Pacer
+from utils.checkpoint import read_journal
+from utils.result_writer import StreamingCsvWriter
+from utils.result_store import ParquetResultStore
+from utils.search_state import SearchWatermarks
+from utils.metrics import get_metrics, configure_metrics
+
+# ロガー設定
+logger = setup_logger(__file__)
+
+
+def search_worker(worker_id, plans, work_queue, report_queue, limiter, options):
+    """
+    ワーカープロセス: 共有キューから検索を取り出し、自分のブラウザで実行してジャーナルへ記録する
+
+    Args:
+        worker_id: ワーカー番号
+        plans: すべての検索（キューには添字が入る）
+        work_queue: 検索の添字のキュー（Noneで終了）
+        report_queue: 処理件数・所要時間を親プロセスへ返すキュー
+        limiter: 全ワーカー共通のトークンバケット
+        options: TwitterSearchScraper の設定
+    """
+    current_date = datetime.now().strftime("%Y%m%d")
+    base_dir = Path(__file__).parent.parent
+    metrics = configure_metrics(base_dir / "log" / current_date / f"metrics_{current_date}_w{worker_id}.jsonl")
+
+    scraper = TwitterSearchScraper(
+        save_csv=False, capture_network=options["capture_network"], base_url=options["base_url"],
+        pacer=Pacer(limiter=limiter), resume=True, max_tweets=options["max_tweets"],
+        checkpoint_dir=options["checkpoint_dir"], incremental=options["incremental"], shard=worker_id,
+        collect="none",  # 結果はジャーナルから親プロセスが統合する
+    )
+
+    processed = []
+
+    def take_plans():
+        # 空いたワーカーが次の検索を取り出す（検索ごとの所要時間の差があっても偏らない）
+        for index in iter(work_queue.get, None):
+            processed.append(index)
+            yield plans[index]
+
+    report = {"worker": worker_id, "queries": 0, "tweets": 0, "seconds": 0.0, "idle_share": 0.0, "error": None}
+    started = time.perf_counter()
+    try:
+        with sync_playwright() as p:
+            browser = p.chromium.launch(headless=options["headless"])
+            session = SessionStore(base_url=options["base_url"])
+            context = create_context(browser, session, profile="scrape-minimal")
+            page = context.new_page()
+
+            try:
+                if not session.is_logged_in(page):
+                    raise RuntimeError("Saved session is not logged in; run utils/session_store.py first")
+
+                scraper.search_keywords(page, plans=take_plans())
+                report["tweets"] = scraper.row_count
+            finally:
+                browser.close()
+    except Exception as e:
+        logger.exception(f"Search worker {worker_id} failed: {str(e)}")
+        report["error"] = str(e)
+
+    report["queries"] = sum(len(plans[index]["members"]) for index in processed)
+    report["seconds"] = round(time.perf_counter() - started, 3)
+    report["idle_share"] = metrics.summary()["idle_share"]
+    metrics.close()
+    report_queue.put(report)
+
+
+class ShardedSearch:
+    """
+    検索を複数のワーカープロセスに分散し、各ワーカーのジャーナルを統合して結果を保存する
+    """
+
+    def __init__(self, workers=2, requests_per_minute=60, save_csv=True, capture_network=False,
+                 base_url="https://twitter.com", resume=False, result_format="csv", keywords_path=None,
+                 max_tweets=100, checkpoint_dir=None, merge_queries=True, max_query_length=500, incremental=False,
+                 headless=False):
+        """
+        初期化処理
+
+        Args:
+            workers: ワーカープロセス数（それぞれが自分のブラウザ・ペース配分で検索する）
+            requests_per_minute: 全ワーカー合計の1分あたりの最大アクセス数（検索・スクロール）
+            save_csv: 統合した結果を保存するか
+            capture_network: 検索タイムラインのJSONから収集するか
+            base_url: TwitterのベースURL
+            resume: 中断した当日の実行を再開し、いずれかのワーカーで完了済みのクエリを飛ばすか
+            result_format: 検索結果の保存形式（"csv" / "parquet"）
+            keywords_path: 検索キーワードのCSV（デフォルトは config/keywords.csv）
+            max_tweets: クエリごとの最大収集数
+            checkpoint_dir: ワーカーのジャーナルの保存先（デフォルトは checkpoint/）
+            merge_queries: 重複する行・ORでまとめられるキーワード行を1回の検索に統合するか
+            max_query_length: 統合後の検索クエリの最大文字数
+            incremental: 前回の実行以降の新しい投稿のみ収集して追記するか
+            headless: ワーカーのブラウザをヘッドレスで起動するか
+        """
+        base_dir = Path(__file__).parent.parent
+        self.workers = max(1, workers)
+        self.requests_per_minute = requests_per_minute
+        self.save_csv = save_csv
+        self.capture_network = capture_network
+        self.base_url = base_url.rstrip("/")
+        self.resume = resume
+        self.store = ParquetResultStore() if result_format == "parquet" else None
+        self.keywords_path = Path(keywords_path) if keywords_path else base_dir / "config" / "keywords.csv"
+        self.max_tweets = max_tweets
+        self.checkpoint_dir = Path(checkpoint_dir) if checkpoint_dir else base_dir / "checkpoint"
+        self.merge_queries = merge_queries
+        self.max_query_length = max_query_length
+        self.incremental = incremental
+        self.headless = headless
+        self.metrics = get_metrics()
+        self.current_date = datetime.now().strftime("%Y%m%d")
+        self.result_dir = base_dir / "result"
+        self.result_dir.mkdir(exist_ok=True)
+
+        logger.info(f"ShardedSearch initialized with {self.workers} workers, "
+                    f"{requests_per_minute} requests/min in total")
+
+    def journal_paths(self):
+        """当日のワーカーのジャーナル（ワーカー番号順）"""
+        return sorted(self.checkpoint_dir.glob(f"search_{self.current_date}_w*.jsonl"))
+
+    def load_completed(self):
+        """
+        ワーカーのジャーナルから完了済みのクエリの結果を読み込む
+
+        Returns:
+            Dict[str, List[Dict]]: クエリ -> 収集した行（複数のジャーナルにある場合はツイートURLで重複排除して結合）
+        """
+        completed = {}
+        for path in self.journal_paths():
+            for record in read_journal(path):
+                if record.get("type") != "query":
+                    continue
+                rows = completed.setdefault(record["query"], {})
+                for row in record["rows"]:
+                    rows.setdefault(row["tweet_url"], row)
+
+        return {query: list(rows.values()) for query, rows in completed.items()}
+
+    def run(self):
+        """
+        検索を分散して実行し、統合した結果を返す
+
+        Returns:
+            DataFrame: キーワードリストの行順に並べた検索結果
+        """
+        if not SessionStore(base_url=self.base_url).has_saved_session():
+            logger.error("No saved session; run utils/session_store.py to log in before a sharded search")
+            return pd.DataFrame(columns=RESULT_COLUMNS)
+
+        logger.info(f"Loading keywords from {self.keywords_path}")
+        search_queries = parse_keywords(pd.read_csv(self.keywords_path))
+
+        if self.resume:
+            completed = self.load_completed()
+        else:
+            self.checkpoint_dir.mkdir(parents=True, exist_ok=True)
+            for path in self.journal_paths():
+                path.unlink()
+            completed = {}
+
+        pending = [q for q in search_queries if q["query"] not in completed]
+        if len(pending) < len(search_queries):
+            logger.info(f"Skipping {len(search_queries) - len(pending)} queries completed by earlier workers")
+
+        if self.merge_queries:
+            plans = plan_queries(pending, self.max_query_length)
+            log_query_plan(plans, pending)
+        else:
+            plans = [{**query_info, "members": [query_info]} for query_info in pending]
+
+        if plans:
+            self.run_workers(plans)
+
+        return self.merge(search_queries)
+
+    def run_workers(self, plans):
+        """ワーカープロセスを起動し、すべての検索が終わるまで待つ"""
+        # Playwrightはfork後のプロセスで使えないため、どのOSでもspawnで起動する
+        context = multiprocessing.get_context("spawn")
+        limiter = SharedTokenBucket(self.requests_per_minute, context=context)
+        work_queue = context.Queue()
+        report_queue = context.Queue()
+
+        for index in range(len(plans)):
+            work_queue.put(index)
+        workers = min(self.workers, len(plans))
+        for _ in range(workers):
+            work_queue.put(None)
+
+        options = {
+            "capture_network": self.capture_network,
+            "base_url": self.base_url,
+            "max_tweets": self.max_tweets,
+            "checkpoint_dir": str(self.checkpoint_dir),
+            "incremental": self.incremental,
+            "headless": self.headless,
+        }
+
+        processes = []
+        for worker_id in range(workers):
+            process = context.Process(
+                target=search_worker, name=f"search-worker-{worker_id}",
+                args=(worker_id, plans, work_queue, report_queue, limiter, options),
+            )
+            process.start()
+            processes.append(process)
+
+        for process in processes:
+            process.join()
+            if process.exitcode:
+                logger.error(f"{process.name} exited with code {process.exitcode}; rerun with --resume to retry "
+                             f"its unfinished queries")
+
+        reports = []
+        while True:
+            try:
+                reports.append(report_queue.get(timeout=1))
+            except queue.Empty:
+                break
+
+        self.report_workers(reports)
+
+    def report_workers(self, reports):
+        """ワーカーごとの処理件数と処理速度を表示する"""
+        table = Table(title="Search workers")
+        table.add_column("Worker", justify="right")
+        table.add_column("Queries", justify="right")
+        table.add_column("Tweets", justify="right")
+        table.add_column("Time (s)", justify="right")
+        table.add_column("Queries/min", justify="right")
+        table.add_column("Tweets/min", justify="right")
+        table.add_column("Idle", justify="right")
+
+        for report in sorted(reports, key=lambda r: r["worker"]):
+            minutes = report["seconds"] / 60 if report["seconds"] > 0 else 0
+            table.add_row(
+                str(report["worker"]), str(report["queries"]), str(report["tweets"]), f"{report['seconds']:.1f}",
+                f"{report['queries'] / minutes:.2f}" if minutes else "-",
+                f"{report['tweets'] / minutes:.1f}" if minutes else "-",
+                f"{report['idle_share']:.1%}",
+            )
+            if report["error"]:
+                logger.error(f"Worker {report['worker']} stopped early: {report['error']}; rerun with --resume to "
+                             f"retry its unfinished queries")
+
+        Console().print(table)
+
+    def merge(self, search_queries):
+        """
+        ワーカーのジャーナルを統合し、キーワードリストの行ごとに結果を保存する
+
+        結果はワーカーの処理順に関係なく、キーワードリストの行順・各行は新しい投稿順（ステータスIDの降順）に並ぶ
+
+        Args:
+            search_queries: parse_keywords の戻り値
+
+        Returns:
+            DataFrame: 統合した検索結果
+        """
+        with self.metrics.timer("io", "merge"):
+            completed = self.load_completed()
+
+        watermarks = SearchWatermarks() if self.incremental else None
+        frames = []
+        merged = {}  # クエリ -> 統合済みの結果（同じクエリの行は結果を1回分のみ返す）
+        written = set()  # 書き込み済みの結果ファイル（同じファイルを2回書き込まない）
+        for query_info in search_queries:
+            query = query_info["query"]
+            rows = completed.get(query)
+            if not rows:
+                continue
+
+            if query in merged:
+                df = merged[query]
+            else:
+                rows.sort(key=lambda row: int(parse_status_id(row["tweet_url"]) or 0), reverse=True)
+                df = merged[query] = pd.DataFrame(rows, columns=RESULT_COLUMNS)
+                frames.append(df)
+
+            filename = generate_filename(query_info["keywords"], query_info["operator"], self.current_date)
+            if self.save_csv and filename not in written:
+                written.add(filename)
+                with self.metrics.timer("io", query):
+                    if self.store:
+                        self.store.write_query(df, self.current_date, query, query_info["operator"],
+                                               query_info["keywords"], append=self.incremental)
+                    else:
+                        with StreamingCsvWriter(self.result_dir / filename, RESULT_COLUMNS,
+                                                append=self.incremental, unique_key="tweet_url") as writer:
+                            for row in df.to_dict("records"):
+                                writer.write(row)
+
+            if watermarks:
+                watermarks.update(query, rows)
+
+        if watermarks:
+            watermarks.save()
+
+        logger.info(f"Merged {sum(len(df) for df in frames)} tweets for {len(frames)} queries from "
+                    f"{len(self.journal_paths())} worker journals")
+
+        if not frames:
+            return pd.DataFrame(columns=RESULT_COLUMNS)
+        return pd.concat(frames, ignore_index=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="検索を複数のワーカープロセスに分散して投稿を収集")
+    parser.add_argument("--workers", type=int, default=2, help="ワーカープロセス数")
+    parser.add_argument("--requests-per-minute", type=int, default=60, help="全ワーカー合計の1分あたりの最大アクセス数")
+    parser.add_argument("--headless", action="store_true", help="ワーカーのブラウザをヘッドレスで起動する")
+    parser.add_argument("--capture-network", action="store_true", help="APIレスポンスのJSONから収集する")
+    parser.add_argument("--resume", action="store_true", help="中断した当日の実行を再開し、完了済みのクエリを飛ばす")
+    parser.add_argument("--result-format", choices=["csv", "parquet"], default="csv", help="検索結果の保存形式")
+    parser.add_argument("--no-merge-queries", action="store_true", help="キーワード行を統合せず1行ずつ検索する")
+    parser.add_argument("--max-query-length", type=int, default=500, help="統合後の検索クエリの最大文字数")
+    parser.add_argument("--incremental", action="store_true", help="前回の実行以降の新しい投稿のみ収集して追記する")
+    args = parser.parse_args()
+
+    logger.info("Starting sharded Twitter search")
+    search = ShardedSearch(
+        workers=args.workers, requests_per_minute=args.requests_per_minute, capture_network=args.capture_network,
+        resume=args.resume, result_format=args.result_format, merge_queries=not args.no_merge_queries,
+        max_query_length=args.max_query_length, incremental=args.incremental, headless=args.headless,
+    )
+    search.run()
+    search.metrics.report("Sharded search metrics")
+    logger.info("Sharded Twitter search finished")
@@ -0,0 +1,8 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import sys
+from pathlib import Path
+
+# 相対インポート対応
+sys.path.append(str(Path(__file__).parent.parent))
@@ -0,0 +1,54 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import pandas as pd
+
+from utils.candidate_priority import score_candidates
+
+NOW = "2025-05-12T12:00:00Z"
+
+
+def test_matching_more_queries_ranks_first():
+    df = pd.DataFrame({
+        "username": ["a", "a", "b", "b", "c"],
+        "url": ["u/a", "u/a", "u/b", "u/b", "u/c"],
+        "query": ["東京", "東京", "東京", "大阪", "大阪"],
+        "tweeted_at": [NOW] * 5,
+    })
+    ranked = score_candidates(df, now=NOW)
+
+    assert list(ranked["username"]) == ["b", "a", "c"]
+    assert list(ranked["queries"]) == [2, 1, 1]
+    assert list(ranked["tweets"]) == [2, 2, 1]
+
+
+def test_recency_breaks_ties_between_equal_activity():
+    df = pd.DataFrame({
+        "username": ["old", "new"],
+        "url": ["u/old", "u/new"],
+        "query": ["東京", "東京"],
+        "tweeted_at": ["2025-04-01T00:00:00Z", "2025-05-12T11:00:00Z"],
+    })
+
+    assert list(score_candidates(df, now=NOW)["username"]) == ["new", "old"]
+
+
+def test_mixed_timestamp_formats_are_all_parsed():
+    # 旧形式（秒まで）と取得時の形式（ミリ秒・Z付き）が混在しても、どちらも新しさに反映される
+    df = pd.DataFrame({
+        "username": ["legacy", "captured"],
+        "url": ["u/legacy", "u/captured"],
+        "query": ["東京", "東京"],
+        "tweeted_at": ["2025-05-11T12:34:56", "2025-05-11T12:34:56.000Z"],
+    })
+    ranked = score_candidates(df, now=NOW)
+
+    assert ranked["latest"].notna().all()
+    assert ranked["score"].nunique() == 1
+
+
+def test_ties_keep_first_appearance_and_missing_columns_are_allowed():
+    df = pd.DataFrame({"username": ["x", "y", "z"], "url": ["u/x", "u/y", "u/z"]})
+    ranked = score_candidates(df, now=NOW)
+
+    assert list(ranked["username"]) == ["x", "y", "z"]
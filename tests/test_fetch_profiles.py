@@ -0,0 +1,20 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import pandas as pd
+
+from scrape.fetch_profiles import TwitterProfileScraper
+
+
+def test_numeric_usernames_are_collected_as_strings(tmp_path):
+    scraper = TwitterProfileScraper(save_csv=False, use_cache=False)
+    scraper.result_dir = tmp_path
+    pd.DataFrame({"username": ["0123", "tokyofoodie"], "url": ["https://x.com/0123", "https://x.com/tokyofoodie"],
+                  "query": ["東京 ラーメン"] * 2}).to_csv(tmp_path / "東京+ラーメン_20250512.csv", index=False)
+
+    assert scraper.collect_candidates(scraper.load_sources()) == [
+        ("0123", "https://x.com/0123"), ("tokyofoodie", "https://x.com/tokyofoodie")]
+
+    # 検索ステージから渡された結果の数値のユーザー名も文字列になる
+    results_df = pd.DataFrame({"username": [12345], "url": ["https://x.com/12345"]})
+    assert scraper.collect_candidates(scraper.load_sources(results_df)) == [("12345", "https://x.com/12345")]
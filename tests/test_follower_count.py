@@ -0,0 +1,42 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import pandas as pd
+import pytest
+
+from utils.follower_count import parse_follower_count, parse_follower_counts
+
+CASES = [
+    ("1,234", 1234),
+    ("15.3K", 15300),
+    ("2M", 2_000_000),
+    ("1.2万", 12000),
+    ("３億", 300_000_000),
+    ("１，５００", 1500),
+    ("8千", 8000),
+    ("987", 987),
+    ("不明", 0),
+]
+
+
+@pytest.mark.parametrize("text, expected", CASES)
+def test_parse_single_count(text, expected):
+    assert parse_follower_count(text) == expected
+
+
+def test_integers_pass_through():
+    assert parse_follower_count(42) == 42
+
+
+def test_vectorized_parse_matches_single_parse():
+    texts = [text for text, _ in CASES]
+    parsed = parse_follower_counts(pd.Series(texts))
+
+    assert parsed.dtype == "int64"
+    assert parsed.tolist() == [parse_follower_count(text) for text in texts]
+
+
+def test_vectorized_parse_accepts_numbers_and_missing_values():
+    parsed = parse_follower_counts(pd.Series([5000, None, "1K"], dtype=object))
+
+    assert parsed.tolist() == [5000, 0, 1000]
@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import pandas as pd
+
+from utils.keyword_parser import parse_keywords, plan_queries, match_members
+
+
+def make_queries(rows):
+    """(キーワード1, キーワード2, 演算子) のリストから parse_keywords の戻り値を作成"""
+    df = pd.DataFrame([{"キーワード1": k1, "キーワード2": k2, "キーワード3": "", "演算子": op} for k1, k2, op in rows])
+    return parse_keywords(df)
+
+
+def test_plan_merges_or_rows_into_one_search():
+    queries = make_queries([("銀座", "ランチ", "OR"), ("六本木", "", "OR"), ("宮崎", "マンゴー", "AND")])
+    plans = plan_queries(queries)
+
+    assert len(plans) == 2
+    merged = next(plan for plan in plans if len(plan["members"]) == 2)
+    assert merged["operator"] == "OR"
+    assert merged["query"] == "銀座 OR ランチ OR 六本木"
+
+
+def test_plan_dedups_rows_that_differ_only_in_notation():
+    queries = make_queries([("ＡＢＣ", "xyz", "AND"), ("abc", "XYZ", "AND")])
+    plans = plan_queries(queries)
+
+    assert len(plans) == 1
+    assert len(plans[0]["members"]) == 2
+
+
+def test_plan_keeps_rows_with_the_same_query_and_different_files():
+    queries = make_queries([("銀座", "ランチ", "AND"), ("銀座", "ランチ", "")])
+    plans = plan_queries(queries)
+
+    assert len(plans) == 1
+    assert [member["operator"] for member in plans[0]["members"]] == ["AND", ""]
+
+
+def test_plan_searches_rows_writing_to_the_same_file_once():
+    queries = make_queries([("銀座", "ランチ", "AND"), ("銀座", "ランチ", "AND"), ("銀座", "ランチ", "XOR")])
+    plans = plan_queries(queries)
+
+    assert len(plans) == 1
+    assert len(plans[0]["members"]) == 1
+
+
+def test_plan_respects_max_query_length():
+    queries = make_queries([("a" * 10, "", "OR"), ("b" * 10, "", "OR")])
+
+    assert len(plan_queries(queries, max_query_length=15)) == 2
+    assert len(plan_queries(queries, max_query_length=50)) == 1
+
+
+def test_match_members_routes_to_matching_rows():
+    members = make_queries([("銀座", "", "OR"), ("大阪", "", "OR"), ("宮崎", "", "OR")])
+
+    matched = match_members("今日は銀座と大阪へ", members)
+    assert [member["query"] for member in matched] == ["銀座", "大阪"]
+
+
+def test_match_members_requires_all_keywords_for_and_rows():
+    members = make_queries([("宮崎", "マンゴー", "AND"), ("銀座", "", "OR")])
+
+    assert match_members("宮崎のマンゴー", members) == [members[0]]
+    assert match_members("宮崎の空港", members) == []
+
+
+def test_match_members_does_not_fan_out_unmatched_tweets():
+    members = make_queries([("銀座", "", "OR"), ("六本木", "", "OR"), ("宮崎", "", "OR"), ("大阪", "", "OR")])
+
+    # ハッシュタグ・表示名などで検索に一致し、本文からは判定できない投稿
+    assert match_members("今日のランチ", members) == []
+
+
+def test_match_members_keeps_rows_with_the_same_condition():
+    members = make_queries([("銀座", "ランチ", "OR"), ("ランチ", "銀座", "OR")])
+
+    assert match_members("今日のディナー", members) == members
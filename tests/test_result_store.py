@@ -0,0 +1,30 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import pytest
+
+from utils.filename_generator import generate_filename
+from utils.result_store import parse_result_filename
+
+
+@pytest.mark.parametrize("stem, expected", [
+    ("東京_ラーメン_20250512", ("20250512", "東京 ラーメン", "AND", ["東京", "ラーメン"])),
+    ("銀座_グルメor六本木_バー_20250512", ("20250512", "銀座 グルメ OR 六本木 バー", "OR", ["銀座 グルメ", "六本木 バー"])),
+    ("宮崎_パイナップルor大阪_ユニバ_20250512",
+     ("20250512", "宮崎 パイナップル OR 大阪 ユニバ", "OR", ["宮崎 パイナップル", "大阪 ユニバ"])),
+    ("東京", ("", "東京", "AND", ["東京"])),
+])
+def test_parse_legacy_filenames(stem, expected):
+    assert parse_result_filename(stem) == expected
+
+
+def test_keywords_containing_or_are_not_split():
+    # "York" の "or" はOR検索の区切りではない
+    assert parse_result_filename("New York+pizza_20250512") == ("20250512", "New York pizza", "AND", ["New York", "pizza"])
+    assert parse_result_filename("major+league_20250512")[2] == "AND"
+
+
+def test_round_trip_of_generated_or_filenames():
+    stem = generate_filename(["ニューヨーク", "pizza"], "OR", "20250512")[:-len(".csv")]
+
+    assert parse_result_filename(stem) == ("20250512", "ニューヨーク OR pizza", "OR", ["ニューヨーク", "pizza"])
@@ -0,0 +1,32 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import pandas as pd
+
+from utils.result_writer import StreamingCsvWriter
+
+
+def write_rows(path, urls, append):
+    with StreamingCsvWriter(path, ["tweet_url", "username"], append=append, unique_key="tweet_url") as writer:
+        for url in urls:
+            writer.write({"tweet_url": url, "username": "user"})
+    return writer.rows
+
+
+def test_append_skips_rows_already_in_the_file(tmp_path):
+    path = tmp_path / "result.csv"
+    assert write_rows(path, ["https://x.com/a/status/1", "https://x.com/a/status/2"], append=True) == 2
+
+    # 中断後の再実行で同じ投稿を再収集しても追記しない
+    assert write_rows(path, ["https://x.com/a/status/2", "https://x.com/a/status/3"], append=True) == 1
+
+    assert pd.read_csv(path)["tweet_url"].tolist() == [
+        "https://x.com/a/status/1", "https://x.com/a/status/2", "https://x.com/a/status/3"]
+
+
+def test_overwrite_ignores_existing_rows(tmp_path):
+    path = tmp_path / "result.csv"
+    write_rows(path, ["https://x.com/a/status/1"], append=False)
+
+    assert write_rows(path, ["https://x.com/a/status/1"], append=False) == 1
+    assert len(pd.read_csv(path)) == 1
@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import json
+from urllib.parse import quote
+from urllib.request import urlopen
+
+import pandas as pd
+import pytest
+
+from utils.stub_server import StubTwitterServer
+from utils.response_capture import ResponseCapture
+from utils.pacing import Pacer
+
+# 記録済みフィクスチャ（fixtures/graphql）の投稿者とフォロワー数
+FIXTURE_FOLLOWERS = {"ramen_master": 78921, "tokyofoodie": 25634, "ramen_beginner": 312, "osaka_gourmet": 22145}
+
+# テストでは最小間隔を設けない（通信と描画の待機のみ）
+NO_INTERVALS = {"scroll": 0.0, "query": 0.0, "profile": 0.0}
+
+
+@pytest.fixture(scope="module")
+def server():
+    with StubTwitterServer() as stub:
+        yield stub
+
+
+def fetch_graphql(server, operation, variables):
+    """スタブサーバーからGraphQLのレスポンスを取得（ブラウザを使わない）"""
+    url = f"{server.base_url}/i/api/graphql/stub/{operation}?variables={quote(json.dumps(variables))}"
+    with urlopen(url) as response:
+        return url, json.loads(response.read().decode("utf-8"))
+
+
+def test_search_timeline_fixtures_are_parsed_page_by_page(server):
+    capture = ResponseCapture(server.base_url)
+
+    for cursor in ("0", "1", "2"):
+        capture.add_payload(*fetch_graphql(server, "SearchTimeline", {"rawQuery": "ラーメン", "cursor": cursor}))
+
+    tweets = capture.drain_tweets()
+    assert capture.timeline_responses == 3
+    assert [tweet["username"] for tweet in tweets] == [
+        "ramen_master", "tokyofoodie", "ramen_beginner", "osaka_gourmet", "ramen_master",
+    ]
+    assert all(tweet["tweet_url"].startswith(f"{server.base_url}/") for tweet in tweets)
+    assert tweets[0]["tweeted_at"] == "2025-05-11T09:23:15.000Z"
+    assert {name: user["followers"] for name, user in capture.users.items()} == FIXTURE_FOLLOWERS
+
+
+def test_user_lookup_fixtures_are_parsed(server):
+    capture = ResponseCapture(server.base_url)
+
+    capture.add_payload(*fetch_graphql(server, "UserByScreenName", {"screen_name": "tokyofoodie"}))
+    capture.add_payload(*fetch_graphql(server, "UserByScreenName", {"screen_name": "nobody"}))
+
+    assert capture.user("TokyoFoodie")["followers"] == 25634
+    assert capture.user("nobody") is None
+
+
+@pytest.fixture(scope="module")
+def browser():
+    # ブラウザでの検証はPlaywrightのChromiumがインストールされている場合のみ
+    sync_api = pytest.importorskip("playwright.sync_api")
+    with sync_api.sync_playwright() as p:
+        try:
+            browser = p.chromium.launch(headless=True)
+        except sync_api.Error as e:
+            pytest.skip(f"Chromium is not available: {str(e).splitlines()[0]}")
+        yield browser
+        browser.close()
+
+
+@pytest.fixture
+def page(browser, server):
+    from utils.session_store import SessionStore
+    from utils.context_factory import create_context
+
+    context = create_context(browser, SessionStore(base_url=server.base_url))
+    yield context.new_page()
+    context.close()
+
+
+def test_search_path_collects_from_captured_json(page, server, tmp_path):
+    from scrape.search_tweets import TwitterSearchScraper
+
+    keywords_path = tmp_path / "keywords.csv"
+    pd.DataFrame([{"キーワード1": "ラーメン", "キーワード2": "", "キーワード3": "", "演算子": "AND"}]).to_csv(
+        keywords_path, index=False, encoding="utf-8")
+
+    scraper = TwitterSearchScraper(save_csv=False, capture_network=True, base_url=server.base_url,
+                                   pacer=Pacer(min_intervals=NO_INTERVALS), keywords_path=keywords_path,
+                                   checkpoint_dir=tmp_path / "checkpoint")
+    df = scraper.search_keywords(page)
+
+    assert len(df) == 5
+    assert set(df["query"]) == {"ラーメン"}
+    assert dict(zip(df["username"], df["followers"])) == FIXTURE_FOLLOWERS
+
+
+def test_profile_path_reads_captured_user_lookup(page, server, tmp_path):
+    from scrape.fetch_profiles import TwitterProfileScraper
+
+    results_df = pd.DataFrame({"username": list(FIXTURE_FOLLOWERS),
+                               "url": [f"{server.base_url}/{name}" for name in FIXTURE_FOLLOWERS]})
+    scraper = TwitterProfileScraper(min_followers=10000, save_csv=False, capture_network=True,
+                                    base_url=server.base_url, use_cache=False,
+                                    pacer=Pacer(min_intervals=NO_INTERVALS), checkpoint_dir=tmp_path / "checkpoint",
+                                    prefilter_margin=None)
+    accounts_df = scraper.fetch_profiles(page, results_df=results_df)
+
+    assert set(accounts_df["username"]) == {"ramen_master", "tokyofoodie", "osaka_gourmet"}
@@ -0,0 +1,48 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import numpy as np
+import pandas as pd
+
+# スコアの重み（一致したクエリ数を最も重視し、投稿数は対数、新しさは半減期で減衰させる）
+QUERY_WEIGHT = 2.0
+TWEET_WEIGHT = 1.0
+RECENCY_WEIGHT = 1.0
+
+
+def score_candidates(df, now=None, half_life_days=7.0):
+    """
+    検索結果の投稿者ごとに、プロフィール取得の優先度を検索結果の情報だけで計算する
+
+    Args:
+        df: username, url（任意で query, tweeted_at）列を含む検索結果（query がない場合は一致したクエリ数を使わない）
+        now: 新しさの基準時刻（デフォルトは現在時刻）
+        half_life_days: 新しさのスコアが半分になる経過日数
+
+    Returns:
+        DataFrame: username, url, queries, tweets, latest, score を優先度の高い順に（同点は出現順）
+    """
+    rows = df[["username", "url"]].copy()
+    rows["order"] = np.arange(len(rows))
+    rows["query"] = df["query"].values if "query" in df.columns else ""
+    tweeted_at = df["tweeted_at"] if "tweeted_at" in df.columns else pd.Series(pd.NaT, index=df.index)
+    # 旧形式（秒まで）と取得時の形式（ミリ秒・Z付き）が混在するため、最初の値から書式を推測させない
+    rows["tweeted_at"] = pd.to_datetime(tweeted_at, errors="coerce", utc=True, format="ISO8601")
+
+    grouped = rows.groupby("username", sort=False).agg(
+        url=("url", "first"),
+        order=("order", "min"),
+        queries=("query", "nunique"),
+        tweets=("username", "size"),
+        latest=("tweeted_at", "max"),
+    )
+
+    now = pd.Timestamp(now, tz="UTC") if now is not None else pd.Timestamp.now(tz="UTC")
+    age_days = (now - grouped["latest"]).dt.total_seconds() / 86400
+    recency = np.power(0.5, age_days.clip(lower=0) / half_life_days).fillna(0)
+
+    grouped["score"] = (QUERY_WEIGHT * grouped["queries"] + TWEET_WEIGHT * np.log1p(grouped["tweets"])
+                        + RECENCY_WEIGHT * recency)
+
+    ranked = grouped.sort_values(["score", "order"], ascending=[False, True], kind="mergesort")
+    return ranked.reset_index()[["username", "url", "queries", "tweets", "latest", "score"]]
@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import json
+from pathlib import Path
+from datetime import datetime
+from loguru import logger
+
+
+def read_journal(path):
+    """
+    ジャーナルを読み込む（書き込み途中で中断された末尾の行は無視）
+
+    Args:
+        path: ジャーナルのファイル
+
+    Returns:
+        List[Dict]: 記録済みのレコード
+    """
+    path = Path(path)
+    if not path.exists():
+        return []
+
+    records = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                logger.warning(f"Ignoring incomplete journal line in {path.name}")
+
+    return records
+
+
+class CheckpointJournal:
+    """
+    ステージの完了済み作業を1件ずつ追記するジャーナル（JSON Lines）
+
+    中断（例外・ブラウザ停止・Ctrl-C）しても書き込み済みのレコードは失われず、再開時に読み込んで完了済みの作業を飛ばせる
+    """
+
+    def __init__(self, stage, run_id=None, resume=False, journal_dir=None):
+        """
+        初期化処理
+
+        Args:
+            stage: ステージ名（"search" / "profiles"）
+            run_id: 実行ID（デフォルトは当日の日付。同じIDのジャーナルを再開する）
+            resume: Trueの場合は既存のジャーナルを読み込んで追記、Falseの場合は新しく始める
+            journal_dir: ジャーナルの保存先（デフォルトは checkpoint/）
+        """
+        base_dir = Path(__file__).parent.parent
+        run_id = run_id or datetime.now().strftime("%Y%m%d")
+        self.journal_dir = Path(journal_dir) if journal_dir else base_dir / "checkpoint"
+        self.journal_dir.mkdir(parents=True, exist_ok=True)
+        self.path = self.journal_dir / f"{stage}_{run_id}.jsonl"
+
+        self.records = []
+        if resume:
+            self.records = self.load()
+            logger.info(f"Resuming {stage} from {self.path} ({len(self.records)} completed records)")
+        elif self.path.exists():
+            self.path.unlink()
+
+        self.file = open(self.path, "a", encoding="utf-8")
+
+        # 書き込み途中の行が残っている場合は改行して、次のレコードと混ざらないようにする
+        if self.path.stat().st_size and not self.path.read_bytes().endswith(b"\n"):
+            self.file.write("\n")
+
+    def load(self):
+        """
+        ジャーナルを読み込む（書き込み途中で中断された末尾の行は無視）
+
+        Returns:
+            List[Dict]: 記録済みのレコード
+        """
+        return read_journal(self.path)
+
+    def append(self, record):
+        """レコードを追記し、即座にディスクへ書き出す（メモリには保持しない）"""
+        self.file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+    def close(self):
+        """ジャーナルを閉じる"""
+        self.file.close()
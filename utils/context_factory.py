@@ -0,0 +1,161 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import weakref
+from loguru import logger
+
+from utils.session_store import SessionStore
+
+# 名前付きのネットワークプロファイル
+#   blocked_urls: 読み込まないURL（CDPの Network.setBlockedURLs のワイルドカード形式）
+# Playwrightのルーティング（context.route）はブラウザのHTTPキャッシュを無効にし、ページを開くたびに
+# TwitterのJSバンドルを再取得させるため、遮断はブラウザ側のURLブロックで行う（キャッシュは有効のまま）
+NETWORK_PROFILES = {
+    "scrape-minimal": {
+        "blocked_urls": [
+            "*://pbs.twimg.com/*",  # プロフィール画像・添付画像・カード画像
+            "*://video.twimg.com/*",  # 動画・GIF
+            "*://abs-0.twimg.com/emoji/*",  # 絵文字の画像
+            "*.woff2*", "*.woff?*", "*.woff", "*.ttf", "*.otf",  # フォント
+            "*/jot/*",  # クライアントイベントの送信
+            "*google-analytics.com/*", "*googletagmanager.com/*", "*doubleclick.net/*",
+            "*ads-twitter.com/*", "*analytics.twitter.com/*",
+        ],
+    },
+    "full": {
+        "blocked_urls": [],
+    },
+}
+
+# コンテキストごとの通信量の集計
+_stats_by_context = weakref.WeakKeyDictionary()
+
+
+class NetworkStats:
+    """
+    コンテキスト内のリクエスト数・ブロック数・受信バイト数を集計する
+    """
+
+    def __init__(self):
+        """初期化処理"""
+        self.requests = 0
+        self.blocked = 0
+        self.bytes = 0
+        self.reported = (0, 0, 0)  # 前回出力時点の値
+
+    def on_request(self, request):
+        self.requests += 1
+
+    def on_loading_finished(self, params):
+        # 実際に受信したバイト数（圧縮・チャンク転送のままの長さ。content-length がない応答も含む）
+        self.bytes += int(params.get("encodedDataLength") or 0)
+
+    def on_loading_failed(self, params):
+        if params.get("blockedReason"):
+            self.blocked += 1
+        # 遮断・中断までに受信した分はないため加算しない
+
+    def report(self, label, level="INFO"):
+        """前回出力以降の通信量をログに出力"""
+        requests = self.requests - self.reported[0]
+        blocked = self.blocked - self.reported[1]
+        received = self.bytes - self.reported[2]
+        self.reported = (self.requests, self.blocked, self.bytes)
+
+        logger.log(level, f"Network | {label}: {requests} requests ({blocked} blocked), {received / 1024:.1f} KB received")
+
+    def report_total(self, label):
+        """コンテキスト作成以降の累計をログに出力"""
+        logger.info(f"Network | {label} total: {self.requests} requests ({self.blocked} blocked), "
+                    f"{self.bytes / 1024:.1f} KB received")
+
+
+def prepare_context(context, profile):
+    """通信量の集計を設定し、ページごとに適用するURLブロックの設定を返す"""
+    if profile not in NETWORK_PROFILES:
+        raise ValueError(f"Unknown network profile: {profile} (choose from {', '.join(NETWORK_PROFILES)})")
+
+    stats = NetworkStats()
+    context.on("request", stats.on_request)
+    _stats_by_context[context] = stats
+
+    logger.info(f"Using network profile: {profile}")
+    return NETWORK_PROFILES[profile]["blocked_urls"], stats
+
+
+def attach_page(context, page, blocked_urls, stats):
+    """
+    ページのCDPセッションでURLブロックと受信バイト数の集計を設定する
+
+    ページ作成のイベントで設定するため、ページを開いた直後の最初の遷移のごく初期のリクエストには間に合わない場合がある
+    （ページは繰り返し使用されるため、以降の遷移ではすべて適用される）
+    """
+    try:
+        session = context.new_cdp_session(page)
+        session.on("Network.loadingFinished", stats.on_loading_finished)
+        session.on("Network.loadingFailed", stats.on_loading_failed)
+        session.send("Network.enable")
+        if blocked_urls:
+            session.send("Network.setBlockedURLs", {"urls": blocked_urls})
+    except Exception as e:
+        # ページがすぐに閉じられた場合や、Chromium以外のブラウザ（CDPなし）の場合
+        logger.warning(f"Could not apply network profile to page: {str(e)}")
+
+
+async def attach_page_async(context, page, blocked_urls, stats):
+    """attach_page の非同期版"""
+    try:
+        session = await context.new_cdp_session(page)
+        session.on("Network.loadingFinished", stats.on_loading_finished)
+        session.on("Network.loadingFailed", stats.on_loading_failed)
+        await session.send("Network.enable")
+        if blocked_urls:
+            await session.send("Network.setBlockedURLs", {"urls": blocked_urls})
+    except Exception as e:
+        logger.warning(f"Could not apply network profile to page: {str(e)}")
+
+
+def create_context(browser, session=None, profile="scrape-minimal", **kwargs):
+    """
+    保存済みセッションとネットワークプロファイルを適用したコンテキストを作成する
+
+    Args:
+        browser: Playwrightのブラウザ
+        session: SessionStore（省略時はデフォルトの保存先を使用）
+        profile: ネットワークプロファイル名（"scrape-minimal" / "full"）
+        **kwargs: browser.new_context に渡す追加オプション
+
+    Returns:
+        BrowserContext: 作成したコンテキスト（以降に開くページにプロファイルが適用される）
+    """
+    session = session or SessionStore()
+    context = session.new_context(browser, **kwargs)
+
+    blocked_urls, stats = prepare_context(context, profile)
+    context.on("page", lambda page: attach_page(context, page, blocked_urls, stats))
+
+    return context
+
+
+async def create_context_async(browser, session=None, profile="scrape-minimal", **kwargs):
+    """create_context の非同期版"""
+    session = session or SessionStore()
+    context = await session.new_context(browser, **kwargs)
+
+    blocked_urls, stats = prepare_context(context, profile)
+    context.on("page", lambda page: attach_page_async(context, page, blocked_urls, stats))
+
+    return context
+
+
+def get_network_stats(context):
+    """
+    コンテキストの通信量の集計を取得する
+
+    Args:
+        context: create_context で作成したコンテキスト
+
+    Returns:
+        NetworkStats: 集計（create_context 以外で作成したコンテキストの場合はNone）
+    """
+    return _stats_by_context.get(context)
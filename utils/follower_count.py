@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import re
+import unicodedata
+import pandas as pd
+from loguru import logger
+
+# 単位 -> 倍率（英語表記と日本語表記）
+UNIT_MULTIPLIERS = {
+    "": 1,
+    "K": 1_000,
+    "M": 1_000_000,
+    "B": 1_000_000_000,
+    "千": 1_000,
+    "万": 10_000,
+    "萬": 10_000,
+    "億": 100_000_000,
+}
+
+# 数値部分と単位（例: "1.2万", "3億", "15.3K", "1,234"）
+COUNT_PATTERN = re.compile(r"(\d+(?:\.\d+)?)\s*([KMB千万萬億]?)", re.IGNORECASE)
+
+
+def parse_follower_count(count_text):
+    """
+    フォロワー数の表記を数値に変換する（1件用）
+
+    Args:
+        count_text: 表記（例: "1.5K", "1,234", "1.2万", "３億"）。数値の場合はそのまま返す
+
+    Returns:
+        int: フォロワー数（変換できない場合は0）
+    """
+    if isinstance(count_text, int):
+        return count_text
+
+    # 全角数字・全角カンマを半角に揃える
+    text = unicodedata.normalize("NFKC", str(count_text)).replace(",", "")
+    match = COUNT_PATTERN.search(text)
+    if not match:
+        logger.warning(f"Could not parse follower count: {count_text}")
+        return 0
+
+    return int(round(float(match.group(1)) * UNIT_MULTIPLIERS[match.group(2).upper()]))
+
+
+def parse_follower_counts(counts):
+    """
+    フォロワー数の表記をまとめて数値に変換する（正規表現の抽出と倍率表による一括処理）
+
+    Args:
+        counts: 表記または数値のSeries
+
+    Returns:
+        Series: int64のフォロワー数（変換できない値は0）
+    """
+    text = counts.astype(str).str.normalize("NFKC").str.replace(",", "", regex=False)
+    extracted = text.str.extract(COUNT_PATTERN)
+
+    numbers = pd.to_numeric(extracted[0], errors="coerce")
+    multipliers = extracted[1].fillna("").str.upper().map(UNIT_MULTIPLIERS)
+    parsed = numbers * multipliers
+
+    failed = parsed.isna() & counts.notna()
+    if failed.any():
+        logger.warning(f"Could not parse {int(failed.sum())} follower counts: {counts[failed].head(5).tolist()}")
+
+    return parsed.round().fillna(0).astype("int64")
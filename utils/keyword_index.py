@@ -0,0 +1,156 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import sys
+import json
+import pandas as pd
+from pathlib import Path
+from loguru import logger
+
+# 相対インポート対応
+sys.path.append(str(Path(__file__).parent.parent))
+from utils.result_store import ParquetResultStore, parse_result_filename
+
+# 索引の作り方を変えたら上げる（古いキャッシュを結果ファイルが変わっていなくても作り直す）
+INDEX_VERSION = 2
+
+
+def keywords_from_query(query):
+    """
+    検索クエリをDMに差し込むキーワードに分解する（OR は個別、AND は "A AND B"）
+
+    Args:
+        query: 検索クエリ（例: "東京 ラーメン", "銀座 グルメ OR 六本木 バー"）
+
+    Returns:
+        List[str]: キーワードのリスト
+    """
+    if " OR " in query:
+        return [k.strip() for k in query.split(" OR ") if k.strip()]
+    return [" AND ".join(query.split())]
+
+
+def build_keyword_index(results_df):
+    """
+    検索結果の query 列から、ユーザー名 → キーワード（一致した投稿数の多い順）の索引を作成する
+
+    Args:
+        results_df: username, query 列を含む検索結果
+
+    Returns:
+        Dict[str, List[str]]: ユーザー名をキーとするキーワードのリスト（同数の場合は出現順）
+    """
+    if results_df is None or results_df.empty or not {"username", "query"} <= set(results_df.columns):
+        return {}
+
+    df = results_df[["username", "query"]].dropna()
+    if df.empty:
+        return {}
+
+    # ユーザー・クエリごとの投稿数を数えてからキーワードに展開（クエリの分解はユニークなクエリごとに1回）
+    counts = df.groupby(["username", "query"], sort=False).size().rename("matches").reset_index()
+    keywords = {query: keywords_from_query(str(query)) for query in counts["query"].unique()}
+    counts["keyword"] = counts["query"].map(keywords)
+    counts = counts.explode("keyword").dropna(subset=["keyword"])
+    counts["order"] = range(len(counts))
+
+    ranked = (
+        counts.groupby(["username", "keyword"], sort=False)
+        .agg(matches=("matches", "sum"), order=("order", "min"))
+        .reset_index()
+        .sort_values(["matches", "order"], ascending=[False, True], kind="stable")
+    )
+
+    return ranked.groupby("username", sort=False)["keyword"].agg(list).to_dict()
+
+
+class KeywordIndex:
+    """
+    result/ の検索結果から作成したキーワード索引をディスクにキャッシュする（結果ファイルが変わった場合のみ再作成）
+    """
+
+    def __init__(self, result_format="csv", since=None, result_dir=None, cache_file=None):
+        """
+        初期化処理
+
+        Args:
+            result_format: 検索結果の形式（"csv" / "parquet"）
+            since: Parquet形式の場合、この日付（YYYYMMDD）以降の検索結果のみ使用する
+            result_dir: 検索結果のディレクトリ（デフォルトは result/）
+            cache_file: 索引のキャッシュファイル（デフォルトは cache/keyword_index.json）
+        """
+        base_dir = Path(__file__).parent.parent
+        self.result_format = result_format
+        self.since = since
+        self.result_dir = Path(result_dir) if result_dir else base_dir / "result"
+        self.cache_file = Path(cache_file) if cache_file else base_dir / "cache" / "keyword_index.json"
+
+    def source_files(self):
+        """索引の元になるファイル"""
+        if self.result_format == "parquet":
+            return sorted((self.result_dir / "dataset").glob("date=*/query_key=*/*.parquet"))
+        return sorted(self.result_dir.glob("*.csv"))
+
+    def signature(self):
+        """元ファイルの名前・サイズ・更新時刻から作るキャッシュの検証用の値"""
+        files = [[str(p.relative_to(self.result_dir)), p.stat().st_size, p.stat().st_mtime_ns]
+                 for p in self.source_files()]
+        return {"version": INDEX_VERSION, "format": self.result_format, "since": self.since, "files": files}
+
+    def load(self):
+        """
+        キャッシュが有効ならそれを返し、無効なら作り直して保存する
+
+        Returns:
+            Dict[str, List[str]]: ユーザー名をキーとするキーワードのリスト
+        """
+        signature = self.signature()
+
+        if self.cache_file.exists():
+            try:
+                with open(self.cache_file, "r", encoding="utf-8") as f:
+                    cached = json.load(f)
+                if cached.get("signature") == signature:
+                    logger.info(f"Loaded keyword index for {len(cached['index'])} users from {self.cache_file}")
+                    return cached["index"]
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning(f"Ignoring unreadable keyword index cache: {str(e)}")
+
+        index = build_keyword_index(self.read_results())
+
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.cache_file, "w", encoding="utf-8") as f:
+            json.dump({"signature": signature, "index": index}, f, ensure_ascii=False)
+        logger.info(f"Built keyword index for {len(index)} users from {len(signature['files'])} result files")
+
+        return index
+
+    def read_results(self):
+        """
+        元ファイルから username, query 列のみを読み込む
+
+        Returns:
+            DataFrame: username, query 列の検索結果
+        """
+        if self.result_format == "parquet":
+            return ParquetResultStore(self.result_dir / "dataset").read(columns=["username", "query"],
+                                                                        start_date=self.since)
+
+        frames = []
+        for file_path in self.source_files():
+            try:
+                df = pd.read_csv(file_path, usecols=lambda c: c in ("username", "query"), dtype=str)
+                if "username" not in df.columns:
+                    continue
+
+                # query 列がない旧形式のCSVはファイル名からクエリを復元
+                if "query" not in df.columns:
+                    df["query"] = parse_result_filename(file_path.stem)[1]
+
+                frames.append(df[["username", "query"]])
+            except Exception as e:
+                logger.warning(f"Error processing file {file_path.name}: {str(e)}")
+
+        if not frames:
+            return pd.DataFrame(columns=["username", "query"])
+        return pd.concat(frames, ignore_index=True)
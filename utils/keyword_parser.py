@@ -1,9 +1,18 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
+import re
+import sys
+import unicodedata
 import pandas as pd
+from pathlib import Path
+from loguru import logger
 from typing import List, Dict, Any
 
+# 相対インポート対応
+sys.path.append(str(Path(__file__).parent.parent))
+from utils.filename_generator import generate_filename
+
 def parse_keywords(keywords_df):
     """
     キーワードCSVファイルを解析して検索クエリリストを返す
@@ -86,4 +95,155 @@ def parse_keywords(keywords_df):
             "keywords": keywords
         })
 
-    return search_queries
\ No newline at end of file
+    return search_queries
+
+
+def normalize_keyword(keyword):
+    """
+    キーワードの表記を揃える（全角英数字・記号を半角に、連続する空白を1つに）
+
+    Args:
+        keyword: キーワード
+
+    Returns:
+        str: 正規化したキーワード
+    """
+    return re.sub(r"\s+", " ", unicodedata.normalize("NFKC", str(keyword))).strip()
+
+
+def result_filename(query_info):
+    """行の結果を保存するCSVのファイル名（同じファイルに書き込む行は1回だけ検索・保存する）"""
+    return generate_filename(query_info["keywords"], query_info["operator"])
+
+
+def is_mergeable(query_info):
+    """OR検索・キーワード1つの検索は他の行とORでまとめられる"""
+    return query_info["operator"] == "OR" or len(query_info["keywords"]) == 1
+
+
+def plan_queries(search_queries, max_query_length=500):
+    """
+    キーワード行を重複排除し、ORでまとめられる行を上限の長さまで1つの検索に統合する
+
+    Args:
+        search_queries: parse_keywords の戻り値
+        max_query_length: 統合後の検索クエリの最大文字数
+
+    Returns:
+        List[Dict]: 検索ごとの query, operator, keywords と、統合した元の行のリスト members
+    """
+    plans = []
+    plans_by_key = {}
+    filenames = {}  # 結果ファイル名 -> 最初にそのファイルへ書き込む行
+
+    # 1. 正規化して同じ検索になる行をまとめる（OR・ANDともキーワードの順序は問わない）
+    for query_info in search_queries:
+        keywords = list(dict.fromkeys(normalize_keyword(k) for k in query_info["keywords"] if normalize_keyword(k)))
+        if not keywords:
+            continue
+
+        # 同じ結果ファイルに書き込む行は最初の行の結果のみ保存する（同じファイルを2回書き込まない）
+        filename = result_filename(query_info)
+        if filename in filenames:
+            if filenames[filename]["query"] != query_info["query"]:
+                logger.warning(f"Keyword row '{query_info['query']}' writes to the same result file as "
+                               f"'{filenames[filename]['query']}'; searching it once")
+            continue
+        filenames[filename] = query_info
+
+        mergeable = is_mergeable(query_info)
+        key = ("OR" if mergeable else "AND", frozenset(k.lower() for k in keywords))
+        if key in plans_by_key:
+            # 同じ条件で結果ファイルが異なる行（演算子の表記違いなど）は、1回の検索結果をそれぞれに保存する
+            plans_by_key[key]["members"].append(query_info)
+            continue
+
+        plan = {"query": query_info["query"], "operator": query_info["operator"], "keywords": keywords,
+                "members": [query_info], "mergeable": mergeable}
+        plans_by_key[key] = plan
+        plans.append(plan)
+
+    # 2. ORでまとめられる検索を、共通のキーワードが多いものから上限の長さまで統合する
+    merged = []
+    for plan in plans:
+        if not plan["mergeable"]:
+            merged.append(plan)
+            continue
+
+        best = None
+        best_overlap = -1
+        for group in merged:
+            if not group["mergeable"]:
+                continue
+
+            terms = {k.lower(): k for k in group["keywords"]}
+            terms.update({k.lower(): k for k in plan["keywords"] if k.lower() not in terms})
+            overlap = len(set(k.lower() for k in group["keywords"]) & set(k.lower() for k in plan["keywords"]))
+            if len(" OR ".join(terms.values())) <= max_query_length and overlap > best_overlap:
+                best, best_overlap = group, overlap
+
+        if best is None:
+            merged.append(plan)
+            continue
+
+        seen = {k.lower() for k in best["keywords"]}
+        best["keywords"] += [k for k in plan["keywords"] if k.lower() not in seen]
+        best["members"] += plan["members"]
+        best["operator"] = "OR"
+        best["query"] = " OR ".join(best["keywords"])
+
+    for plan in merged:
+        del plan["mergeable"]
+
+    return merged
+
+
+def match_members(text, members):
+    """
+    統合した検索で収集した投稿が、どの元の行の条件に一致するかを判定する
+
+    Args:
+        text: 投稿本文（投稿者のユーザー名などを含めてもよい）
+        members: plan_queries の members
+
+    Returns:
+        List[Dict]: 一致した元の行（どの行の条件にも一致しない場合は空。ただし全行が同じ条件なら全行）
+    """
+    if len(members) == 1:
+        return members
+
+    normalized = normalize_keyword(text).lower()
+    matched = []
+    conditions = set()
+    for member in members:
+        keywords = [normalize_keyword(k).lower() for k in member["keywords"]]
+        conditions.add(frozenset(keywords))
+        if member["operator"] == "OR":
+            hit = any(k in normalized for k in keywords)
+        else:
+            hit = all(k in normalized for k in keywords)
+        if hit:
+            matched.append(member)
+
+    # ハッシュタグ・表示名・引用元などで一致した投稿は振り分け先を決められないため、どの行にも入れない
+    # （重複排除でまとめた同じ条件の行だけの検索なら、どの行にも一致する）
+    if not matched and len(conditions) == 1:
+        return members
+    return matched
+
+
+def log_query_plan(plans, search_queries):
+    """
+    検索計画と、統合により減った検索ページの読み込み数を出力する
+
+    Args:
+        plans: plan_queries の戻り値
+        search_queries: parse_keywords の戻り値
+    """
+    saved = len(search_queries) - len(plans)
+    logger.info(f"Query plan: {len(search_queries)} keyword rows -> {len(plans)} searches "
+                f"({saved} search page loads saved)")
+
+    for i, plan in enumerate(plans, 1):
+        rows = " | ".join(member["query"] for member in plan["members"])
+        logger.info(f"  [{i}] {plan['query']}  <=  {rows}")
@@ -3,22 +3,45 @@
 
 import os
 import sys
+import time
+import threading
 from pathlib import Path
 from datetime import datetime
 from loguru import logger
 
-def setup_logger(calling_file=None):
+# 環境変数での設定（いずれも任意）
+#   SCRAPER_LOG_ENQUEUE=1   ログの書き込みを別スレッドのキュー経由で行う（スクレイピング処理を書き込みで止めない）
+#   SCRAPER_LOG_JSON=1      log/[日付]/[日付].jsonl にJSON形式のログも出力する
+#   SCRAPER_LOG_SAMPLE_RATE 1件ごとのログを1種類あたり毎秒この件数までに抑える（デフォルト10、0で無制限）
+ENV_ENQUEUE = "SCRAPER_LOG_ENQUEUE"
+ENV_JSON = "SCRAPER_LOG_JSON"
+ENV_SAMPLE_RATE = "SCRAPER_LOG_SAMPLE_RATE"
+
+# 現在の設定（同じ設定での再呼び出しではシンクを作り直さない）
+_configured_options = None
+
+
+def env_flag(name):
+    """環境変数が有効（1 / true / yes）か"""
+    return os.environ.get(name, "").strip().lower() in ("1", "true", "yes")
+
+
+def setup_logger(calling_file=None, enqueue=None, json_file=None):
     """
-    Loguruを使用してロギングを設定する
+    Loguruを使用してロギングを設定する（2回目以降の呼び出しでは同じ設定のシンクを再作成しない）
 
     Args:
         calling_file: 呼び出し元のファイルパス
+        enqueue: Trueの場合はキュー経由の非ブロッキング書き込み（Noneの場合は環境変数 SCRAPER_LOG_ENQUEUE）
+        json_file: Trueの場合はJSON形式のログファイルも出力（Noneの場合は環境変数 SCRAPER_LOG_JSON）
 
     Returns:
         logger: 設定済みのlogger
     """
-    # クリア
-    logger.remove()
+    global _configured_options
+
+    enqueue = env_flag(ENV_ENQUEUE) if enqueue is None else enqueue
+    json_file = env_flag(ENV_JSON) if json_file is None else json_file
 
     # 現在の日付を取得
     current_date = datetime.now().strftime("%Y%m%d")
@@ -35,30 +58,124 @@ def setup_logger(calling_file=None):
 
     # ログディレクトリの作成
     log_dir = root_dir / "log" / current_date
-    log_dir.mkdir(parents=True, exist_ok=True)
-
-    # ログファイルのパス
-    log_file = log_dir / f"{current_date}.log"
-
-    # ロガーの設定
-    logger.add(
-        sys.stderr,
-        colorize=True,
-        format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>",
-        level="INFO"
-    )
-
-    logger.add(
-        log_file,
-        rotation="10 MB",  # ログファイルが10MBを超えたらローテーション
-        retention="30 days",  # 30日間保存
-        format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} | {message}",
-        level="DEBUG"
-    )
+    options = (str(log_dir), enqueue, json_file)
+
+    if options != _configured_options:
+        # クリア
+        logger.remove()
+
+        log_dir.mkdir(parents=True, exist_ok=True)
+
+        # ログファイルのパス
+        log_file = log_dir / f"{current_date}.log"
+
+        # ロガーの設定
+        logger.add(
+            sys.stderr,
+            colorize=True,
+            format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>",
+            level="INFO",
+            enqueue=enqueue
+        )
+
+        logger.add(
+            log_file,
+            rotation="10 MB",  # ログファイルが10MBを超えたらローテーション
+            retention="30 days",  # 30日間保存
+            format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} | {message}",
+            level="DEBUG",
+            enqueue=enqueue
+        )
+
+        if json_file:
+            # 1行1レコードのJSON（時刻・レベル・モジュール・メッセージ・extra など）
+            logger.add(
+                log_dir / f"{current_date}.jsonl",
+                rotation="10 MB",
+                retention="30 days",
+                serialize=True,
+                level="DEBUG",
+                enqueue=enqueue
+            )
+
+        _configured_options = options
 
     # 呼び出し元のファイル名をログに記録
     if calling_file:
         module_name = Path(calling_file).name
-        logger.info(f"Logger initialized for {module_name}")
+        logger.info("Logger initialized for {}", module_name)
+
+    return logger
+
+
+class LogSampler:
+    """
+    1件ごとに出力されるログを種類ごとに毎秒一定件数までに抑え、抑えた件数はまとめて出力する
+    """
+
+    def __init__(self, rate=None):
+        """
+        初期化処理
+
+        Args:
+            rate: 1種類あたり毎秒の最大出力件数（Noneの場合は環境変数 SCRAPER_LOG_SAMPLE_RATE、デフォルト10。0で無制限）
+        """
+        if rate is None:
+            try:
+                rate = float(os.environ.get(ENV_SAMPLE_RATE, "10"))
+            except ValueError:
+                rate = 10.0
+        self.rate = rate
+        self.windows = {}  # 種類 -> (1秒間の区切りの開始時刻, 区切り内の出力件数)
+        self.suppressed = {}  # 種類 -> 抑えた件数
+        self.lock = threading.Lock()
+
+    def log(self, key, level, message, *args, **kwargs):
+        """
+        上限以内ならログを出力する（メッセージは出力する場合のみ args で整形される）
+
+        Args:
+            key: ログの種類
+            level: ログレベル
+            message: "{}" 形式のメッセージ
+        """
+        if self.rate > 0:
+            now = time.monotonic()
+            with self.lock:
+                started, emitted = self.windows.get(key, (now, 0))
+                if now - started >= 1.0:
+                    started, emitted = now, 0
+
+                if emitted >= self.rate:
+                    self.windows[key] = (started, emitted)
+                    self.suppressed[key] = self.suppressed.get(key, 0) + 1
+                    return
+
+                self.windows[key] = (started, emitted + 1)
+
+        logger.opt(depth=1).log(level, message, *args, **kwargs)
+
+    def flush(self):
+        """抑えた件数を種類ごとに出力する"""
+        with self.lock:
+            suppressed, self.suppressed = self.suppressed, {}
 
-    return logger
\ No newline at end of file
+        for key, count in suppressed.items():
+            logger.info("Suppressed {} similar '{}' log lines (above {}/s)", count, key, self.rate)
+
+
+# プロセス共通のサンプラー
+_sampler = None
+
+
+def get_sampler():
+    """
+    プロセス共通のサンプラーを取得する
+
+    Returns:
+        LogSampler: サンプラー
+    """
+    global _sampler
+    if _sampler is None:
+        _sampler = LogSampler()
+    return _sampler
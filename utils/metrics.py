@@ -0,0 +1,185 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import json
+import math
+import time
+from pathlib import Path
+from datetime import datetime
+from contextlib import contextmanager
+from loguru import logger
+from rich.console import Console
+from rich.table import Table
+
+# 計測する操作の種類
+#   navigate: page.goto
+#   wait_selector: wait_for_selector による描画待ち
+#   extract: DOM・JSONからのデータ取り出し、DM本文の描画
+#   scroll: スクロールと次ページの通信待ち
+#   sleep: ペース配分・レート制限のための意図的な待機
+#   io: CSV・ジャーナル・キャッシュ・DMファイルの読み書き
+#   operator_wait: DM送信でオペレーターがブラウザの準備を待った時間
+#   operator: DM送信でオペレーターが手動操作していた時間
+IDLE_OPERATIONS = ("sleep",)
+
+_default_recorder = None
+
+
+def percentile(sorted_values, fraction):
+    """昇順に並んだ値の百分位点（最近順位法）"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class MetricsRecorder:
+    """
+    操作ごとの所要時間とカウンターを記録し、JSON Linesで出力する
+    """
+
+    def __init__(self, path=None):
+        """
+        初期化処理
+
+        Args:
+            path: JSON Linesの出力先（デフォルトは log/[日付]/metrics_[日付].jsonl）
+        """
+        current_date = datetime.now().strftime("%Y%m%d")
+        base_dir = Path(__file__).parent.parent
+        self.path = Path(path) if path else base_dir / "log" / current_date / f"metrics_{current_date}.jsonl"
+
+        self.started = time.perf_counter()
+        self.durations = {}  # 操作名 -> 所要時間（秒）のリスト
+        self.counters = {}  # カウンター名 -> 値
+        self.file = None
+
+    def emit(self, event):
+        """イベントを1行のJSONとして書き出す（ファイルは最初の書き込み時に開く）"""
+        if self.file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.file = open(self.path, "a", encoding="utf-8")
+
+        event["ts"] = datetime.now().isoformat(timespec="milliseconds")
+        self.file.write(json.dumps(event, ensure_ascii=False) + "\n")
+
+    def record(self, operation, seconds, label=None):
+        """
+        操作の所要時間を記録する
+
+        Args:
+            operation: 操作名（"navigate" / "wait_selector" / "extract" / "scroll" / "sleep" / "io"）
+            seconds: 所要時間（秒）
+            label: 対象（ユーザー名・クエリなど）
+        """
+        self.durations.setdefault(operation, []).append(seconds)
+
+        event = {"type": "timer", "op": operation, "seconds": round(seconds, 6)}
+        if label is not None:
+            event["label"] = str(label)
+        self.emit(event)
+
+    @contextmanager
+    def timer(self, operation, label=None):
+        """with ブロックの所要時間を記録する"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(operation, time.perf_counter() - started, label)
+
+    def count(self, name, value=1):
+        """カウンターを加算する"""
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def summary(self):
+        """
+        操作ごとの集計を返す
+
+        Returns:
+            Dict: wall_seconds, idle_share, operations（操作名 -> count/total/p50/p95/max）, counters
+        """
+        wall = time.perf_counter() - self.started
+        operations = {}
+        for operation, values in self.durations.items():
+            ordered = sorted(values)
+            operations[operation] = {
+                "count": len(ordered),
+                "total": round(sum(ordered), 3),
+                "p50": round(percentile(ordered, 0.50), 4),
+                "p95": round(percentile(ordered, 0.95), 4),
+                "max": round(ordered[-1], 4),
+            }
+
+        idle = sum(operations[op]["total"] for op in IDLE_OPERATIONS if op in operations)
+        return {
+            "wall_seconds": round(wall, 3),
+            "idle_share": round(idle / wall, 4) if wall > 0 else 0.0,
+            "operations": operations,
+            "counters": dict(self.counters),
+        }
+
+    def report(self, title="Run metrics"):
+        """集計を表示し、JSON Linesにも書き出す"""
+        summary = self.summary()
+        wall = summary["wall_seconds"]
+
+        table = Table(title=title)
+        table.add_column("Operation")
+        table.add_column("Count", justify="right")
+        table.add_column("Total (s)", justify="right")
+        table.add_column("p50 (ms)", justify="right")
+        table.add_column("p95 (ms)", justify="right")
+        table.add_column("Share of wall", justify="right")
+
+        for operation, stats in sorted(summary["operations"].items(), key=lambda item: -item[1]["total"]):
+            share = stats["total"] / wall if wall > 0 else 0.0
+            table.add_row(operation, str(stats["count"]), f"{stats['total']:.2f}", f"{stats['p50'] * 1000:.1f}",
+                          f"{stats['p95'] * 1000:.1f}", f"{share:.1%}")
+
+        Console().print(table)
+        counters = ", ".join(f"{name}={value}" for name, value in summary["counters"].items())
+        logger.info(f"Metrics | wall {wall:.1f}s, idle {summary['idle_share']:.1%}" + (f" | {counters}" if counters else ""))
+
+        self.emit({"type": "summary", **summary})
+        if self.file:
+            self.file.flush()
+            logger.info(f"Metrics written to {self.path}")
+
+        return summary
+
+    def close(self):
+        """出力ファイルを閉じる"""
+        if self.file:
+            self.file.close()
+            self.file = None
+
+
+def configure_metrics(path):
+    """
+    プロセス共通の記録先の出力ファイルを変更する（複数プロセスで同じファイルに書き込まないようにする）
+
+    Args:
+        path: JSON Linesの出力先
+
+    Returns:
+        MetricsRecorder: 記録先
+    """
+    global _default_recorder
+    if _default_recorder is not None:
+        _default_recorder.close()
+    _default_recorder = MetricsRecorder(path)
+    return _default_recorder
+
+
+def get_metrics():
+    """
+    プロセス共通の記録先を取得する（各スクリプト・ユーティリティはこれを共有する）
+
+    Returns:
+        MetricsRecorder: 記録先
+    """
+    global _default_recorder
+    if _default_recorder is None:
+        _default_recorder = MetricsRecorder()
+    return _default_recorder
@@ -0,0 +1,150 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import time
+import random
+import asyncio
+from loguru import logger
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
+from utils.response_capture import SEARCH_TIMELINE_PATTERN
+from utils.metrics import get_metrics
+
+# 操作ごとの最小間隔（秒）。前回の同じ操作の開始からこの時間が経つまで次を始めない
+DEFAULT_MIN_INTERVALS = {
+    "scroll": 1.0,
+    "query": 10.0,
+    "profile": 3.0,
+}
+
+# タイムラインに新しい投稿が描画されたかを判定するスクリプト（TimelineHarvesterのキューを参照）
+NEW_ARTICLES_SCRIPT = "() => !window.__tweetHarvest || window.__tweetHarvest.pending.size > 0"
+
+
+class Pacer:
+    """
+    固定の待機時間の代わりに、実際のイベント（通信完了・描画）を待ちつつ最小間隔と混雑時のバックオフを守るペーサー
+    """
+
+    def __init__(self, min_intervals=None, base_backoff=5.0, max_backoff=300.0, jitter=0.3, limiter=None):
+        """
+        初期化処理
+
+        Args:
+            min_intervals: 操作名 -> 最小間隔（秒）。指定した操作のみデフォルトを上書き
+            base_backoff: 429・サーバーエラーを検知した際の最初の待機時間（秒）
+            max_backoff: バックオフの上限（秒）
+            jitter: 待機時間に加える揺らぎの割合（0.3なら±30%）
+            limiter: 全操作に共通の上限をかけるトークンバケット（複数プロセスで合計のアクセス数を抑える場合）
+        """
+        self.min_intervals = dict(DEFAULT_MIN_INTERVALS)
+        self.min_intervals.update(min_intervals or {})
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.limiter = limiter
+
+        self.last_started = {}  # 操作名 -> 前回の開始時刻
+        self.throttled = 0  # 前回の待機以降に検知した429・サーバーエラーの件数
+        self.consecutive_backoffs = 0
+
+    def attach(self, page):
+        """ページのレスポンスを監視して混雑を検知"""
+        page.on("response", self.on_response)
+
+    def detach(self, page):
+        """監視を解除"""
+        page.remove_listener("response", self.on_response)
+
+    def on_response(self, response):
+        if response.status == 429 or response.status >= 500:
+            self.throttled += 1
+            logger.warning(f"Server pushed back with HTTP {response.status}: {response.url}")
+
+    def backoff_delay(self):
+        """
+        混雑を検知していれば指数バックオフの待機時間を返す（検知していなければ0）
+
+        Returns:
+            float: 待機すべき秒数
+        """
+        if not self.throttled:
+            self.consecutive_backoffs = 0
+            return 0.0
+
+        self.throttled = 0
+        self.consecutive_backoffs += 1
+        delay = min(self.max_backoff, self.base_backoff * 2 ** (self.consecutive_backoffs - 1))
+        return delay * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def interval_delay(self, action):
+        """前回の同じ操作から最小間隔が経過するまでの残り時間を返す"""
+        last = self.last_started.get(action)
+        if last is None:
+            return 0.0
+        return max(0.0, self.min_intervals.get(action, 0.0) - (time.monotonic() - last))
+
+    def next_delay(self, action):
+        """最小間隔とバックオフのうち長い方を返し、操作の開始時刻を記録する"""
+        backoff = self.backoff_delay()
+        if backoff:
+            logger.info(f"Backing off for {backoff:.1f}s before next {action}")
+
+        delay = max(self.interval_delay(action), backoff)
+        if self.limiter is not None:
+            delay = max(delay, self.limiter.reserve())
+        self.last_started[action] = time.monotonic() + delay
+        return delay
+
+    def wait(self, page, action):
+        """
+        操作の前に必要なだけ待機する（待機中もページのイベントは処理される）
+
+        Args:
+            page: Playwrightのページ
+            action: 操作名（"scroll" / "query" / "profile" など）
+
+        Returns:
+            float: 実際に待機した秒数
+        """
+        delay = self.next_delay(action)
+        if delay > 0:
+            with get_metrics().timer("sleep", action):
+                page.wait_for_timeout(delay * 1000)
+        return delay
+
+    async def wait_async(self, action):
+        """wait の非同期版"""
+        delay = self.next_delay(action)
+        if delay > 0:
+            with get_metrics().timer("sleep", action):
+                await asyncio.sleep(delay)
+        return delay
+
+    def scroll_and_wait(self, page, timeout=8000, render_timeout=2000):
+        """
+        タイムラインをスクロールし、次ページの通信完了と新しい投稿の描画を待つ
+
+        Args:
+            page: Playwrightのページ
+            timeout: 検索タイムラインの通信を待つ最大時間（ミリ秒）
+            render_timeout: 通信完了後に投稿の描画を待つ最大時間（ミリ秒）
+
+        Returns:
+            bool: 次ページの通信が完了した場合True（タイムラインの末尾に達した場合はFalse）
+        """
+        self.wait(page, "scroll")
+
+        with get_metrics().timer("scroll"):
+            try:
+                with page.expect_response(lambda r: SEARCH_TIMELINE_PATTERN.search(r.url), timeout=timeout):
+                    page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+            except PlaywrightTimeoutError:
+                return False
+
+            try:
+                page.wait_for_function(NEW_ARTICLES_SCRIPT, timeout=render_timeout)
+            except PlaywrightTimeoutError:
+                pass
+
+            return True
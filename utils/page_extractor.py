@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from typing import List, Dict, Any, Optional
+
+# 1つのarticle要素から投稿情報を取り出すJavaScript関数（未描画などで解析できない場合はnull）
+ARTICLE_FUNCTION = """
+(article) => {
+    const userLink = article.querySelector('div[data-testid="User-Name"] a');
+    if (!userLink) {
+        return null;
+    }
+    const statusLink = article.querySelector('a[href*="/status/"]');
+    const textEl = article.querySelector('div[data-testid="tweetText"]');
+    const timeEl = article.querySelector('time');
+    return {
+        user_href: userLink.getAttribute('href') || '',
+        status_href: statusLink ? statusLink.getAttribute('href') : '',
+        text: textEl ? textEl.innerText : '',
+        timestamp: timeEl ? timeEl.getAttribute('datetime') : '',
+    };
+}
+"""
+
+# 表示中の全articleから投稿情報を1回のpage.evaluateで抽出するスクリプト（解析できないarticleはnull）
+TWEETS_SCRIPT = f"""
+() => Array.from(document.querySelectorAll('article')).map({ARTICLE_FUNCTION})
+"""
+
+# プロフィールページのフォロワー数表記とBioを1回のpage.evaluateで抽出するスクリプト
+PROFILE_SCRIPT = """
+() => {
+    const followersEl = document.querySelector('a[href$="/followers"] span span');
+    const bioEl = document.querySelector('div[data-testid="UserDescription"]');
+    return {
+        followers_text: followersEl ? followersEl.innerText : '0',
+        bio: bioEl ? bioEl.innerText : '',
+    };
+}
+"""
+
+
+def to_tweet_row(raw, base_url="https://twitter.com"):
+    """
+    抽出スクリプトの1件分を検索結果の行形式に変換する
+
+    Args:
+        raw: TWEETS_SCRIPT が返した1要素（解析できなかった場合はNone）
+        base_url: TwitterのベースURL
+
+    Returns:
+        Dict: username, url, tweet_url, tweet_content, tweeted_at を含む辞書（変換できない場合はNone）
+    """
+    if not raw or not raw.get("user_href"):
+        return None
+
+    username = raw["user_href"].rstrip("/").split("/")[-1]
+    status_href = raw.get("status_href") or ""
+
+    return {
+        "username": username,
+        "url": f"{base_url}/{username}",
+        "tweet_url": f"{base_url}{status_href}" if status_href else "",
+        "tweet_content": raw.get("text") or "",
+        "tweeted_at": raw.get("timestamp") or "",
+    }
+
+
+def extract_tweets(page, base_url="https://twitter.com"):
+    """
+    表示中の全articleの投稿情報をまとめて取得する
+
+    Args:
+        page: Playwrightのページ
+        base_url: TwitterのベースURL
+
+    Returns:
+        List[Optional[Dict]]: article順の投稿情報（解析できなかったarticleはNone）
+    """
+    return [to_tweet_row(raw, base_url) for raw in page.evaluate(TWEETS_SCRIPT)]
+
+
+def extract_profile(page):
+    """
+    プロフィールページのフォロワー数表記とBioをまとめて取得する
+
+    Args:
+        page: Playwrightのページ
+
+    Returns:
+        Dict: followers_text, bio を含む辞書
+    """
+    return page.evaluate(PROFILE_SCRIPT)
@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import time
+import sqlite3
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+# キャッシュに記録するプロフィールの状態
+STATUS_OK = "ok"
+STATUS_BELOW_THRESHOLD = "below-threshold"
+STATUS_NOT_FOUND = "not-found"
+STATUS_SUSPENDED = "suspended"
+STATUS_PROTECTED = "protected"
+
+# ページを開いても取得・DM送信できない状態（有効期間内は再取得しない）
+UNAVAILABLE_STATUSES = (STATUS_NOT_FOUND, STATUS_SUSPENDED, STATUS_PROTECTED)
+
+
+class ProfileCache:
+    """
+    ユーザー名をキーにプロフィール取得結果を保存するSQLiteキャッシュ（TTL付き）
+    """
+
+    def __init__(self, db_path=None, ttl_days=7):
+        """
+        初期化処理
+
+        Args:
+            db_path: データベースファイル（デフォルトは cache/profiles.sqlite3）
+            ttl_days: キャッシュの有効期間（日）
+        """
+        base_dir = Path(__file__).parent.parent
+        self.db_path = Path(db_path) if db_path else base_dir / "cache" / "profiles.sqlite3"
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl_seconds = ttl_days * 24 * 60 * 60
+
+        self.hits = 0
+        self.misses = 0
+
+        self.conn = sqlite3.connect(str(self.db_path))
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS profiles (
+                username TEXT PRIMARY KEY,
+                followers INTEGER NOT NULL DEFAULT 0,
+                bio TEXT NOT NULL DEFAULT '',
+                status TEXT NOT NULL,
+                fetched_at REAL NOT NULL
+            )
+            """
+        )
+        self.conn.commit()
+
+    def get(self, username):
+        """
+        有効期間内のキャッシュを取得する（ヒット・ミスを集計）
+
+        Args:
+            username: ユーザー名
+
+        Returns:
+            Dict: username, followers, bio, status, fetched_at を含む辞書（未取得・期限切れの場合はNone）
+        """
+        row = self.conn.execute(
+            "SELECT username, followers, bio, status, fetched_at FROM profiles WHERE username = ? AND fetched_at >= ?",
+            (str(username).lower(), time.time() - self.ttl_seconds),
+        ).fetchone()
+
+        if row is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return dict(zip(("username", "followers", "bio", "status", "fetched_at"), row))
+
+    def put(self, username, followers=0, bio="", status=STATUS_OK):
+        """
+        取得結果を保存する
+
+        Args:
+            username: ユーザー名
+            followers: フォロワー数
+            bio: Bio
+            status: STATUS_OK / STATUS_BELOW_THRESHOLD / STATUS_NOT_FOUND / STATUS_SUSPENDED / STATUS_PROTECTED
+        """
+        self.conn.execute(
+            "INSERT OR REPLACE INTO profiles (username, followers, bio, status, fetched_at) VALUES (?, ?, ?, ?, ?)",
+            (str(username).lower(), int(followers), bio or "", status, time.time()),
+        )
+        self.conn.commit()
+
+    def purge_expired(self):
+        """期限切れのエントリを削除し、削除件数を返す"""
+        cursor = self.conn.execute("DELETE FROM profiles WHERE fetched_at < ?", (time.time() - self.ttl_seconds,))
+        self.conn.commit()
+        return cursor.rowcount
+
+    def close(self):
+        """接続を閉じる"""
+        self.conn.close()
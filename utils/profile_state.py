@@ -0,0 +1,133 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from urllib.parse import urlparse
+
+from utils.metrics import get_metrics
+from utils.profile_cache import STATUS_OK, STATUS_NOT_FOUND, STATUS_SUSPENDED, STATUS_PROTECTED
+
+# プロフィール・空状態・エラーのいずれかが描画されたら判定できる（描画されない限りtimeoutまで待つ）
+PROFILE_READY_SELECTOR = ", ".join([
+    'a[href$="/followers"]',
+    'div[data-testid="UserName"]',
+    'div[data-testid="emptyState"]',
+    'div[data-testid="error-detail"]',
+])
+
+# 描画されたプロフィールページの状態を1回のpage.evaluateで取得するスクリプト
+STATE_SCRIPT = """
+() => {
+    const emptyEl = document.querySelector('div[data-testid="emptyState"]');
+    return {
+        loaded: !!document.querySelector('a[href$="/followers"], div[data-testid="UserName"]'),
+        empty_text: emptyEl ? emptyEl.innerText : '',
+        error: !!document.querySelector('div[data-testid="error-detail"]'),
+        protected: !!document.querySelector('div[data-testid="UserName"] [data-testid="icon-lock"]'),
+    };
+}
+"""
+
+# 空状態の表示文言（英語・日本語）
+SUSPENDED_MARKERS = ("suspended", "凍結")
+NOT_FOUND_MARKERS = ("doesn't exist", "does not exist", "存在しません")
+
+
+class ProfilePageError(Exception):
+    """プロフィールページがエラー表示・ログイン画面になった（アカウントの状態ではないため記録しない）"""
+
+
+def classify_navigation(response, final_url, username):
+    """
+    ページ遷移のレスポンスとリダイレクト先から状態を判定する（描画を待たない）
+
+    Args:
+        response: page.goto の戻り値
+        final_url: 遷移後のURL
+        username: ユーザー名
+
+    Returns:
+        str: STATUS_NOT_FOUND / STATUS_SUSPENDED（判定できない場合はNone）
+    """
+    if response is not None and response.status in (404, 410):
+        return STATUS_NOT_FOUND
+
+    path = urlparse(final_url or "").path.strip("/")
+    if path.startswith("account/suspended"):
+        return STATUS_SUSPENDED
+    if path in ("login", "i/flow/login"):
+        raise ProfilePageError(f"Redirected to login while opening @{username}; the saved session has expired")
+
+    # 別のユーザー名・ページへのリダイレクト（ユーザー名の変更など）
+    first = path.split("/")[0] if path else ""
+    if first and first.lower() != str(username).lower():
+        return STATUS_NOT_FOUND
+
+    return None
+
+
+def classify_state(state, username, captured=None):
+    """
+    描画されたページの状態から判定する
+
+    Args:
+        state: STATE_SCRIPT の戻り値
+        username: ユーザー名
+        captured: ResponseCapture が捕捉したプロフィール（あれば非公開の判定に使用）
+
+    Returns:
+        str: STATUS_OK / STATUS_NOT_FOUND / STATUS_SUSPENDED / STATUS_PROTECTED
+    """
+    empty_text = (state.get("empty_text") or "").lower()
+    if any(marker in empty_text for marker in SUSPENDED_MARKERS):
+        return STATUS_SUSPENDED
+    if any(marker in empty_text for marker in NOT_FOUND_MARKERS):
+        return STATUS_NOT_FOUND
+    if state.get("error") and not state.get("loaded"):
+        raise ProfilePageError(f"Profile page for @{username} showed an error")
+
+    if (captured and captured.get("protected")) or state.get("protected"):
+        return STATUS_PROTECTED
+
+    return STATUS_OK if state.get("loaded") else STATUS_NOT_FOUND
+
+
+def open_profile(page, url, username, capture=None, timeout=30000):
+    """
+    プロフィールページを開き、存在しない・凍結・非公開のアカウントを描画直後に判定する
+
+    Args:
+        page: Playwrightのページ
+        url: プロフィールURL
+        username: ユーザー名
+        capture: ResponseCapture（捕捉済みのJSONがあれば非公開の判定に使用）
+        timeout: 描画を待つ最大時間（ミリ秒）
+
+    Returns:
+        str: 判定した状態（STATUS_OK の場合はプロフィールを読み取れる）
+    """
+    metrics = get_metrics()
+    with metrics.timer("navigate", username):
+        response = page.goto(url)
+    status = classify_navigation(response, page.url, username)
+    if status:
+        return status
+
+    with metrics.timer("wait_selector", username):
+        page.wait_for_selector(PROFILE_READY_SELECTOR, timeout=timeout)
+    captured = capture.user(username) if capture else None
+    return classify_state(page.evaluate(STATE_SCRIPT), username, captured)
+
+
+async def open_profile_async(page, url, username, capture=None, timeout=30000):
+    """open_profile の非同期版"""
+    metrics = get_metrics()
+    with metrics.timer("navigate", username):
+        response = await page.goto(url)
+    status = classify_navigation(response, page.url, username)
+    if status:
+        return status
+
+    with metrics.timer("wait_selector", username):
+        await page.wait_for_selector(PROFILE_READY_SELECTOR, timeout=timeout)
+    captured = await capture.user_async(username) if capture else None
+    return classify_state(await page.evaluate(STATE_SCRIPT), username, captured)
@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import time
+import asyncio
+import threading
+import multiprocessing
+
+from utils.metrics import get_metrics
+
+
+class TokenBucket:
+    """
+    全ページ共通のリクエスト間隔を守るトークンバケット型レートリミッター
+    """
+
+    def __init__(self, requests_per_minute=20, burst=1):
+        """
+        初期化処理
+
+        Args:
+            requests_per_minute: 1分あたりの最大リクエスト数
+            burst: 連続して即時に許可するリクエスト数（バケットの容量）
+        """
+        if requests_per_minute <= 0:
+            raise ValueError("requests_per_minute must be positive")
+
+        self.rate = requests_per_minute / 60.0  # 1秒あたりの補充トークン数
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def reserve(self):
+        """
+        トークンを1つ予約し、使用可能になるまでの待ち時間を返す
+
+        Returns:
+            float: 待機すべき秒数（0の場合は即時に使用可能）
+        """
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+            self.updated_at = now
+
+            # 先に差し引いておくことで、同時に呼ばれても待ち時間が順に積み上がる
+            self.tokens -= 1
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+    def acquire(self):
+        """トークンを取得できるまでブロックして待機"""
+        wait = self.reserve()
+        if wait > 0:
+            with get_metrics().timer("sleep", "rate_limit"):
+                time.sleep(wait)
+        return wait
+
+    async def acquire_async(self):
+        """トークンを取得できるまでイベントループを止めずに待機"""
+        wait = self.reserve()
+        if wait > 0:
+            with get_metrics().timer("sleep", "rate_limit"):
+                await asyncio.sleep(wait)
+        return wait
+
+
+class SharedTokenBucket(TokenBucket):
+    """
+    複数プロセスで共有するトークンバケット（全ワーカー合計のリクエスト数を上限以下に抑える）
+
+    プロセスの引数として渡して共有する。時刻はプロセス間で共通の time.time() を使う
+    """
+
+    def __init__(self, requests_per_minute=20, burst=1, context=None):
+        """
+        初期化処理
+
+        Args:
+            requests_per_minute: 全プロセス合計の1分あたりの最大リクエスト数
+            burst: 連続して即時に許可するリクエスト数（バケットの容量）
+            context: multiprocessing のコンテキスト（ワーカーの起動方法と揃える）
+        """
+        super().__init__(requests_per_minute, burst)
+        context = context or multiprocessing
+        self.shared_tokens = context.RawValue("d", float(self.capacity))
+        self.shared_updated_at = context.RawValue("d", time.time())
+        self.lock = context.Lock()
+
+    def reserve(self):
+        """
+        トークンを1つ予約し、使用可能になるまでの待ち時間を返す
+
+        Returns:
+            float: 待機すべき秒数（0の場合は即時に使用可能）
+        """
+        with self.lock:
+            now = time.time()
+            tokens = min(self.capacity, self.shared_tokens.value + (now - self.shared_updated_at.value) * self.rate)
+            self.shared_updated_at.value = now
+
+            tokens -= 1
+            self.shared_tokens.value = tokens
+            if tokens >= 0:
+                return 0.0
+            return -tokens / self.rate
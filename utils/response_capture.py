@@ -0,0 +1,234 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import re
+from datetime import datetime, timezone
+from loguru import logger
+from typing import List, Dict, Any, Optional, Tuple
+
+# 検索タイムラインとユーザー取得のGraphQLエンドポイント
+SEARCH_TIMELINE_PATTERN = re.compile(r"/i/api/graphql/[^/]+/SearchTimeline")
+USER_LOOKUP_PATTERN = re.compile(r"/i/api/graphql/[^/]+/UserByScreenName")
+
+
+def parse_created_at(created_at):
+    """
+    APIの投稿日時表記（例: "Sun May 11 12:34:56 +0000 2025"）をDOMのdatetime属性と同じISO形式に変換する
+
+    Args:
+        created_at: APIの投稿日時
+
+    Returns:
+        str: ISO形式の日時（例: "2025-05-11T12:34:56.000Z"）。変換できない場合は空文字列
+    """
+    try:
+        parsed = datetime.strptime(created_at, "%a %b %d %H:%M:%S %z %Y")
+    except (TypeError, ValueError):
+        return ""
+
+    return parsed.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.000Z")
+
+
+def parse_user_result(result):
+    """
+    GraphQLのユーザーオブジェクトからプロフィール情報を取り出す
+
+    Args:
+        result: user_results.result に相当する辞書
+
+    Returns:
+        Dict: username, followers, bio, protected を含む辞書（ユーザーが存在しない場合はNone）
+    """
+    if not result or result.get("__typename") != "User":
+        return None
+
+    legacy = result.get("legacy") or {}
+    core = result.get("core") or {}
+    username = core.get("screen_name") or legacy.get("screen_name")
+    if not username:
+        return None
+
+    return {
+        "username": username,
+        "followers": int(legacy.get("followers_count") or 0),
+        "bio": legacy.get("description") or "",
+        "protected": bool(legacy.get("protected") or (result.get("privacy") or {}).get("protected")),
+    }
+
+
+def iter_tweet_results(node):
+    """ペイロードを再帰的に走査して tweet_results.result を順に返す"""
+    if isinstance(node, dict):
+        tweet_results = node.get("tweet_results")
+        if isinstance(tweet_results, dict) and tweet_results.get("result"):
+            yield tweet_results["result"]
+            return
+
+        for value in node.values():
+            yield from iter_tweet_results(value)
+
+    elif isinstance(node, list):
+        for value in node:
+            yield from iter_tweet_results(value)
+
+
+def parse_search_timeline(payload, base_url="https://twitter.com"):
+    """
+    SearchTimelineのレスポンスから投稿と投稿者を取り出す
+
+    Args:
+        payload: SearchTimelineのJSON
+        base_url: TwitterのベースURL
+
+    Returns:
+        Tuple[List[Dict], Dict[str, Dict]]: 投稿の行リストと、小文字ユーザー名をキーとする投稿者情報
+    """
+    tweets = []
+    users = {}
+
+    for result in iter_tweet_results(payload):
+        # 閲覧制限付きの投稿はラップされている
+        if result.get("__typename") == "TweetWithVisibilityResults":
+            result = result.get("tweet") or {}
+        if result.get("__typename") != "Tweet":
+            continue
+
+        user = parse_user_result(((result.get("core") or {}).get("user_results") or {}).get("result"))
+        if not user:
+            continue
+
+        legacy = result.get("legacy") or {}
+        status_id = result.get("rest_id") or legacy.get("id_str") or ""
+        note = (((result.get("note_tweet") or {}).get("note_tweet_results") or {}).get("result") or {})
+        username = user["username"]
+
+        users[username.lower()] = user
+        tweets.append({
+            "username": username,
+            "url": f"{base_url}/{username}",
+            "tweet_url": f"{base_url}/{username}/status/{status_id}" if status_id else "",
+            "tweet_content": note.get("text") or legacy.get("full_text") or "",
+            "tweeted_at": parse_created_at(legacy.get("created_at")),
+        })
+
+    return tweets, users
+
+
+def parse_user_lookup(payload):
+    """
+    UserByScreenNameのレスポンスからプロフィール情報を取り出す
+
+    Args:
+        payload: UserByScreenNameのJSON
+
+    Returns:
+        Dict: parse_user_result と同じ形式の辞書（ユーザーが存在しない場合はNone）
+    """
+    return parse_user_result((((payload or {}).get("data") or {}).get("user") or {}).get("result"))
+
+
+class ResponseCapture:
+    """
+    page.on("response") で検索タイムラインとユーザー取得のJSONを捕捉し、DOMを介さずにデータを取り出す
+    """
+
+    def __init__(self, base_url="https://twitter.com"):
+        """初期化処理"""
+        self.base_url = base_url
+        self.pending = []  # 未解析のレスポンス
+        self.tweets = []  # 未取り出しの投稿
+        self.users = {}  # 小文字ユーザー名 -> プロフィール情報
+        self.timeline_responses = 0
+
+    def attach(self, page):
+        """ページにレスポンスリスナーを登録"""
+        page.on("response", self.on_response)
+
+    def detach(self, page):
+        """ページからレスポンスリスナーを解除"""
+        page.remove_listener("response", self.on_response)
+
+    def reset(self):
+        """クエリ単位の状態をクリア（取得済みのユーザー情報は保持）"""
+        self.pending = []
+        self.tweets = []
+        self.timeline_responses = 0
+
+    def on_response(self, response):
+        """対象エンドポイントのレスポンスを保留（本文の読み込みは collect で行う）"""
+        url = response.url
+        if SEARCH_TIMELINE_PATTERN.search(url) or USER_LOOKUP_PATTERN.search(url):
+            self.pending.append(response)
+
+    def add_payload(self, url, payload):
+        """捕捉したJSONをエンドポイントに応じて解析"""
+        if SEARCH_TIMELINE_PATTERN.search(url):
+            tweets, users = parse_search_timeline(payload, self.base_url)
+            self.tweets.extend(tweets)
+            self.users.update(users)
+            self.timeline_responses += 1
+        else:
+            user = parse_user_lookup(payload)
+            if user:
+                self.users[user["username"].lower()] = user
+
+    def collect(self):
+        """保留中のレスポンスを解析"""
+        pending, self.pending = self.pending, []
+
+        for response in pending:
+            try:
+                if not response.ok:
+                    logger.debug("Skipping captured response {}: {}", response.status, response.url)
+                    continue
+                payload = response.json()
+            except Exception as e:
+                logger.warning(f"Could not read captured response {response.url}: {str(e)}")
+                continue
+
+            self.add_payload(response.url, payload)
+
+    async def collect_async(self):
+        """collect の非同期版（playwright.async_api のレスポンス用）"""
+        pending, self.pending = self.pending, []
+
+        for response in pending:
+            try:
+                if not response.ok:
+                    logger.debug("Skipping captured response {}: {}", response.status, response.url)
+                    continue
+                payload = await response.json()
+            except Exception as e:
+                logger.warning(f"Could not read captured response {response.url}: {str(e)}")
+                continue
+
+            self.add_payload(response.url, payload)
+
+    def drain_tweets(self):
+        """
+        捕捉済みの投稿を取り出す
+
+        Returns:
+            List[Dict]: 前回の取り出し以降に捕捉した投稿
+        """
+        self.collect()
+        tweets, self.tweets = self.tweets, []
+        return tweets
+
+    def user(self, username):
+        """
+        捕捉済みのプロフィール情報を取得する
+
+        Args:
+            username: ユーザー名
+
+        Returns:
+            Dict: プロフィール情報（未捕捉の場合はNone）
+        """
+        self.collect()
+        return self.users.get(str(username).lower())
+
+    async def user_async(self, username):
+        """user の非同期版"""
+        await self.collect_async()
+        return self.users.get(str(username).lower())
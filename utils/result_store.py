@@ -0,0 +1,228 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import re
+import sys
+import argparse
+import pandas as pd
+from pathlib import Path
+from datetime import datetime
+from urllib.parse import quote
+from loguru import logger
+
+# pyarrow は Parquet 形式を使う場合のみ必要
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+# 相対インポート対応
+sys.path.append(str(Path(__file__).parent.parent))
+from utils.filename_generator import generate_filename
+
+# 保存する列（パーティション列 date / query_key はディレクトリ名に含まれる）
+DATA_COLUMNS = ["username", "url", "bio", "followers", "tweet_url", "tweet_content", "tweeted_at",
+                "query", "operator", "keywords"]
+
+DATE_PATTERN = re.compile(r"^\d{8}$")
+
+# OR検索のファイル名でキーワードを連結する "or"（"New York" などの英単語の一部と区別するため、
+# 少なくとも片側が日本語などの非ASCII文字の場合のみ区切りとして扱う）
+OR_SEPARATOR = re.compile(r"(?<=[^\x00-\x7f])or|or(?=[^\x00-\x7f])")
+
+
+def require_pyarrow():
+    """pyarrow が利用できない場合は例外を送出"""
+    if pa is None:
+        raise ImportError("pyarrow is required for the parquet result store (pip install pyarrow)")
+
+
+def data_schema():
+    """保存する列のスキーマ（パーティションごとに型を揃える）"""
+    return pa.schema([
+        ("username", pa.string()),
+        ("url", pa.string()),
+        ("bio", pa.string()),
+        ("followers", pa.int64()),
+        ("tweet_url", pa.string()),
+        ("tweet_content", pa.string()),
+        ("tweeted_at", pa.string()),
+        ("query", pa.string()),
+        ("operator", pa.string()),
+        ("keywords", pa.list_(pa.string())),
+    ])
+
+
+def partition_schema():
+    """パーティション列のスキーマ（日付を数値として推論させない）"""
+    return pa.schema([("date", pa.string()), ("query_key", pa.string())])
+
+
+def parse_result_filename(stem):
+    """
+    検索結果CSVのファイル名（拡張子なし）から日付・クエリ・演算子・キーワードを復元する
+
+    Args:
+        stem: ファイル名（例: "東京_ラーメン_20250512", "銀座_グルメor六本木_バー_20250512"）
+
+    Returns:
+        Tuple[str, str, str, List[str]]: (日付, クエリ, 演算子, キーワードのリスト)。日付がない場合は空文字列
+        （英字のみのキーワードを "or" で連結したファイル名は区切りを判別できないため、AND検索として復元される）
+    """
+    parts = stem.split("_")
+    date_str = parts.pop() if len(parts) >= 2 and DATE_PATTERN.match(parts[-1]) else ""
+    key = "_".join(parts)
+
+    names = [k.replace("_", " ").replace("+", " ").strip() for k in OR_SEPARATOR.split(key)]
+    keywords = [k for k in names if k]
+    if len(keywords) >= 2:
+        return date_str, " OR ".join(keywords), "OR", keywords
+
+    keywords = [k for k in re.split(r"[_+]", key) if k]
+    return date_str, " ".join(keywords), "AND", keywords
+
+
+class ParquetResultStore:
+    """
+    検索結果を日付・クエリでパーティション分割したParquetデータセットとして保存・読み込みする
+
+    result/dataset/date=YYYYMMDD/query_key=<キーワード>/part-0.parquet の形式で保存され、
+    読み込み時は必要な列と日付範囲のみを取り出せる
+    """
+
+    def __init__(self, root=None):
+        """
+        初期化処理
+
+        Args:
+            root: データセットのディレクトリ（デフォルトは result/dataset/）
+        """
+        require_pyarrow()
+
+        self.base_dir = Path(__file__).parent.parent
+        self.root = Path(root) if root else self.base_dir / "result" / "dataset"
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def partition_dir(self, date_str, query_key):
+        """パーティションのディレクトリ"""
+        return self.root / f"date={date_str}" / f"query_key={quote(query_key, safe='')}"
+
+    def write_query(self, df, date_str, query, operator, keywords, append=False):
+        """
+        1クエリ分の検索結果をパーティションに書き込む（同じ日付・クエリの既存データは置き換える）
+
+        Args:
+            df: 検索結果
+            date_str: 日付（YYYYMMDD）
+            query: 検索クエリ
+            operator: 演算子
+            keywords: キーワードのリスト
+            append: Trueの場合は既存データを残し、新しいファイルとして追加する
+
+        Returns:
+            Path: 書き込んだファイル
+        """
+        query_key = Path(generate_filename(keywords, operator, date_str)).stem[:-(len(date_str) + 1)]
+
+        frame = df.copy()
+        frame["query"] = query
+        frame["operator"] = operator
+        frame["keywords"] = [list(keywords)] * len(frame)
+        for column in DATA_COLUMNS:
+            if column not in frame.columns:
+                frame[column] = 0 if column == "followers" else ""
+
+        frame = frame[DATA_COLUMNS]
+        text_columns = [c for c in DATA_COLUMNS if c not in ("followers", "keywords")]
+        frame[text_columns] = frame[text_columns].fillna("").astype(str)
+        frame["followers"] = pd.to_numeric(frame["followers"], errors="coerce").fillna(0).astype("int64")
+
+        output_dir = self.partition_dir(date_str, query_key)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        existing = sorted(output_dir.glob("part-*.parquet"))
+        if not append:
+            for path in existing:
+                path.unlink()
+        part = len(existing) if append else 0
+        output_path = output_dir / f"part-{part}.parquet"
+
+        table = pa.Table.from_pandas(frame, schema=data_schema(), preserve_index=False)
+        pq.write_table(table, output_path)
+        logger.info(f"Saved {len(frame)} results to {output_path}")
+
+        return output_path
+
+    def read(self, columns=None, start_date=None, end_date=None):
+        """
+        データセットから必要な列・日付範囲のみを読み込む
+
+        Args:
+            columns: 読み込む列（Noneの場合はすべて。date / query_key も指定可能）
+            start_date: この日付（YYYYMMDD）以降のみ
+            end_date: この日付（YYYYMMDD）以前のみ
+
+        Returns:
+            DataFrame: 検索結果
+        """
+        if not any(self.root.glob("date=*/query_key=*/*.parquet")):
+            return pd.DataFrame(columns=columns or DATA_COLUMNS)
+
+        dataset = ds.dataset(self.root, format="parquet", schema=pa.unify_schemas([data_schema(), partition_schema()]),
+                             partitioning=ds.partitioning(partition_schema(), flavor="hive"))
+
+        condition = None
+        if start_date:
+            condition = ds.field("date") >= str(start_date)
+        if end_date:
+            upper = ds.field("date") <= str(end_date)
+            condition = upper if condition is None else condition & upper
+
+        return dataset.to_table(columns=columns, filter=condition).to_pandas()
+
+    def convert_csv_history(self, result_dir=None):
+        """
+        result/ の既存CSVをデータセットに変換する（CSVは削除しない）
+
+        Args:
+            result_dir: CSVのディレクトリ（デフォルトは result/）
+
+        Returns:
+            int: 変換したファイル数
+        """
+        result_dir = Path(result_dir) if result_dir else self.base_dir / "result"
+        converted = 0
+
+        for file_path in sorted(result_dir.glob("*.csv")):
+            try:
+                date_str, query, operator, keywords = parse_result_filename(file_path.stem)
+                if not date_str:
+                    date_str = datetime.fromtimestamp(file_path.stat().st_mtime).strftime("%Y%m%d")
+
+                df = pd.read_csv(file_path)
+                if "query" in df.columns and df["query"].notna().any():
+                    # 保存されたクエリがあればファイル名より優先する（演算子・キーワードもクエリから求める）
+                    query = str(df["query"].dropna().iloc[0])
+                    if " OR " in query:
+                        operator, keywords = "OR", [k.strip() for k in query.split(" OR ") if k.strip()]
+                    else:
+                        operator, keywords = "AND", query.split()
+
+                self.write_query(df, date_str, query, operator, keywords)
+                converted += 1
+            except Exception as e:
+                logger.warning(f"Error converting file {file_path.name}: {str(e)}")
+
+        logger.info(f"Converted {converted} CSV files into {self.root}")
+        return converted
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="result/ の検索結果CSVをParquetデータセットに変換")
+    parser.add_argument("--result-dir", default=None, help="変換するCSVのディレクトリ（デフォルトは result/）")
+    parser.add_argument("--dataset-dir", default=None, help="データセットの保存先（デフォルトは result/dataset/）")
+    args = parser.parse_args()
+
+    store = ParquetResultStore(args.dataset_dir)
+    store.convert_csv_history(args.result_dir)
@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import csv
+from pathlib import Path
+from loguru import logger
+
+
+class StreamingCsvWriter:
+    """
+    収集した行を1行ずつCSVファイルへ追記するライター（メモリ上に結果を溜めない）
+
+    ファイルは最初の行を書き込む時点で作成されるため、結果が0件の場合はファイルを作らない
+    """
+
+    def __init__(self, path, fieldnames, flush_every=50, append=False, unique_key=None):
+        """
+        初期化処理
+
+        Args:
+            path: 出力先のCSVファイル
+            fieldnames: 列名のリスト（この順序でヘッダーと各行を書き込む）
+            flush_every: この行数ごとにディスクへ書き出す
+            append: Trueの場合は既存のファイルの末尾へ追記する（ヘッダーは新規作成時のみ）
+            unique_key: 追記時に既存の行と値が重複する行を書き込まない列（中断後の再実行で同じ行を追記しないため）
+        """
+        self.path = Path(path)
+        self.fieldnames = list(fieldnames)
+        self.flush_every = flush_every
+        self.append = append
+        self.unique_key = unique_key
+        self.rows = 0
+        self.seen = set()
+
+        self.file = None
+        self.writer = None
+
+    def write(self, row):
+        """
+        1行を追記する
+
+        Args:
+            row: 列名をキーとする辞書
+
+        Returns:
+            bool: 書き込んだ場合はTrue（既存の行と重複する場合はFalse）
+        """
+        if self.file is None:
+            # pandas の to_csv と同じ改行・クォート規則で書き込む
+            has_rows = self.append and self.path.exists() and self.path.stat().st_size > 0
+            if has_rows and self.unique_key:
+                self.seen = self.read_keys()
+            self.file = open(self.path, "a" if has_rows else "w", newline="", encoding="utf-8")
+            self.writer = csv.DictWriter(self.file, fieldnames=self.fieldnames, lineterminator=os.linesep,
+                                         extrasaction="ignore")
+            if not has_rows:
+                self.writer.writeheader()
+
+        if self.unique_key:
+            key = str(row.get(self.unique_key, ""))
+            if key and key in self.seen:
+                return False
+            self.seen.add(key)
+
+        self.writer.writerow(row)
+        self.rows += 1
+
+        if self.rows % self.flush_every == 0:
+            self.file.flush()
+        return True
+
+    def read_keys(self):
+        """既存のファイルに書き込まれている unique_key 列の値"""
+        with open(self.path, newline="", encoding="utf-8") as f:
+            keys = {row.get(self.unique_key) or "" for row in csv.DictReader(f)}
+
+        if keys:
+            logger.debug(f"Loaded {len(keys)} existing rows from {self.path}")
+        return keys
+
+    def close(self):
+        """
+        ファイルを閉じる
+
+        Returns:
+            int: 書き込んだ行数
+        """
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+            logger.info(f"Saved {self.rows} results to {self.path}")
+
+        return self.rows
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
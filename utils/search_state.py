@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import json
+from pathlib import Path
+from datetime import datetime
+from loguru import logger
+
+from utils.keyword_parser import normalize_keyword
+from utils.timeline_harvester import parse_status_id
+
+
+class SearchWatermarks:
+    """
+    クエリごとに前回までに収集した最新の投稿（ステータスID・投稿日時）を記録する
+
+    ステータスIDは投稿日時の順に増えるため、最新IDより大きい投稿だけが前回以降の新しい投稿となる
+    """
+
+    def __init__(self, path=None):
+        """
+        初期化処理
+
+        Args:
+            path: 記録ファイル（デフォルトは cache/search_watermarks.json）
+        """
+        base_dir = Path(__file__).parent.parent
+        self.path = Path(path) if path else base_dir / "cache" / "search_watermarks.json"
+        self.entries = {}  # 正規化したクエリ -> {"status_id", "tweeted_at", "updated_at"}
+
+        if self.path.exists():
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self.entries = json.load(f)
+                logger.info(f"Loaded search watermarks for {len(self.entries)} queries from {self.path}")
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable search watermarks: {str(e)}")
+
+    @staticmethod
+    def key(query):
+        """記録のキー（表記の揺れで別のクエリ扱いにならないよう正規化する）"""
+        return normalize_keyword(query)
+
+    def status_id(self, query):
+        """
+        クエリの最新ステータスIDを取得する
+
+        Args:
+            query: 検索クエリ
+
+        Returns:
+            int: 最新ステータスID（記録がない場合はNone）
+        """
+        entry = self.entries.get(self.key(query))
+        return int(entry["status_id"]) if entry else None
+
+    def update(self, query, rows):
+        """
+        収集した行から最新の投稿を記録する（既存の記録より新しい場合のみ）
+
+        Args:
+            query: 検索クエリ
+            rows: 収集した行（tweet_url・tweeted_at を含む）
+        """
+        newest = None
+        for row in rows:
+            status_id = parse_status_id(row.get("tweet_url"))
+            if status_id and (newest is None or int(status_id) > int(newest[0])):
+                newest = (status_id, row.get("tweeted_at", ""))
+
+        if newest is None:
+            return
+
+        current = self.status_id(query)
+        if current is not None and current >= int(newest[0]):
+            return
+
+        self.entries[self.key(query)] = {
+            "status_id": newest[0],
+            "tweeted_at": newest[1],
+            "updated_at": datetime.now().isoformat(timespec="seconds"),
+        }
+
+    def save(self):
+        """記録をファイルへ書き出す（一時ファイルに書いてから置き換え、中断しても壊さない）"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_suffix(".tmp")
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(self.entries, f, ensure_ascii=False, indent=2)
+        os.replace(temp_path, self.path)
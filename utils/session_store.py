@@ -0,0 +1,196 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import re
+import sys
+from pathlib import Path
+from urllib.parse import urlparse
+from loguru import logger
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+from playwright.async_api import TimeoutError as AsyncPlaywrightTimeoutError
+
+# ログイン済み画面にのみ表示される要素
+LOGGED_IN_SELECTOR = 'a[data-testid="AppTabBar_Home_Link"]'
+
+
+class SessionStore:
+    """
+    Playwrightのストレージ状態（Cookie・LocalStorage）を保存し、全ステージで再利用するセッションストア
+    """
+
+    def __init__(self, state_file=None, base_url="https://twitter.com"):
+        """
+        初期化処理
+
+        Args:
+            state_file: ストレージ状態の保存先（デフォルトは session/storage_state.json）
+            base_url: TwitterのベースURL（スタブサーバーなど別ホストの場合はホストごとに保存先を分ける）
+        """
+        self.base_dir = Path(__file__).parent.parent
+        self.session_dir = self.base_dir / "session"
+        self.base_url = base_url.rstrip("/")
+
+        if state_file:
+            self.state_file = Path(state_file)
+        elif self.base_url == "https://twitter.com":
+            self.state_file = self.session_dir / "storage_state.json"
+        else:
+            host = re.sub(r"[^\w.-]", "_", urlparse(self.base_url).netloc)
+            self.state_file = self.session_dir / f"storage_state_{host}.json"
+
+    def has_saved_session(self):
+        """保存済みのセッションが存在するか"""
+        return self.state_file.exists()
+
+    def new_context(self, browser, **kwargs):
+        """
+        保存済みセッションを読み込んだブラウザコンテキストを作成する
+
+        Args:
+            browser: Playwrightのブラウザ
+            **kwargs: browser.new_context に渡す追加オプション
+
+        Returns:
+            BrowserContext: 作成したコンテキスト
+        """
+        options = {"viewport": {"width": 1280, "height": 800}}
+        options.update(kwargs)
+
+        if self.has_saved_session():
+            options["storage_state"] = str(self.state_file)
+            logger.info(f"Loaded saved session from {self.state_file}")
+
+        return browser.new_context(**options)
+
+    def is_logged_in(self, page, timeout=3000):
+        """
+        ホーム画面を開き、ログイン状態を数秒以内に判定する
+
+        Args:
+            page: Playwrightのページ
+            timeout: ログイン済み要素を待つ最大時間（ミリ秒）
+
+        Returns:
+            bool: ログイン済みならTrue
+        """
+        if not self.has_saved_session():
+            return False
+
+        try:
+            page.goto(f"{self.base_url}/home", wait_until="domcontentloaded")
+            page.wait_for_selector(LOGGED_IN_SELECTOR, timeout=timeout)
+            return True
+        except PlaywrightTimeoutError:
+            logger.info(f"Saved session is no longer valid (url: {page.url})")
+            return False
+
+    def manual_login(self, page, timeout=300000):
+        """
+        ログインページを開き、手動ログインの完了を待ってセッションを保存する
+
+        Args:
+            page: Playwrightのページ
+            timeout: 手動ログインを待つ最大時間（ミリ秒）
+
+        Returns:
+            bool: ログインに成功した場合True
+        """
+        page.goto(f"{self.base_url}/login")
+        logger.info("Navigated to Twitter login page")
+
+        # NOTE: ログイン処理は手動で行う想定（完了した時点で即座に次へ進む）
+        logger.info(f"Waiting for manual login (up to {timeout // 1000} seconds)")
+        try:
+            page.wait_for_url("**/home", timeout=timeout)
+        except PlaywrightTimeoutError:
+            return False
+
+        self.save(page.context)
+        return True
+
+    def ensure_login(self, page):
+        """
+        保存済みセッションでログイン状態を確認し、無効な場合のみ手動ログインに切り替える
+
+        Args:
+            page: Playwrightのページ
+
+        Returns:
+            bool: ログイン済みの状態になればTrue
+        """
+        if self.is_logged_in(page):
+            logger.info("Reusing saved session")
+            return True
+
+        return self.manual_login(page)
+
+    async def is_logged_in_async(self, page, timeout=3000):
+        """is_logged_in の非同期版"""
+        if not self.has_saved_session():
+            return False
+
+        try:
+            await page.goto(f"{self.base_url}/home", wait_until="domcontentloaded")
+            await page.wait_for_selector(LOGGED_IN_SELECTOR, timeout=timeout)
+            return True
+        except AsyncPlaywrightTimeoutError:
+            logger.info(f"Saved session is no longer valid (url: {page.url})")
+            return False
+
+    async def manual_login_async(self, page, timeout=300000):
+        """manual_login の非同期版"""
+        await page.goto(f"{self.base_url}/login")
+        logger.info("Navigated to Twitter login page")
+
+        logger.info(f"Waiting for manual login (up to {timeout // 1000} seconds)")
+        try:
+            await page.wait_for_url("**/home", timeout=timeout)
+        except AsyncPlaywrightTimeoutError:
+            return False
+
+        self.session_dir.mkdir(parents=True, exist_ok=True)
+        await page.context.storage_state(path=str(self.state_file))
+        logger.info(f"Saved session to {self.state_file}")
+        return True
+
+    async def ensure_login_async(self, page):
+        """ensure_login の非同期版"""
+        if await self.is_logged_in_async(page):
+            logger.info("Reusing saved session")
+            return True
+
+        return await self.manual_login_async(page)
+
+    def save(self, context):
+        """コンテキストのストレージ状態をファイルに保存"""
+        self.session_dir.mkdir(parents=True, exist_ok=True)
+        context.storage_state(path=str(self.state_file))
+        logger.info(f"Saved session to {self.state_file}")
+
+    def clear(self):
+        """保存済みセッションを削除"""
+        if self.has_saved_session():
+            self.state_file.unlink()
+            logger.info(f"Removed saved session: {self.state_file}")
+
+
+if __name__ == "__main__":
+    # 初回のみ実行する手動ログイン（以降の各ステージは保存済みセッションを再利用）
+    sys.path.append(str(Path(__file__).parent.parent))
+    from playwright.sync_api import sync_playwright
+    from utils.logger_setup import setup_logger
+
+    logger = setup_logger(__file__)
+    store = SessionStore()
+
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=False)
+        context = store.new_context(browser)
+        page = context.new_page()
+
+        if store.ensure_login(page):
+            logger.info("Login successful")
+        else:
+            logger.error("Login failed or timeout")
+
+        browser.close()
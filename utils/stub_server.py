@@ -0,0 +1,236 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import re
+import sys
+import json
+import argparse
+import threading
+from pathlib import Path
+from urllib.parse import urlparse, parse_qs
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# 検索ページ: SearchTimelineのJSONを取得してarticleを描画し、スクロールで次ページを読み込む
+SEARCH_PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Search</title></head>
+<body>
+<div data-testid="primaryColumn"><section id="timeline"></section></div>
+<div style="height: 1200px"></div>
+<script>
+const timeline = document.getElementById('timeline');
+const rawQuery = new URLSearchParams(location.search).get('q') || '';
+let cursor = 0;
+let loading = false;
+let finished = false;
+
+function collectTweets(node, out) {
+    if (Array.isArray(node)) {
+        node.forEach((child) => collectTweets(child, out));
+    } else if (node && typeof node === 'object') {
+        if (node.tweet_results && node.tweet_results.result) {
+            out.push(node.tweet_results.result);
+            return out;
+        }
+        Object.values(node).forEach((child) => collectTweets(child, out));
+    }
+    return out;
+}
+
+function render(tweet) {
+    const user = tweet.core.user_results.result;
+    const name = (user.core && user.core.screen_name) || user.legacy.screen_name;
+    const article = document.createElement('article');
+    article.innerHTML =
+        '<div data-testid="User-Name"><a href="/' + name + '">' + name + '</a></div>' +
+        '<a href="/' + name + '/status/' + tweet.rest_id + '"><time datetime="' +
+        new Date(tweet.legacy.created_at).toISOString() + '"></time></a>' +
+        '<div data-testid="tweetText"></div>';
+    article.querySelector('[data-testid="tweetText"]').innerText = tweet.legacy.full_text;
+    return article;
+}
+
+async function loadMore() {
+    if (loading || finished) {
+        return;
+    }
+    loading = true;
+    const variables = encodeURIComponent(JSON.stringify({ rawQuery: rawQuery, cursor: String(cursor) }));
+    const response = await fetch('/i/api/graphql/stub/SearchTimeline?variables=' + variables);
+    const tweets = collectTweets(await response.json(), []);
+    if (!tweets.length) {
+        finished = true;
+        if (cursor === 0) {
+            timeline.innerHTML = '<div data-testid="emptyState">No results for "' + rawQuery + '"</div>';
+        }
+    }
+    tweets.forEach((tweet) => timeline.appendChild(render(tweet)));
+    cursor += 1;
+    loading = false;
+}
+
+window.addEventListener('scroll', () => {
+    if (window.innerHeight + window.scrollY >= document.body.scrollHeight - 200) {
+        loadMore();
+    }
+});
+loadMore();
+</script>
+</body></html>
+"""
+
+# プロフィールページ: UserByScreenNameのJSONを取得してフォロワー数とBioを描画する
+PROFILE_PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Profile</title></head>
+<body>
+<div id="root"></div>
+<script>
+const screenName = location.pathname.split('/')[1];
+const variables = encodeURIComponent(JSON.stringify({ screen_name: screenName }));
+fetch('/i/api/graphql/stub/UserByScreenName?variables=' + variables)
+    .then((response) => response.json())
+    .then((payload) => {
+        const root = document.getElementById('root');
+        const user = payload.data && payload.data.user && payload.data.user.result;
+        if (!user || user.__typename !== 'User') {
+            root.innerHTML = '<div data-testid="primaryColumn"><div data-testid="emptyState">' +
+                "This account doesn't exist</div></div>";
+            return;
+        }
+        root.innerHTML =
+            '<div data-testid="primaryColumn">' +
+            '<a href="/' + screenName + '/followers"><span><span>' +
+            user.legacy.followers_count.toLocaleString('en-US') + '</span></span></a>' +
+            '<div data-testid="UserDescription"></div>' +
+            '</div>';
+        root.querySelector('[data-testid="UserDescription"]').innerText = user.legacy.description;
+    });
+</script>
+</body></html>
+"""
+
+# ログイン済み判定用のホーム画面と、即座にホームへ遷移するログイン画面
+HOME_PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Home</title></head>
+<body><a data-testid="AppTabBar_Home_Link" href="/home">Home</a></body></html>
+"""
+LOGIN_PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Login</title></head>
+<body><script>location.replace('/home');</script></body></html>
+"""
+
+GRAPHQL_PATTERN = re.compile(r"^/i/api/graphql/[^/]+/(?P<operation>\w+)$")
+
+
+class StubRequestHandler(BaseHTTPRequestHandler):
+    """
+    記録済みのJSONフィクスチャを返すTwitterのスタブ
+    """
+
+    # StubTwitterServer が設定するフィクスチャのディレクトリ
+    fixtures_dir = None
+
+    def log_message(self, format, *args):
+        """アクセスログは出力しない"""
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        path = parsed.path
+
+        match = GRAPHQL_PATTERN.match(path)
+        if match:
+            variables = json.loads(parse_qs(parsed.query).get("variables", ["{}"])[0])
+            return self.send_graphql(match.group("operation"), variables)
+
+        if path == "/home":
+            return self.send_body(HOME_PAGE, "text/html")
+        if path in ("/login", "/i/flow/login"):
+            return self.send_body(LOGIN_PAGE, "text/html")
+        if path == "/search":
+            return self.send_body(SEARCH_PAGE, "text/html")
+        if re.fullmatch(r"/\w+", path):
+            return self.send_body(PROFILE_PAGE, "text/html")
+
+        self.send_error(404)
+
+    def send_graphql(self, operation, variables):
+        """GraphQLの操作名と変数に対応するフィクスチャを返す"""
+        if operation == "SearchTimeline":
+            fixture = self.fixtures_dir / "SearchTimeline" / f"page_{variables.get('cursor', '0')}.json"
+            empty = {"data": {"search_by_raw_query": {"search_timeline": {"timeline": {"instructions": []}}}}}
+        elif operation == "UserByScreenName":
+            fixture = self.fixtures_dir / "UserByScreenName" / f"{variables.get('screen_name', '')}.json"
+            empty = {"data": {}}
+        else:
+            return self.send_error(404)
+
+        body = fixture.read_text(encoding="utf-8") if fixture.exists() else json.dumps(empty)
+        self.send_body(body, "application/json")
+
+    def send_body(self, body, content_type):
+        """本文を返す"""
+        data = body.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class StubTwitterServer:
+    """
+    オフライン検証用にフィクスチャを配信するローカルHTTPサーバー
+    """
+
+    def __init__(self, fixtures_dir=None, host="127.0.0.1", port=0):
+        """
+        初期化処理
+
+        Args:
+            fixtures_dir: フィクスチャのディレクトリ（デフォルトは fixtures/graphql）
+            host: 待ち受けるホスト
+            port: 待ち受けるポート（0の場合は空きポートを自動選択）
+        """
+        base_dir = Path(__file__).parent.parent
+        handler = type("Handler", (StubRequestHandler,), {
+            "fixtures_dir": Path(fixtures_dir) if fixtures_dir else base_dir / "fixtures" / "graphql",
+        })
+        self.server = ThreadingHTTPServer((host, port), handler)
+        self.thread = None
+
+    @property
+    def base_url(self):
+        """スクレイパーに渡すベースURL"""
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """バックグラウンドスレッドで起動"""
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        """停止"""
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Twitterスタブサーバー")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--fixtures", default=None, help="フィクスチャのディレクトリ")
+    args = parser.parse_args()
+
+    server = StubTwitterServer(fixtures_dir=args.fixtures, port=args.port)
+    print(f"Serving fixtures at {server.base_url} (Ctrl-C to stop)")
+    try:
+        server.server.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+        sys.exit(0)
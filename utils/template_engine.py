@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import re
+import json
+from pathlib import Path
+
+# <<field>> 形式のプレースホルダー
+PLACEHOLDER_PATTERN = re.compile(r"<<(\w+)>>")
+
+
+class CompiledTemplate:
+    """
+    テンプレートを固定文字列とプレースホルダーの並びに分解し、1回の連結で描画する
+    """
+
+    def __init__(self, text):
+        """
+        初期化処理
+
+        Args:
+            text: <<field>> 形式のプレースホルダーを含むテンプレート
+        """
+        # re.split はキャプチャした項目名を固定文字列の間に挟んで返す（固定文字列は項目数 + 1 個）
+        parts = PLACEHOLDER_PATTERN.split(text)
+        self.literals = parts[0::2]
+        self.fields = parts[1::2]
+
+    @property
+    def field_names(self):
+        """テンプレートで使用している項目名（重複なし・出現順）"""
+        return list(dict.fromkeys(self.fields))
+
+    def render(self, values):
+        """
+        値を差し込んだ文字列を返す
+
+        Args:
+            values: 項目名 -> 値（値がない項目はプレースホルダーのまま残す）
+
+        Returns:
+            str: 描画結果
+        """
+        parts = [self.literals[0]]
+        for field, literal in zip(self.fields, self.literals[1:]):
+            value = values.get(field)
+            parts.append(f"<<{field}>>" if value is None else str(value))
+            parts.append(literal)
+
+        return "".join(parts)
+
+
+def compile_template(text):
+    """
+    テンプレートを変換する
+
+    Args:
+        text: テンプレートの文字列
+
+    Returns:
+        CompiledTemplate: 変換済みのテンプレート
+    """
+    return CompiledTemplate(text)
+
+
+def write_bundle(path, messages):
+    """
+    ユーザー名 -> 本文 の辞書を1つのファイルにまとめて保存する
+
+    Args:
+        path: 保存先
+        messages: ユーザー名 -> 本文
+    """
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(messages, f, ensure_ascii=False, indent=1)
+
+
+def read_bundle(path):
+    """
+    write_bundle で保存したファイルを読み込む
+
+    Args:
+        path: ファイル
+
+    Returns:
+        Dict[str, str]: ユーザー名 -> 本文（ファイルがない場合は空の辞書）
+    """
+    path = Path(path)
+    if not path.exists():
+        return {}
+
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
@@ -0,0 +1,161 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import re
+from typing import List, Dict, Any, Optional
+
+from utils.page_extractor import ARTICLE_FUNCTION, extract_tweets, to_tweet_row
+
+STATUS_ID_PATTERN = re.compile(r"/status/(\d+)")
+
+# 新しくマウントされたarticleをキューに積むMutationObserverを設置するスクリプト
+# 仮想化タイムラインでは古いarticleがアンマウントされるため、DOM上の位置ではなく要素そのものを保持する
+OBSERVER_SCRIPT = """
+() => {
+    if (window.__tweetHarvest) {
+        return;
+    }
+    const state = { pending: new Set() };
+    document.querySelectorAll('article').forEach((article) => state.pending.add(article));
+    state.observer = new MutationObserver((mutations) => {
+        for (const mutation of mutations) {
+            for (const node of mutation.addedNodes) {
+                if (node.nodeType !== Node.ELEMENT_NODE) {
+                    continue;
+                }
+                if (node.matches('article')) {
+                    state.pending.add(node);
+                }
+                node.querySelectorAll('article').forEach((article) => state.pending.add(article));
+            }
+        }
+    });
+    state.observer.observe(document.body, { childList: true, subtree: true });
+    window.__tweetHarvest = state;
+}
+"""
+
+# キューに積まれたarticleだけを解析して返すスクリプト
+# 未描画のarticleは接続中であれば次のステップで再解析し、アンマウント済みなら破棄する
+DRAIN_SCRIPT = f"""
+() => {{
+    const state = window.__tweetHarvest;
+    if (!state) {{
+        return [];
+    }}
+    const extract = {ARTICLE_FUNCTION};
+    const results = [];
+    for (const article of Array.from(state.pending)) {{
+        const data = extract(article);
+        if (data) {{
+            results.push(data);
+            state.pending.delete(article);
+        }} else if (!article.isConnected) {{
+            state.pending.delete(article);
+        }}
+    }}
+    return results;
+}}
+"""
+
+
+def parse_status_id(tweet_url):
+    """
+    ツイートURLからステータスIDを取り出す
+
+    Args:
+        tweet_url: ツイートURL（例: https://twitter.com/user/status/123）
+
+    Returns:
+        str: ステータスID（取り出せない場合は空文字列）
+    """
+    match = STATUS_ID_PATTERN.search(tweet_url or "")
+    return match.group(1) if match else ""
+
+
+class TimelineHarvester:
+    """
+    ステータスIDで重複排除しながらタイムラインの投稿を差分収集するハーベスター
+    """
+
+    def __init__(self, page, max_tweets=100, max_idle_steps=3, use_observer=True, capture=None,
+                 base_url="https://twitter.com"):
+        """
+        初期化処理
+
+        Args:
+            page: Playwrightのページ
+            max_tweets: 収集するユニーク投稿数の上限
+            max_idle_steps: 新しいIDが見つからないステップがこの回数続いたら終了
+            use_observer: MutationObserverで新規articleのみを解析するか（Falseの場合は毎回全件走査）
+            capture: 検索タイムラインのJSONを捕捉するResponseCapture（捕捉できない間はDOMから収集）
+            base_url: TwitterのベースURL
+        """
+        self.page = page
+        self.max_tweets = max_tweets
+        self.max_idle_steps = max_idle_steps
+        self.use_observer = use_observer
+        self.capture = capture
+        self.base_url = base_url
+
+        self.seen_ids = set()
+        self.idle_steps = 0
+        self.skipped = 0  # ステータスIDを持たない投稿の件数
+
+    def install(self):
+        """ページにMutationObserverを設置（ページ遷移ごとに呼び出す）"""
+        if self.use_observer:
+            self.page.evaluate(OBSERVER_SCRIPT)
+
+    def read_candidates(self):
+        """今回のステップで解析対象となる投稿を取得"""
+        if self.capture is not None:
+            tweets = self.capture.drain_tweets()
+            if self.capture.timeline_responses:
+                return tweets
+
+        if not self.use_observer:
+            return extract_tweets(self.page, self.base_url)
+
+        return [to_tweet_row(raw, self.base_url) for raw in self.page.evaluate(DRAIN_SCRIPT)]
+
+    def step(self):
+        """
+        1ステップ分の新規投稿を収集する
+
+        Returns:
+            List[Dict]: 未収集のステータスIDを持つ投稿（上限を超える分は含まない）
+        """
+        new_tweets = []
+
+        for tweet in self.read_candidates():
+            if not tweet:
+                continue
+
+            status_id = parse_status_id(tweet["tweet_url"])
+            if not status_id:
+                self.skipped += 1
+                continue
+
+            if status_id in self.seen_ids:
+                continue
+
+            self.seen_ids.add(status_id)
+            tweet["status_id"] = status_id
+            new_tweets.append(tweet)
+
+            if len(self.seen_ids) >= self.max_tweets:
+                break
+
+        self.idle_steps = 0 if new_tweets else self.idle_steps + 1
+        return new_tweets
+
+    @property
+    def collected(self):
+        """収集済みのユニーク投稿数"""
+        return len(self.seen_ids)
+
+    @property
+    def done(self):
+        """上限に達したか、新しいIDが一定ステップ見つからなければTrue"""
+        return self.collected >= self.max_tweets or self.idle_steps >= self.max_idle_steps